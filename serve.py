@@ -0,0 +1,35 @@
+# serve.py
+
+"""
+serve.py
+
+Runs the Flask app from app.py with the diagnostics routes registered
+(app.py itself must not be modified). Start it with `python serve.py`.
+
+Requests are served on concurrent threads unless CONNECTIONS_THREADED=0:
+the models are loaded once under a lock with their norms filled eagerly,
+shared state is read-only and every cache is locked, and the heavy NumPy/BLAS
+work releases the GIL, so threads scale on a multi-core host.
+
+Unless CONNECTIONS_ADMISSION=0, model requests pass through admission control
+(src/admission.py): at most CONNECTIONS_MAX_CONCURRENT run at once, a bounded
+queue holds the next ones, and the rest get a 503 with Retry-After.
+"""
+
+import os
+import sys
+
+# Make the src modules importable the same way src/Model.py imports them
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
+from app import app  # The graded application
+from diagnostics import diagnostics  # Memory telemetry routes
+from config import THREADED_SERVING, ADMISSION_ENABLED  # Serving modes
+from admission import admission, AdmissionMiddleware  # Bounded queue in front of model()
+
+app.register_blueprint(diagnostics)
+if ADMISSION_ENABLED:
+    app.wsgi_app = AdmissionMiddleware(app.wsgi_app, admission)
+
+if __name__ == '__main__':
+    app.run(port=5000, threaded=THREADED_SERVING)
@@ -9,8 +9,21 @@
 ###############################################################################
 
 # Import necessary modules
+import os
+import time
 from model_loader import ModelLoader  # Function to load the FastText model
-from connections_model import connections_model  # Function to group words
+from connections_model import connections_model, _discard  # Function to group words
+from config import EMBEDDINGS_PATH, EMBEDDING_ENSEMBLE, SOLVER_BUDGET_SECONDS, BOARD_GROUP_SIZE  # Solver configuration
+from config import SPECULATION_ENABLED, SPECULATION_TTL_SECONDS, SPECULATION_MAX_ENTRIES, SPECULATION_MAX_PENDING
+from config import DECISION_ENGINE_ENABLED  # Expected-points guess selection
+from request_log import get_recorder  # Opt-in recording of model() calls
+from single_flight import SingleFlight  # Coalescing of identical concurrent requests
+from memory_telemetry import telemetry  # Memory figures for diagnostics and benchmarks
+from phonetic import load_phonetic_codes, phonetic_cache_size  # Sound-alike codes
+from hidden_words import load_detector  # Hidden-word classes
+from phrase_vectors import phrase_cache_size  # Composed vectors of multi-word entries
+from speculative import Speculator, next_states, request_key  # Next-turn answers computed ahead of time
+from decision_engine import choose_guess  # Monte Carlo choice of the guess or endTurn
 
 
 # def model(words, strikes, isOneAway, correctGroups, previousGuesses, error):
@@ -38,12 +51,42 @@ from connections_model import connections_model  # Function to group words
 # Load the pre-trained FastText model once when the module is imported
 
 model_instance = ModelLoader.load_vectors() # Defaults  to 'embeddings/fasttext_vectors.kv'
+telemetry.record_load('load_vectors')
+knn_graph_instance = ModelLoader.load_knn_graph() # None unless 'embeddings/knn_graph' has been built
+pair_scorer_instance = ModelLoader.load_pair_scorer() # None unless 'embeddings/pair_scorer.npz' has been trained
+ensemble_instance = ModelLoader.load_ensemble() # Empty unless EMBEDDING_ENSEMBLE is configured
+category_index_instance = ModelLoader.load_category_index() # None unless built from the loaded vectors
+ensemble_weights = {name: spec.get('weight', 1.0) for name, spec in EMBEDDING_ENSEMBLE.items()}
+ensemble_knn_graphs = {name: knn_graph_instance for name, spec in EMBEDDING_ENSEMBLE.items()
+                       if os.path.abspath(spec['path']) == os.path.abspath(EMBEDDINGS_PATH)}
+request_recorder = get_recorder() # None unless CONNECTIONS_REQUEST_LOG is set
+request_flights = SingleFlight()
+speculator = Speculator(lambda key, state: request_flights.do(key, _model, quiet=True, **state),
+                        ttl=SPECULATION_TTL_SECONDS,
+                        max_entries=SPECULATION_MAX_ENTRIES,
+                        max_pending=SPECULATION_MAX_PENDING) if SPECULATION_ENABLED else None
+load_phonetic_codes() # No-op unless 'embeddings/phonetic_codes.tsv' has been built
+hidden_word_detector = load_detector(model_instance) # Built-in lists unless 'data/hidden_word_lists.json' exists
+telemetry.record_load('startup')
+
+# Report the size of everything kept in memory between requests
+telemetry.register_cache('vectors', lambda: model_instance)
+telemetry.register_cache('knn_graph', lambda: knn_graph_instance)
+telemetry.register_cache('category_index', lambda: category_index_instance)
+telemetry.register_cache('pair_scorer', lambda: pair_scorer_instance)
+telemetry.register_cache('ensemble', lambda: ensemble_instance)
+telemetry.register_cache('phonetic_codes', phonetic_cache_size)
+telemetry.register_cache('phrase_vectors', phrase_cache_size)
+telemetry.register_cache('hidden_words', lambda: {'entries': hidden_word_detector.num_nodes})
+telemetry.register_cache('request_flights', lambda: {'entries': request_flights.in_flight()})
+if speculator is not None:
+    telemetry.register_cache('speculation', speculator.cache_size)
 
 def model(words, strikes, isOneAway, correctGroups, previousGuesses, error):
     """
     _______________________________________________________
     Parameters:
-    words - 1D Array with 16 shuffled words
+    words - 1D Array of shuffled words: N groups of CONNECTIONS_GROUP_SIZE words (16 words in 4 groups of 4 on the standard board)
     strikes - Integer with number of strikes
     isOneAway - Boolean if your previous guess is one word away from the correct answer
     correctGroups - 2D Array with groups previously guessed correctly
@@ -51,42 +94,138 @@ def model(words, strikes, isOneAway, correctGroups, previousGuesses, error):
     error - String with error message (0 if no error)
 
     Returns:
-    guess - 1D Array with 4 words
+    guess - 1D Array with CONNECTIONS_GROUP_SIZE words (4 on the standard board)
     endTurn - Boolean if you want to end the puzzle
     _______________________________________________________
     """
-    print("Model function called with:")
-    print(f"  words: {words}")
-    print(f"  strikes: {strikes}")
-    print(f"  isOneAway: {isOneAway}")
-    print(f"  correctGroups: {correctGroups}")
-    print(f"  previousGuesses: {previousGuesses}")
-    print(f"  error: {error}")
+    if speculator is None:
+        with telemetry.sample_request():
+            return _recorded_model(words, strikes, isOneAway, correctGroups, previousGuesses, error)
+    with speculator.foreground(), telemetry.sample_request():
+        return _recorded_model(words, strikes, isOneAway, correctGroups, previousGuesses, error)
+
+
+def _recorded_model(words, strikes, isOneAway, correctGroups, previousGuesses, error):
+    """Run `_coalesced_model`, recording the call when CONNECTIONS_REQUEST_LOG is set."""
+    if request_recorder is None:
+        guess, endTurn, _ = _coalesced_model(words, strikes, isOneAway, correctGroups, previousGuesses, error)
+        return guess, endTurn
+
+    # Capture the request before solving, since callers may mutate the lists afterwards
+    request = {
+        'words': list(words),
+        'strikes': strikes,
+        'isOneAway': isOneAway,
+        'correctGroups': [list(group) for group in correctGroups],
+        'previousGuesses': [list(guess) for guess in previousGuesses],
+        'error': error,
+    }
+    start_time = time.perf_counter()
+    try:
+        guess, endTurn, details = _coalesced_model(words, strikes, isOneAway, correctGroups, previousGuesses, error)
+    except Exception as e:
+        request_recorder.record(request, latency_ms=(time.perf_counter() - start_time) * 1000, exception=repr(e))
+        raise
+    request_recorder.record(request, result=(guess, endTurn), latency_ms=(time.perf_counter() - start_time) * 1000,
+                            details=details)
+    return guess, endTurn
+
+
+def _coalesced_model(words, strikes, isOneAway, correctGroups, previousGuesses, error):
+    """
+    Run `_model` once for concurrent duplicates of the same game state.
+
+    Duplicate requests (e.g. grader or client retries) wait for the computation
+    already in flight and share its result. When speculation is enabled, a
+    guess precomputed for this state is returned directly, and the next states
+    of the board are queued for speculation.
+    """
+    key = request_key(words, strikes, isOneAway, correctGroups, previousGuesses, error)
+    if speculator is None:
+        guess, endTurn, details = request_flights.do(key, _model, words, strikes, isOneAway, correctGroups,
+                                                     previousGuesses, error)
+        return list(guess), endTurn, dict(details)  # Each caller gets its own copies
+
+    board = tuple(words)
+    result = speculator.lookup(key)
+    speculator.cancel(board)  # States queued for earlier turns of this board are stale now
+    if result is not None:
+        guess, endTurn, details = result
+        details = dict(details, speculated=True)
+    else:
+        # A speculative run of this very state still in progress is joined here
+        guess, endTurn, details = request_flights.do(key, _model, words, strikes, isOneAway, correctGroups,
+                                                     previousGuesses, error)
+    if not endTurn:
+        states = next_states(words, strikes, correctGroups, previousGuesses, guess,
+                             num_groups=len(words) // BOARD_GROUP_SIZE)
+        speculator.schedule(board, [(request_key(**state), state) for _, state in states])
+    return list(guess), endTurn, dict(details)
+
+
+def _model(words, strikes, isOneAway, correctGroups, previousGuesses, error, quiet=False):
+    """
+    Compute the next guess; see `model` for the parameters.
+
+    Returns the guess, endTurn and the solver details (refinement level reached).
+    With `quiet`, nothing is printed (speculative runs on the background worker).
+    """
+    log = _discard if quiet else print
+    log("Model function called with:")
+    log(f"  words: {words}")
+    log(f"  strikes: {strikes}")
+    log(f"  isOneAway: {isOneAway}")
+    log(f"  correctGroups: {correctGroups}")
+    log(f"  previousGuesses: {previousGuesses}")
+    log(f"  error: {error}")
 
     # Get the groups using connections_model
-    groups = connections_model(words, model_instance)
-    print("Groups generated by connections_model:")
+    if ensemble_instance:
+        groups, details = connections_model(words, ensemble_instance, knn_graph=ensemble_knn_graphs,
+                                            model_weights=ensemble_weights, budget=SOLVER_BUDGET_SECONDS,
+                                            return_details=True, category_index=category_index_instance,
+                                            hidden_words=hidden_word_detector, group_size=BOARD_GROUP_SIZE, quiet=quiet)
+    else:
+        groups, details = connections_model(words, model_instance, knn_graph=knn_graph_instance,
+                                            budget=SOLVER_BUDGET_SECONDS, return_details=True,
+                                            category_index=category_index_instance,
+                                            hidden_words=hidden_word_detector, group_size=BOARD_GROUP_SIZE,
+                                            pair_scorer=pair_scorer_instance, quiet=quiet)
+    pair_matrix = details.pop('pair_matrix')  # Details are recorded as JSON
+    log(f"Refinement level reached: {details['level_name']}")
+    log("Groups generated by connections_model:")
     for group_name, group_words in groups.items():
-        print(f"  {group_name}: {group_words}")
+        log(f"  {group_name}: {group_words}")
+
+    # Pick the guess, or end the turn, by expected points over sampled partitions
+    decision = choose_guess(words, pair_matrix, groups, strikes, isOneAway, correctGroups, previousGuesses, error,
+                            group_size=BOARD_GROUP_SIZE) if DECISION_ENGINE_ENABLED else None
+    if decision is not None:
+        guess, endTurn, details['decision'] = decision
+        log(f"Decision engine: {details['decision']}")
+        log("Model output:")
+        log(f"  participantGuess: {guess}")
+        log(f"  endTurn: {endTurn}")
+        return guess, endTurn, details
 
     # Flatten correctGroups and previousGuesses to get words already used
     used_words = set()
     for group in correctGroups + previousGuesses:
         used_words.update(group)
-    print(f"Used words: {used_words}")
+    log(f"Used words: {used_words}")
 
     # Find a group to guess, preferring groups with more unused words
     guess = None
     max_unused_words = 0
     for group_name, group_words in groups.items():
         unused_words = [word for word in group_words if word not in used_words]
-        print(f"Checking group {group_name}: {group_words}")
-        print(f"  Unused words in this group: {unused_words}")
+        log(f"Checking group {group_name}: {group_words}")
+        log(f"  Unused words in this group: {unused_words}")
         if len(unused_words) > max_unused_words:
             guess = unused_words
             max_unused_words = len(unused_words)
-            if len(unused_words) == 4:
-                print(f"  Selected group {group_name} for guessing.")
+            if len(unused_words) == BOARD_GROUP_SIZE:
+                log(f"  Selected group {group_name} for guessing.")
                 break  # Found a group with all unused words
 
     if guess:
@@ -96,8 +235,8 @@ def model(words, strikes, isOneAway, correctGroups, previousGuesses, error):
         guess = []  # No guess
         endTurn = True  # No more guesses available
 
-    print("Model output:")
-    print(f"  participantGuess: {guess}")
-    print(f"  endTurn: {endTurn}")
+    log("Model output:")
+    log(f"  participantGuess: {guess}")
+    log(f"  endTurn: {endTurn}")
 
-    return guess, endTurn
\ No newline at end of file
+    return guess, endTurn, details
\ No newline at end of file
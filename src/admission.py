@@ -0,0 +1,195 @@
+# src/admission.py
+
+###############################################################################
+#                                                                             #
+#                            Admission Control                                #
+#                                                                             #
+#      Caps the model() calls running at once, queues a bounded number of     #
+#      requests in arrival order, rejects the rest right away (503 with       #
+#      Retry-After) and sheds queued requests that would miss their           #
+#      deadline, so latency stays flat under overload.                        #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import json
+import math
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from config import (
+    ADMISSION_MAX_CONCURRENT,
+    ADMISSION_MAX_QUEUE,
+    REQUEST_DEADLINE_SECONDS
+)  # Import centralized settings
+
+# Header carrying a per-request deadline in milliseconds (the default deadline applies otherwise)
+DEADLINE_HEADER = 'X-Request-Deadline-Ms'
+# Weight of the latest call in the moving average of the service time
+SERVICE_TIME_ALPHA = 0.2
+
+
+class Rejected(Exception):
+    """Raised when a request is not admitted; `retry_after` is in whole seconds."""
+
+    def __init__(self, reason, retry_after):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    A bounded FIFO queue in front of a fixed number of concurrent calls.
+
+    A request is admitted right away while fewer than `max_concurrent` calls run.
+    Otherwise it waits in the queue, unless `max_queue` requests already wait
+    ('queue_full'). Using a moving average of the service time, a request whose
+    estimated queueing plus service time exceeds its deadline is shed on arrival,
+    and a queued request is shed as soon as it can no longer finish in time
+    ('deadline'). Both raise Rejected with a Retry-After estimate.
+    """
+
+    def __init__(self, max_concurrent=ADMISSION_MAX_CONCURRENT, max_queue=ADMISSION_MAX_QUEUE,
+                 deadline=REQUEST_DEADLINE_SECONDS):
+        self.max_concurrent = max(1, max_concurrent)
+        self.max_queue = max(0, max_queue)
+        self.deadline = deadline
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._running = 0
+        self._service_time = None
+        self.stats = {
+            'admitted': 0,
+            'completed': 0,
+            'rejected_queue_full': 0,
+            'shed_deadline': 0,
+            'queue_depth_max': 0,
+            'queue_wait_seconds_total': 0.0,
+        }
+
+    def _estimated_wait(self, position):
+        """Seconds until the request at queue `position` (0 = head) gets a slot."""
+        if self._service_time is None:
+            return 0.0
+        return (position // self.max_concurrent + 1) * self._service_time
+
+    def _retry_after(self):
+        """Whole seconds for the current queue to drain (at least 1)."""
+        return max(1, math.ceil(self._estimated_wait(len(self._queue))))
+
+    def _reject(self, reason, stat):
+        self.stats[stat] += 1
+        raise Rejected(reason, self._retry_after())
+
+    @contextmanager
+    def admit(self, deadline=None):
+        """
+        Context manager holding one slot for the duration of a call.
+
+        Parameters:
+        - deadline (float): Seconds from now the response is due (defaults to `self.deadline`).
+
+        Raises:
+        - Rejected: The queue is full or the deadline cannot be met.
+        """
+        arrival = time.monotonic()
+        due = arrival + (self.deadline if deadline is None else deadline)
+        ticket = object()
+        with self._condition:
+            if self._running >= self.max_concurrent or self._queue:
+                if len(self._queue) >= self.max_queue:
+                    self._reject('queue_full', 'rejected_queue_full')
+                if arrival + self._estimated_wait(len(self._queue)) + (self._service_time or 0.0) > due:
+                    self._reject('deadline', 'shed_deadline')
+                self._queue.append(ticket)
+                self.stats['queue_depth_max'] = max(self.stats['queue_depth_max'], len(self._queue))
+                try:
+                    while self._queue[0] is not ticket or self._running >= self.max_concurrent:
+                        remaining = due - (self._service_time or 0.0) - time.monotonic()
+                        if remaining <= 0:
+                            self._reject('deadline', 'shed_deadline')
+                        self._condition.wait(remaining)
+                finally:
+                    self._queue.remove(ticket)
+                    self._condition.notify_all()  # The next request may now be at the head
+            self._running += 1
+            self.stats['admitted'] += 1
+            self.stats['queue_wait_seconds_total'] += time.monotonic() - arrival
+
+        start_time = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start_time
+            with self._condition:
+                self._running -= 1
+                self.stats['completed'] += 1
+                if self._service_time is None:
+                    self._service_time = elapsed
+                else:
+                    self._service_time += SERVICE_TIME_ALPHA * (elapsed - self._service_time)
+                self._condition.notify_all()
+
+    def snapshot(self):
+        """Return the queue depth, running calls, counters and service time as a dict."""
+        with self._condition:
+            stats = dict(self.stats)
+            admitted = stats.pop('admitted')
+            return {
+                'running': self._running,
+                'queue_depth': len(self._queue),
+                'max_concurrent': self.max_concurrent,
+                'max_queue': self.max_queue,
+                'deadline_seconds': self.deadline,
+                'service_seconds_ewma': self._service_time,
+                'admitted': admitted,
+                'queue_wait_seconds_mean': stats.pop('queue_wait_seconds_total') / admitted if admitted else None,
+                **stats,
+            }
+
+
+class AdmissionMiddleware:
+    """
+    WSGI middleware running the requests to `paths` (POST only) through an AdmissionController.
+
+    Rejected requests get a 503 JSON response with a Retry-After header, without
+    reaching the app. A client may set its own deadline with DEADLINE_HEADER.
+    """
+
+    def __init__(self, wsgi_app, controller, paths=('/',)):
+        self.wsgi_app = wsgi_app
+        self.controller = controller
+        self.paths = set(paths)
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') != 'POST' or environ.get('PATH_INFO', '/') not in self.paths:
+            return self.wsgi_app(environ, start_response)
+
+        deadline = None
+        header = environ.get('HTTP_' + DEADLINE_HEADER.upper().replace('-', '_'))
+        if header:
+            try:
+                deadline = float(header) / 1000.0
+            except ValueError:
+                pass
+
+        try:
+            with self.controller.admit(deadline):
+                # Flask responses are fully built here, so the slot covers the whole model() call
+                return self.wsgi_app(environ, start_response)
+        except Rejected as rejection:
+            body = json.dumps({'error': 'overloaded', 'reason': rejection.reason,
+                               'retryAfter': rejection.retry_after}).encode('utf-8')
+            start_response('503 Service Unavailable', [
+                ('Content-Type', 'application/json'),
+                ('Content-Length', str(len(body))),
+                ('Retry-After', str(rejection.retry_after)),
+            ])
+            return [body]
+
+
+# Process-wide controller used by serve.py and the diagnostics route
+admission = AdmissionController()
@@ -0,0 +1,219 @@
+# src/artifacts.py
+
+###############################################################################
+#                                                                             #
+#                          Derived Artifacts Bundle                           #
+#                                                                             #
+#      Builds the arrays derived from the word vectors (norms, frequency      #
+#      ranks) once, stores them as mmap-able .npy files next to the model     #
+#      and attaches them at load time without any computation.               #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import json
+import time
+import hashlib
+import logging
+import argparse
+import numpy as np
+
+from config import EMBEDDINGS_PATH  # Import centralized path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Bump whenever the layout or meaning of an artifact changes
+ARTIFACTS_VERSION = 1
+
+
+def _artifact_paths(model_path):
+    """Return the paths of the bundle files stored next to the model."""
+    return {
+        'manifest': model_path + '.manifest.json',
+        'norms': model_path + '.norms.npy',
+        'ranks': model_path + '.ranks.npy',
+    }
+
+
+def source_checksum(model_path, vectors_path=None, block_size=1 << 20):
+    """
+    Fingerprint the saved model.
+
+    The `.kv` file (or the vocabulary file of a raw export), which holds the
+    vocabulary, is hashed with SHA-256; the large vectors file is identified by
+    its size, so validation stays cheap at startup.
+    """
+    sha256 = hashlib.sha256()
+    with open(model_path, 'rb') as file:
+        for block in iter(lambda: file.read(block_size), b''):
+            sha256.update(block)
+    if vectors_path is None:
+        vectors_path = model_path + '.vectors.npy'
+    vectors_size = os.path.getsize(vectors_path) if os.path.isfile(vectors_path) else None
+    return {'sha256': sha256.hexdigest(), 'vectors_size': vectors_size}
+
+
+def hash_arrays(digest, arrays, block_size=1 << 20):
+    """Feed the bytes of arrays (possibly memory-mapped) to a hash, block by block."""
+    for array in arrays:
+        flat = np.asarray(array).reshape(-1)
+        step = max(1, block_size // max(flat.itemsize, 1))
+        for start in range(0, len(flat), step):
+            digest.update(np.ascontiguousarray(flat[start:start + step]).tobytes())
+
+
+def model_fingerprint(model):
+    """
+    Identify the vectors of a model.
+
+    Models loaded by ModelLoader carry the `source_checksum` of their files as
+    `model.source_fingerprint`; other models are identified by a hash of their
+    vocabulary and vectors.
+    """
+    fingerprint = getattr(model, 'source_fingerprint', None)
+    if fingerprint is not None:
+        return fingerprint
+    sha256 = hashlib.sha256('\n'.join(model.index_to_key).encode('utf-8'))
+    hash_arrays(sha256, [model.vectors])
+    return {'vectors_sha256': sha256.hexdigest()}
+
+
+def _frequency_ranks(model):
+    """Frequency rank of every row (0 = most frequent); vocabularies without counts are already frequency-sorted."""
+    num_vectors = model.vectors.shape[0]
+    counts = model.expandos.get('count') if hasattr(model, 'expandos') else None
+    if counts is not None and len(counts) == num_vectors:
+        ranks = np.empty(num_vectors, dtype=np.int32)
+        ranks[np.argsort(-np.asarray(counts), kind='stable')] = np.arange(num_vectors, dtype=np.int32)
+        return ranks
+    return np.arange(num_vectors, dtype=np.int32)
+
+
+def _fill_norms(model, norms, chunk_size=65536):
+    """Write the norm of every vector into `norms`, chunk by chunk to keep memory bounded."""
+    num_vectors = model.vectors.shape[0]
+    for start in range(0, num_vectors, chunk_size):
+        end = min(start + chunk_size, num_vectors)
+        norms[start:end] = np.linalg.norm(np.asarray(model.vectors[start:end], dtype=np.float32), axis=1)
+    return norms
+
+
+def build_artifacts(model, model_path, vectors_path=None, chunk_size=65536):
+    """
+    Compute the derived arrays of a model and write them with a manifest.
+
+    Every file is written to a temporary path and moved into place with
+    os.replace, the manifest last, so a reader never sees a partial bundle.
+
+    Parameters:
+    - model: The loaded KeyedVectors.
+    - model_path (str): Path of the saved model the artifacts belong to.
+    - vectors_path (str): Path of the vectors file, when it is not `model_path + '.vectors.npy'`.
+    - chunk_size (int): The number of rows processed at a time.
+
+    Returns:
+    - dict: The manifest that was written.
+
+    Raises:
+    - OSError: The bundle could not be written (e.g. the model directory is read-only).
+    """
+    paths = _artifact_paths(model_path)
+    temporary = {name: f"{path}.{os.getpid()}.tmp" for name, path in paths.items()}
+    start_time = time.time()
+    logging.info(f"Building derived artifacts for '{model_path}'...")
+
+    try:
+        num_vectors = model.vectors.shape[0]
+        norms = np.lib.format.open_memmap(temporary['norms'], mode='w+', dtype=np.float32, shape=(num_vectors,))
+        _fill_norms(model, norms, chunk_size).flush()
+        del norms
+        with open(temporary['ranks'], 'wb') as file:
+            np.save(file, _frequency_ranks(model))
+
+        manifest = {
+            'version': ARTIFACTS_VERSION,
+            'source': source_checksum(model_path, vectors_path),
+            'num_vectors': num_vectors,
+            'files': {name: os.path.basename(path) for name, path in paths.items() if name != 'manifest'},
+        }
+        with open(temporary['manifest'], 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2)
+
+        for name in ('norms', 'ranks', 'manifest'):
+            os.replace(temporary[name], paths[name])
+    finally:
+        for path in temporary.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+    logging.info(f"Derived artifacts built in {time.time() - start_time:.2f} seconds.")
+    return manifest
+
+
+def attach_artifacts(model, model_path, vectors_path=None):
+    """
+    Attach previously built artifacts to a loaded model, with memory mapping.
+
+    Sets `model.norms` (so gensim never recomputes them), `model.frequency_ranks` and
+    `model.source_fingerprint` (the `source_checksum` of the files the model was loaded from).
+
+    Returns:
+    - bool: True if the artifacts were attached, False if they are missing or stale.
+    """
+    paths = _artifact_paths(model_path)
+    if not os.path.isfile(paths['manifest']):
+        return False
+    try:
+        with open(paths['manifest'], 'r', encoding='utf-8') as file:
+            manifest = json.load(file)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Could not read artifacts manifest '{paths['manifest']}': {e}")
+        return False
+
+    if manifest.get('version') != ARTIFACTS_VERSION:
+        logging.info("Derived artifacts were built by another version. They will be rebuilt.")
+        return False
+    source = source_checksum(model_path, vectors_path)
+    if manifest.get('source') != source:
+        logging.info("Derived artifacts do not match the model checksum. They will be rebuilt.")
+        return False
+    if any(not os.path.isfile(paths[name]) for name in ('norms', 'ranks')):
+        return False
+
+    model.norms = np.load(paths['norms'], mmap_mode='r')
+    model.frequency_ranks = np.load(paths['ranks'], mmap_mode='r')
+    model.source_fingerprint = source
+    return True
+
+
+def ensure_artifacts(model, model_path, vectors_path=None):
+    """
+    Attach the artifacts of a model, (re)building them first if needed.
+
+    When the bundle cannot be written next to the model, the arrays are computed
+    in memory instead (the next start computes them again).
+    """
+    if not attach_artifacts(model, model_path, vectors_path):
+        try:
+            build_artifacts(model, model_path, vectors_path)
+        except OSError as e:
+            logging.warning(f"Could not save the derived artifacts next to '{model_path}': {e}")
+            model.norms = _fill_norms(model, np.empty(model.vectors.shape[0], dtype=np.float32))
+            model.frequency_ranks = _frequency_ranks(model)
+            model.source_fingerprint = source_checksum(model_path, vectors_path)
+            return model
+        if not attach_artifacts(model, model_path, vectors_path):
+            raise RuntimeError(f"Derived artifacts for '{model_path}' could not be attached after rebuilding.")
+    return model
+
+
+if __name__ == "__main__":
+    from gensim.models import KeyedVectors
+
+    parser = argparse.ArgumentParser(description="Build the derived artifacts bundle for a saved model.")
+    parser.add_argument('--model-path', default=EMBEDDINGS_PATH, help="Path to the saved KeyedVectors.")
+    args = parser.parse_args()
+
+    build_artifacts(KeyedVectors.load(args.model_path, mmap='r'), args.model_path)
@@ -0,0 +1,222 @@
+# src/category_index.py
+
+###############################################################################
+#                                                                             #
+#                            Category Index                                   #
+#                                                                             #
+#      Embeds every labeled group of historical puzzles as a unit-length      #
+#      centroid and scores board words against all known categories with     #
+#      one matrix product.                                                    #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import json
+import time
+import logging
+import argparse
+import numpy as np
+
+from config import DATA_PATH, CATEGORY_INDEX_DIR  # Import centralized paths
+from phrase_vectors import word_vectors  # Vectors of multi-word entries
+from artifacts import model_fingerprint  # Identifies the vectors the index was built from
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+class CategoryIndex:
+    """
+    Read-only matrix of category centroids, one unit-length row per historical group.
+
+    `source` is the `model_fingerprint` of the vectors the centroids were built
+    from; affinities are only meaningful with those vectors.
+    """
+
+    def __init__(self, centroids, labels, source=None):
+        self.centroids = centroids
+        self.labels = labels
+        self.source = source
+
+    @classmethod
+    def load(cls, index_dir=CATEGORY_INDEX_DIR, fingerprints=None):
+        """
+        Load an index written by `build_category_index`, with memory mapping.
+
+        An index built from other vectors than the given ones is refused.
+
+        Parameters:
+        - index_dir (str): The directory holding the index files.
+        - fingerprints (list): The `model_fingerprint` of every model the index may be used with, if known.
+
+        Returns:
+        - CategoryIndex: The memory-mapped index, or None if it was built from other vectors.
+        """
+        meta_path = os.path.join(index_dir, 'meta.json')
+        if not os.path.isfile(meta_path):
+            logging.warning(f"Category index at '{index_dir}' does not record the vectors it was built from. "
+                            f"Rebuild it with category_index.py.")
+            return None
+        with open(meta_path, 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        if fingerprints is not None and meta.get('source') not in fingerprints:
+            logging.warning(f"Category index at '{index_dir}' was built from other vectors than the loaded ones. "
+                            f"Rebuild it with category_index.py.")
+            return None
+        centroids = np.load(os.path.join(index_dir, 'centroids.npy'), mmap_mode='r')
+        with open(os.path.join(index_dir, 'labels.json'), 'r', encoding='utf-8') as file:
+            labels = json.load(file)
+        return cls(centroids, labels, meta.get('source'))
+
+    def matches(self, model):
+        """Tell whether the index was built from the vectors of `model` (only the dimension is checked without a source)."""
+        if model.vectors.shape[1] != self.centroids.shape[1]:
+            return False
+        return self.source is None or model_fingerprint(model) == self.source
+
+    def affinities(self, words, model):
+        """
+        Score every word against every known category.
+
+        Parameters:
+        - words (list): The board words.
+        - model: The word embedding model the index was built with.
+
+        Returns:
+        - np.ndarray: A (len(words), C) matrix of cosine similarities; rows of
+          entries without any known part are 0.
+        """
+        affinities = np.zeros((len(words), self.centroids.shape[0]), dtype=np.float32)
+        rows, vectors = word_vectors(words, model)
+        if rows:
+            vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+            affinities[rows] = vectors @ np.asarray(self.centroids).T
+        return affinities
+
+    def propose_groups(self, words, model, min_affinity=0.5, max_proposals=8, group_size=4, affinities=None):
+        """
+        Propose groups of group_size words from the categories the board matches best.
+
+        For each category, the group_size board words with the highest affinity form
+        a candidate; candidates are ranked by their mean affinity.
+
+        Parameters:
+        - words (list): The board words.
+        - model: The word embedding model the index was built with.
+        - min_affinity (float): Every proposed word must reach this affinity.
+        - max_proposals (int): The maximum number of proposals returned.
+        - group_size (int): The number of words per proposed group.
+        - affinities (np.ndarray): The `affinities` of the words, when already computed.
+
+        Returns:
+        - list: (mean_affinity, label, group) tuples, best first, with no two
+          proposals containing the same set of words.
+        """
+        if len(words) < group_size or self.centroids.shape[0] == 0:
+            return []
+        if affinities is None:
+            affinities = self.affinities(words, model)
+        # (group_size, C) best words per category
+        top = np.argpartition(-affinities, group_size - 1, axis=0)[:group_size]
+        top_scores = np.take_along_axis(affinities, top, axis=0)
+        valid = np.flatnonzero(top_scores.min(axis=0) >= min_affinity)
+        order = valid[np.argsort(-top_scores[:, valid].mean(axis=0))]
+
+        proposals = []
+        seen = set()
+        for category in order:
+            group = [words[i] for i in sorted(top[:, category])]
+            key = frozenset(group)
+            if key in seen:
+                continue
+            seen.add(key)
+            proposals.append((float(top_scores[:, category].mean()), self.labels[category], group))
+            if len(proposals) >= max_proposals:
+                break
+        return proposals
+
+
+def load_groups(paths):
+    """
+    Read the labeled groups of historical puzzles.
+
+    Parameters:
+    - paths (list): Files in the sample_data.json schema (a JSON list of puzzles)
+      or JSONL files with one puzzle per line.
+
+    Returns:
+    - list: (label, words) tuples.
+    """
+    groups = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as file:
+            if path.endswith('.jsonl'):
+                puzzles = [json.loads(line) for line in file if line.strip()]
+            else:
+                puzzles = json.load(file)
+        for puzzle in puzzles:
+            for entry in puzzle:
+                label = entry.get('category') or entry.get('group') or ' '.join(entry['words'])
+                groups.append((label, entry['words']))
+    return groups
+
+
+def build_category_index(model, paths=None, index_dir=None):
+    """
+    Embed every historical group as the normalized mean of its word vectors.
+
+    Groups with fewer than two in-vocabulary words are skipped.
+
+    Parameters:
+    - model: The loaded word embedding model.
+    - paths (list): Puzzle files to read (defaults to DATA_PATH).
+    - index_dir (str): Output directory (defaults to CATEGORY_INDEX_DIR).
+
+    Returns:
+    - int: The number of categories written.
+    """
+    if paths is None:
+        paths = [DATA_PATH]
+    if index_dir is None:
+        index_dir = CATEGORY_INDEX_DIR
+    if not os.path.isdir(index_dir):
+        os.makedirs(index_dir)
+
+    start_time = time.time()
+    groups = load_groups(paths)
+    logging.info(f"Building category index from {len(groups)} groups...")
+
+    centroids = []
+    labels = []
+    for label, words in groups:
+        rows, vectors = word_vectors(words, model)
+        if len(rows) < 2:
+            continue
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        centroid = vectors.mean(axis=0)
+        centroids.append(centroid / max(np.linalg.norm(centroid), 1e-12))
+        labels.append(label)
+
+    matrix = np.array(centroids, dtype=np.float32).reshape(len(centroids), model.vectors.shape[1])
+    np.save(os.path.join(index_dir, 'centroids.npy'), matrix)
+    with open(os.path.join(index_dir, 'labels.json'), 'w', encoding='utf-8') as file:
+        json.dump(labels, file)
+    meta = {'source': model_fingerprint(model), 'num_categories': len(labels), 'dim': int(matrix.shape[1])}
+    with open(os.path.join(index_dir, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump(meta, file, indent=2)
+
+    logging.info(f"Category index with {len(labels)} categories written to '{index_dir}' "
+                 f"in {time.time() - start_time:.2f} seconds.")
+    return len(labels)
+
+
+if __name__ == "__main__":
+    from model_loader import ModelLoader
+
+    parser = argparse.ArgumentParser(description="Build the category-centroid index from historical puzzles.")
+    parser.add_argument('paths', nargs='*', default=[DATA_PATH], help="Puzzle files (.json or .jsonl).")
+    parser.add_argument('--index-dir', default=CATEGORY_INDEX_DIR, help="Output directory.")
+    args = parser.parse_args()
+
+    build_category_index(ModelLoader.load_vectors(), args.paths, args.index_dir)
@@ -14,3 +14,72 @@ PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 # Define paths relative to the project root
 EMBEDDINGS_PATH = os.path.join(PROJECT_ROOT, 'embeddings', 'fasttext_vectors.kv')
 DATA_PATH = os.path.join(PROJECT_ROOT, 'data', 'sample_data.json')
+KNN_GRAPH_DIR = os.path.join(PROJECT_ROOT, 'embeddings', 'knn_graph')
+
+# Memory-mapped export of the vectors (written by fasttext_converter.py from a local fastText file)
+RAW_VECTORS_PATH = os.path.join(PROJECT_ROOT, 'embeddings', 'fasttext_vectors.npy')
+RAW_VOCAB_PATH = os.path.join(PROJECT_ROOT, 'embeddings', 'fasttext_vectors.vocab.txt')
+# Optional local fastText .vec/.vec.gz/.bin to convert instead of downloading the model
+FASTTEXT_SOURCE_PATH = os.environ.get('CONNECTIONS_FASTTEXT_SOURCE')
+
+# Embedding ensemble for semantic scoring, as name -> {'path': ..., 'weight': ...}.
+# Leave empty to score with the single model at EMBEDDINGS_PATH.
+EMBEDDING_ENSEMBLE = {}
+
+# Opt-in request recording: set CONNECTIONS_REQUEST_LOG to a .jsonl.gz path to record every model() call
+REQUEST_LOG_PATH = os.environ.get('CONNECTIONS_REQUEST_LOG')
+
+# Latency budget of the anytime solver in seconds (None to always run every refinement level)
+SOLVER_BUDGET_SECONDS = float(os.environ['CONNECTIONS_SOLVER_BUDGET']) if os.environ.get('CONNECTIONS_SOLVER_BUDGET') else None
+
+# Category-centroid index built from historical puzzles (see category_index.py)
+CATEGORY_INDEX_DIR = os.path.join(PROJECT_ROOT, 'embeddings', 'category_index')
+
+# Fraction of model() calls whose peak allocations are traced with tracemalloc (0 disables sampling)
+MEMORY_SAMPLE_RATE = float(os.environ.get('CONNECTIONS_MEMORY_SAMPLE_RATE', '0.01'))
+
+# Phonetic codes precomputed for the vocabulary (optional, see phonetic.py)
+PHONETIC_CODES_PATH = os.path.join(PROJECT_ROOT, 'embeddings', 'phonetic_codes.tsv')
+
+# Hidden-word classes as a JSON {class: [words]} file (built-in lists are used when it does not exist)
+HIDDEN_WORD_LISTS_PATH = os.path.join(PROJECT_ROOT, 'data', 'hidden_word_lists.json')
+# Grow the hidden-word classes with similar words among the top K vocabulary words (0 to disable)
+HIDDEN_WORDS_TOP_K = int(os.environ.get('CONNECTIONS_HIDDEN_WORDS_TOP_K', '0'))
+
+# Maximum number of composed vectors of multi-word entries kept in memory (see phrase_vectors.py)
+PHRASE_CACHE_SIZE = 4096
+
+# Worker threads computing the per-request signals; shared by all request threads
+SIGNAL_WORKERS = int(os.environ.get('CONNECTIONS_SIGNAL_WORKERS', max(4, os.cpu_count() or 1)))
+# Worker threads running the level 1 neighbor searches of the anytime solver, kept apart
+# from the signal pool so that abandoned searches never delay another request's level 0
+REFINEMENT_WORKERS = int(os.environ.get('CONNECTIONS_REFINEMENT_WORKERS', max(4, os.cpu_count() or 1)))
+# Worker threads scoring the models of an embedding ensemble; shared by all requests
+ENSEMBLE_WORKERS = int(os.environ.get('CONNECTIONS_ENSEMBLE_WORKERS', max(4, os.cpu_count() or 1)))
+# Serve requests on concurrent threads (set CONNECTIONS_THREADED=0 for one request at a time)
+THREADED_SERVING = os.environ.get('CONNECTIONS_THREADED', '1') != '0'
+
+# Precompute the next guess for each outcome of a guess (correct, one away, wrong) while the client is thinking
+SPECULATION_ENABLED = os.environ.get('CONNECTIONS_SPECULATE', '0') == '1'
+# Seconds a precomputed guess stays valid, cached guesses kept, and boards waiting for speculation
+SPECULATION_TTL_SECONDS = 30.0
+SPECULATION_MAX_ENTRIES = 256
+SPECULATION_MAX_PENDING = 8
+
+# Words per group of the boards served (e.g. 5 for 5x5 boards); the number of groups is len(words) / size
+BOARD_GROUP_SIZE = int(os.environ.get('CONNECTIONS_GROUP_SIZE', '4'))
+
+# Learned pairwise same-group scorer (see pairwise_scorer.py) and the cache of its training features
+PAIR_SCORER_PATH = os.path.join(PROJECT_ROOT, 'embeddings', 'pair_scorer.npz')
+PAIR_FEATURES_CACHE_PATH = os.path.join(PROJECT_ROOT, 'embeddings', 'pair_features.npz')
+
+# Admission control in serve.py (set CONNECTIONS_ADMISSION=0 to disable): model() calls running at once,
+# requests waiting beyond those (more are rejected with 503), and the default per-request deadline in seconds
+ADMISSION_ENABLED = os.environ.get('CONNECTIONS_ADMISSION', '1') != '0'
+ADMISSION_MAX_CONCURRENT = int(os.environ.get('CONNECTIONS_MAX_CONCURRENT', os.cpu_count() or 1))
+ADMISSION_MAX_QUEUE = int(os.environ.get('CONNECTIONS_MAX_QUEUE', 4 * ADMISSION_MAX_CONCURRENT))
+REQUEST_DEADLINE_SECONDS = float(os.environ.get('CONNECTIONS_REQUEST_DEADLINE', '10'))
+
+# Set CONNECTIONS_DECISION_ENGINE=1 to choose guesses (or endTurn) by expected points with the Monte Carlo
+# decision engine (see decision_engine.py); off by default until it beats the solver-group selection
+DECISION_ENGINE_ENABLED = os.environ.get('CONNECTIONS_DECISION_ENGINE', '0') == '1'
@@ -9,7 +9,11 @@
 ###############################################################################
 
 # Import necessary libraries
+import time  # For the latency budget
+import itertools  # For pairwise group comparisons
 from collections import defaultdict  # For grouping words
+from concurrent.futures import ThreadPoolExecutor, TimeoutError  # For computing the signals concurrently
+import numpy as np  # For combining the lexical signals
 
 # Import similarity functions
 from similarity_metrics import (
@@ -19,147 +23,478 @@ from similarity_metrics import (
     calculate_euclidean_similarity,
     ngram_jaccard_similarity,
     calculate_levenshtein_distance,
-    calculate_semantic_similarity
+    calculate_semantic_similarity,
+    semantic_similarity_matrix,
+    ensemble_similarity_matrix,
+    ngram_jaccard_matrix
 )
+from phonetic import phonetic_code, phonetic_groups  # Sound-alike grouping
+from hidden_words import hidden_class_matrix, hidden_class_groups  # "Contains a ..." categories
+from config import SIGNAL_WORKERS, REFINEMENT_WORKERS  # Sizes of the shared pools
 
-def connections_model(words, model):
+# Shared worker pool for the level 0 signals (embedding geometry and lexical) of every request
+_signal_executor = ThreadPoolExecutor(max_workers=SIGNAL_WORKERS, thread_name_prefix='signals')
+# Shared worker pool for the level 1 semantic score (neighbor search). Searches abandoned by an
+# expired budget may still occupy it, but never queue ahead of level 0 work
+_refinement_executor = ThreadPoolExecutor(max_workers=REFINEMENT_WORKERS, thread_name_prefix='refinement')
+
+# Refinement levels of the anytime solver, from cheapest to most thorough:
+# 0 - embedding geometry only (cosine + Euclidean, no neighbor search)
+# 1 - full semantic score including neighbor overlap
+# 2 - deeper search: best-first cohesive semantic groups refined by word swaps
+REFINEMENT_LEVELS = ('cosine', 'neighbors', 'search')
+
+# Similarity thresholds for grouping
+# Semantic
+EUCLEDIAN_THRESHOLD = 0.1
+COSINE_THRESHOLD = 0.1
+SEMANTIC_SIMILARITY_THRESHOLD = 0.5 # Needs to be fine-tuned.
+
+# Lexical
+JACCARD_THRESHOLD = 0.1  # Lowered threshold for lexical similarity
+
+# Phonetic: maximum edit distance between Metaphone codes when no exact code bucket is full
+PHONETIC_CODE_DISTANCE = 1
+
+# Category index: every word of a proposed group must reach this cosine affinity
+CATEGORY_AFFINITY_THRESHOLD = 0.5
+
+# Weights for the similarity components
+SEMANTIC_WEIGHTS = {'cosine': 0.4, 'euclidean': 0.3, 'neighbor': 0.3}
+
+# Words per group on the standard board (4 groups of 4)
+GROUP_SIZE = 4
+
+# Best-first search: number of seed words grown per committed group. Seeds are ranked
+# by the mean of their best scores, so only the most promising ones are expanded
+SEARCH_BEAM_WIDTH = 8
+
+
+def connections_model(words, model, knn_graph=None, model_weights=None, budget=None, return_details=False,
+                      category_index=None, hidden_words=None, group_size=GROUP_SIZE, pair_scorer=None, quiet=False):
     """
-    Group words into categories based on semantic, lexical, and spelling similarities.
+    Group words into categories based on semantic, lexical, and phonetic similarities.
+
+    The solver is anytime: it first groups with the cheap embedding-geometry
+    score, then with the full semantic score (neighbor overlap), then runs a
+    deeper search, and returns the best grouping reached when `budget` runs out.
 
     Parameters:
     - words (list): A list of words to be grouped.
-    - model: The pre-trained FastText model.
+    - model: The pre-trained FastText model, or a dict of named models to score as an ensemble.
+    - knn_graph (KnnGraph): Optional precomputed neighbor graph for neighbor overlap
+      (a dict of graphs by model name when `model` is an ensemble).
+    - model_weights (dict): Weights of the ensemble models by name.
+    - budget (float): Latency budget in seconds (None for no limit). The cheapest level
+      always completes, so very small budgets still return a full grouping.
+    - return_details (bool): If True, also return details about the refinement reached.
+    - category_index (CategoryIndex): Optional centroids of historical categories; their
+      affinities with the board propose one-shot groups and order the seed words.
+    - hidden_words (HiddenWordDetector): Optional automaton of hidden-word classes; words
+      hiding words of a common class are grouped in the lexical stage.
+    - group_size (int): The number of words per group; the board holds len(words) / group_size groups.
+    - pair_scorer (PairScorer): Optional learned scorer; its same-group probabilities replace the
+      hand-weighted semantic score from level 1 on (single models only).
+    - quiet (bool): If True, print nothing (e.g. for background runs).
 
     Returns:
     - dict: A dictionary where each key is a group name and each value is a list of words in that group.
+    - dict: Only if return_details is True; holds the refinement 'level' (index into
+      REFINEMENT_LEVELS), its 'level_name', the 'elapsed' time in seconds and the
+      'pair_matrix' (pairwise semantic scores of the level reached, a NumPy array).
     """
+    start_time = time.perf_counter()
+    deadline = None if budget is None else start_time + budget
+    log = _discard if quiet else print
+
+    # Compute the semantic and lexical signals for every pair of words concurrently,
+    # so that the request waits for the slowest signal rather than the sum of all of them.
+    # The cheap embedding-only matrix is submitted too, as the level 0 fallback. The full
+    # semantic score is only submitted while budget remains, and is skipped if it has not
+    # started by the deadline.
+    if isinstance(model, dict):
+        semantic_args = (ensemble_similarity_matrix, words, model, model_weights)
+        semantic_kwargs = {'top_n': 50, 'weights': SEMANTIC_WEIGHTS, 'knn_graphs': knn_graph}
+    else:
+        semantic_args = (semantic_similarity_matrix, words, model)
+        semantic_kwargs = {'top_n': 50, 'weights': SEMANTIC_WEIGHTS, 'knn_graph': knn_graph}
+    semantic_future = None
+    if _remaining(deadline) != 0:
+        if pair_scorer is not None and not isinstance(model, dict):
+            semantic_future = _refinement_executor.submit(_before_deadline, deadline, pair_scorer.score_matrix,
+                                                          words, model, knn_graph=knn_graph, top_n=50)
+        else:
+            semantic_future = _refinement_executor.submit(_before_deadline, deadline, *semantic_args,
+                                                          **semantic_kwargs)
+    geometry_future = _signal_executor.submit(*semantic_args, include_neighbors=False, **semantic_kwargs)
+    jaccard_future = _signal_executor.submit(ngram_jaccard_matrix, words, n=2)
+    jaccard_matrix = jaccard_future.result()
+
+    # Lexical signal: n-gram overlap, or hiding words of a common class ("contains an animal")
+    hidden_classes = None
+    lexical_matrix = jaccard_matrix
+    if hidden_words is not None:
+        hidden_matrix, classes = hidden_class_matrix(words, hidden_words)
+        hidden_classes = dict(zip(words, classes))
+        lexical_matrix = np.maximum(jaccard_matrix, hidden_matrix)
 
-    # Similarity thresholds for grouping
-    # Semantic
-    EUCLEDIAN_THRESHOLD = 0.1 
-    COSINE_THRESHOLD = 0.1
-    SEMANTIC_SIMILARITY_THRESHOLD = 0.5 # Needs to be fine-tuned.  
+    # Score the board against every known category with one matrix product
+    proposals, seed_order = _category_seeds(words, model, category_index, group_size, log)
+    seeds = (proposals, seed_order)
 
-    # Lexical
-    JACCARD_THRESHOLD = 0.1  # Lowered threshold for lexical similarity
+    # Level 0: embedding geometry only
+    log("Refinement level 0: embedding geometry (cosine + Euclidean)")
+    pair_matrix = geometry_future.result()
+    groups = _group_words(words, pair_matrix, lexical_matrix, seeds=seeds,
+                          hidden_classes=hidden_classes, group_size=group_size, log=log)
+    level = 0
 
-    # Spelling
-    LEVENSHTEIN_THRESHOLD = 10  # Increased threshold for spelling similarity
+    # Level 1: full semantic score, if it arrives within the budget
+    semantic_matrix = None
+    if semantic_future is not None and _remaining(deadline) != 0:
+        try:
+            semantic_matrix = semantic_future.result(timeout=_remaining(deadline))
+        except TimeoutError:
+            pass
+    if semantic_matrix is None:
+        if semantic_future is not None:
+            semantic_future.cancel()  # Drop it from the queue if it has not started
+        log("Latency budget exhausted before neighbor overlap was ready.")
+    else:
+        log("\nRefinement level 1: full semantic similarity (with neighbor overlap)")
+        groups = _group_words(words, semantic_matrix, lexical_matrix, seeds=seeds,
+                              hidden_classes=hidden_classes, group_size=group_size, log=log)
+        pair_matrix = semantic_matrix
+        level = 1
 
-    # Weights for the similarity components
-    weights = {'cosine': 0.4, 'euclidean': 0.3, 'neighbor': 0.3}
+        # Level 2: deeper search, if time remains
+        if _remaining(deadline) != 0:
+            log("\nRefinement level 2: best-first cohesive groups with swap refinement")
+            groups = _group_words(words, semantic_matrix, lexical_matrix, search=True, deadline=deadline,
+                                  seeds=seeds, hidden_classes=hidden_classes, group_size=group_size, log=log)
+            level = 2
+
+    elapsed = time.perf_counter() - start_time
+    log(f"\nRefinement level reached: {level} ({REFINEMENT_LEVELS[level]}) in {elapsed:.3f} seconds")
+    if return_details:
+        return groups, {'level': level, 'level_name': REFINEMENT_LEVELS[level], 'elapsed': elapsed,
+                        'pair_matrix': pair_matrix}
+    return groups
 
 
+def _discard(*args, **kwargs):
+    """Stands in for print in quiet runs."""
+
+
+def _remaining(deadline):
+    """Seconds left before the deadline (None if there is no deadline, never negative)."""
+    if deadline is None:
+        return None
+    return max(deadline - time.perf_counter(), 0)
+
+
+def _before_deadline(deadline, fn, *args, **kwargs):
+    """Call fn unless the deadline has passed by the time a worker picks it up (then return None)."""
+    if _remaining(deadline) == 0:
+        return None
+    return fn(*args, **kwargs)
+
+
+def _category_seeds(words, model, category_index, group_size=GROUP_SIZE, log=print):
+    """
+    Turn category affinities into group proposals and a seed order.
+
+    With an ensemble, the model the index was built from is used.
+
+    Returns:
+    - tuple: (proposals, seed_order) where proposals is a list of candidate groups,
+      best first, and seed_order lists the words by decreasing best affinity
+      (both empty without an index, or when no model matches it).
+    """
+    if category_index is None:
+        return [], []
+    models = list(model.values()) if isinstance(model, dict) else [model]
+    model = next((m for m in models if category_index.matches(m)), None)
+    if model is None:
+        log("Category index was built from other vectors; it is ignored.")
+        return [], []
+    affinities = category_index.affinities(words, model)
+    if affinities.shape[1] == 0:
+        return [], []
+    best_affinity = affinities.max(axis=1)
+    seed_order = [words[i] for i in sorted(range(len(words)), key=lambda i: -best_affinity[i])]
+    proposals = category_index.propose_groups(words, model, min_affinity=CATEGORY_AFFINITY_THRESHOLD,
+                                              group_size=group_size, affinities=affinities)
+    for mean_affinity, label, group in proposals:
+        log(f"Category proposal '{label}' (mean affinity {mean_affinity:.3f}): {group}")
+    return [group for _, _, group in proposals], seed_order
+
+
+def _group_words(words, semantic_matrix, lexical_matrix, search=False, deadline=None, seeds=None,
+                 hidden_classes=None, group_size=GROUP_SIZE, log=print):
+    """
+    Run the semantic, lexical and phonetic grouping stages on precomputed signal matrices.
+
+    Parameters:
+    - words (list): The words to be grouped.
+    - semantic_matrix (np.ndarray): Pairwise semantic similarities.
+    - lexical_matrix (np.ndarray): Pairwise lexical similarities (n-gram Jaccard, combined
+      with the hidden-word signal when available).
+    - search (bool): Use the deeper best-first search for the semantic stage.
+    - deadline (float): perf_counter() time after which the search stops refining.
+    - seeds (tuple): (proposals, seed_order) from the category index, if any.
+    - hidden_classes (dict): The hidden-word classes of each word, if a detector is used.
+    - group_size (int): The number of words per group.
+    - log (callable): Prints the progress (print, or _discard in quiet runs).
+
+    Returns:
+    - dict: A dictionary where each key is a group name and each value is a list of words in that group.
+    """
     # Initialize data structures
     groups = defaultdict(list)  # Dictionary to hold groups of words
     used_words = set()  # Set to keep track of words that have already been grouped
+    word_index = {word: i for i, word in enumerate(words)}
 
-    # Step 1: Group words based on semantic similarity (cosine similarity)
-    print("Step 1: Semantic Similarity Grouping")
-    for word1 in words:
-        if word1 in used_words:
-            continue  # Skip words that have already been grouped
-        group = [word1]  # Start a new group with the current word
-        used_words.add(word1)
-        print(f"Creating new group with seed word: {word1}")
-        for word2 in words:
-            if word2 not in used_words and word2 != word1:
-                # Check similarity with any member of the group
-                semantic_similarities = [calculate_semantic_similarity(w, word2, model,top_n=50,weights=weights) for w in group]
-                max_similarity = max(semantic_similarities)
-                print(f"Checking word: {word2}")
-                print(f"  Semantic similarities with group members: {list(zip(group, semantic_similarities))}")
-                if max_similarity >= SEMANTIC_SIMILARITY_THRESHOLD:
-                    group.append(word2)
-                    used_words.add(word2)
-                    print(f"  Added {word2} to group (max similarity: {max_similarity})")
-                else:
-                    print(f"  Did not add {word2} (max similarity: {max_similarity})")
-                if len(group) == 4:
-                    break  # Stop adding words if the group reaches four words
-        if len(group) == 4:
-            # Add the group to the groups dictionary
+    def semantic(w1, w2):
+        return semantic_matrix[word_index[w1], word_index[w2]]
+
+    # Step 0: Accept category proposals whose words are semantically tied together
+    proposals, seed_order = seeds if seeds else ([], [])
+    if proposals:
+        log("Step 0: Category Proposals")
+    for group in proposals:
+        if any(word in used_words for word in group):
+            continue
+        if all(max(semantic(w, other) for other in group if other != w) >= SEMANTIC_SIMILARITY_THRESHOLD
+               for w in group):
+            group_name = f"Group{len(groups) + 1}"
+            groups[group_name] = list(group)
+            used_words.update(group)
+            log(f"Formed group {group_name} from category proposal: {group}")
+
+    # Seed the semantic stage with the words that match known categories best
+    candidates = [word for word in (seed_order or words) if word not in used_words]
+
+    # Step 1: Group words based on semantic similarity
+    log("Step 1: Semantic Similarity Grouping")
+    if search:
+        # Search on the candidates' submatrix, by position
+        rows = [word_index[word] for word in candidates]
+        candidate_matrix = np.array(semantic_matrix, dtype=np.float64)[np.ix_(rows, rows)]
+        np.fill_diagonal(candidate_matrix, 0.0)
+        semantic_groups = _best_first_groups(candidate_matrix, SEMANTIC_SIMILARITY_THRESHOLD, group_size)
+        semantic_groups = _refine_by_swaps(semantic_groups, candidate_matrix, candidates, deadline, log)
+        for positions in semantic_groups:
+            group = [candidates[position] for position in positions]
             group_name = f"Group{len(groups) + 1}"
             groups[group_name] = group
-            print(f"Formed group {group_name}: {group}")
-        else:
-            print(f"Could not form a full group with seed word: {word1}")
-            used_words.difference_update(group)  # Remove words if group is incomplete
+            used_words.update(group)
+            log(f"Formed group {group_name}: {group}")
+    else:
+        _greedy_stage(candidates, groups, used_words, semantic,
+                      lambda value: value >= SEMANTIC_SIMILARITY_THRESHOLD, max, "similarity", group_size, log)
 
-    # Step 2: Group remaining words based on lexical similarity (Jaccard similarity)
-    print("\nStep 2: Lexical Similarity Grouping")
+    # Step 2: Group remaining words based on lexical similarity, starting with words hiding a common class
+    log("\nStep 2: Lexical Similarity Grouping")
     remaining_words = [word for word in words if word not in used_words]
-    for word1 in remaining_words:
-        if word1 in used_words:
-            continue
-        group = [word1]
-        used_words.add(word1)
-        print(f"Creating new group with seed word: {word1}")
-        for word2 in remaining_words:
-            if word2 not in used_words and word2 != word1:
-                # Check similarity with any member of the group
-                similarities = [ngram_jaccard_similarity(w, word2,n=2) for w in group]
-                max_similarity = max(similarities)
-                print(f"Checking word: {word2}")
-                print(f"  Similarities with group members: {list(zip(group, similarities))}")
-                if max_similarity >= JACCARD_THRESHOLD:
-                    group.append(word2)
-                    used_words.add(word2)
-                    print(f"  Added {word2} to group (max similarity: {max_similarity})")
-                else:
-                    print(f"  Did not add {word2} (max similarity: {max_similarity})")
-                if len(group) == 4:
-                    break
-        if len(group) == 4:
+    if hidden_classes:
+        for class_name, group in hidden_class_groups(remaining_words, hidden_classes, group_size):
             group_name = f"Group{len(groups) + 1}"
             groups[group_name] = group
-            print(f"Formed group {group_name}: {group}")
-        else:
-            print(f"Could not form a full group with seed word: {word1}")
-            used_words.difference_update(group)
+            used_words.update(group)
+            log(f"Formed group {group_name} (hidden {class_name}): {group}")
+        remaining_words = [word for word in words if word not in used_words]
+    _greedy_stage(remaining_words, groups, used_words,
+                  lambda w1, w2: lexical_matrix[word_index[w1], word_index[w2]],
+                  lambda value: value >= JACCARD_THRESHOLD, max, "similarity", group_size, log)
+
+    # Step 3: Group remaining words that sound alike, by hash buckets on their phonetic codes
+    log("\nStep 3: Phonetic Grouping")
+    remaining_words = [word for word in words if word not in used_words]
+    for group in phonetic_groups(remaining_words, group_size):
+        group_name = f"Group{len(groups) + 1}"
+        groups[group_name] = group
+        used_words.update(group)
+        log(f"Formed group {group_name} (phonetic code {phonetic_code(group[0])}): {group}")
+
+    # Fall back to codes that are close but not identical
+    remaining_words = [word for word in words if word not in used_words]
+    _greedy_stage(remaining_words, groups, used_words, _phonetic_code_distance,
+                  lambda value: value <= PHONETIC_CODE_DISTANCE, min, "code distance", group_size, log)
 
-    # Step 3: Group remaining words based on spelling similarity (Levenshtein distance)
-    print("\nStep 3: Spelling Similarity Grouping")
+    # Final grouping of remaining words to ensure all words are grouped
     remaining_words = [word for word in words if word not in used_words]
-    for word1 in remaining_words:
+    if remaining_words:
+        log("\nFinal grouping of remaining words")
+        while remaining_words:
+            group = remaining_words[:group_size]
+            group_name = f"Group{len(groups) + 1}"
+            groups[group_name] = group
+            log(f"Formed group {group_name}: {group}")
+            used_words.update(group)
+            remaining_words = remaining_words[group_size:]
+
+    return groups
+
+
+def _phonetic_code_distance(word1, word2):
+    """Edit distance between the phonetic codes of two words (infinite if either has no code)."""
+    code1, code2 = phonetic_code(word1), phonetic_code(word2)
+    if not code1 or not code2:
+        return float('inf')
+    return calculate_levenshtein_distance(code1, code2)
+
+
+def _greedy_stage(candidates, groups, used_words, score, accept, best, label, group_size=GROUP_SIZE, log=print):
+    """
+    Greedily grow groups of group_size words from each seed word in order.
+
+    A word joins the group if the best of its scores against the current members
+    (max for similarities, min for distances) is accepted. Incomplete groups are
+    discarded and their words released.
+    """
+    for word1 in candidates:
         if word1 in used_words:
-            continue
-        group = [word1]
+            continue  # Skip words that have already been grouped
+        group = [word1]  # Start a new group with the current word
         used_words.add(word1)
-        print(f"Creating new group with seed word: {word1}")
-        for word2 in remaining_words:
+        log(f"Creating new group with seed word: {word1}")
+        for word2 in candidates:
             if word2 not in used_words and word2 != word1:
-                # Check similarity with any member of the group
-                distances = [calculate_levenshtein_distance(w, word2) for w in group]
-                min_distance = min(distances)
-                print(f"Checking word: {word2}")
-                print(f"  Distances with group members: {list(zip(group, distances))}")
-                if min_distance <= LEVENSHTEIN_THRESHOLD:
+                # Check the score against every member of the group
+                scores = [score(w, word2) for w in group]
+                best_score = best(scores)
+                log(f"Checking word: {word2}")
+                log(f"  Scores with group members: {list(zip(group, scores))}")
+                if accept(best_score):
                     group.append(word2)
                     used_words.add(word2)
-                    print(f"  Added {word2} to group (min distance: {min_distance})")
+                    log(f"  Added {word2} to group ({best.__name__} {label}: {best_score})")
                 else:
-                    print(f"  Did not add {word2} (min distance: {min_distance})")
-                if len(group) == 4:
-                    break
-        if len(group) == 4:
+                    log(f"  Did not add {word2} ({best.__name__} {label}: {best_score})")
+                if len(group) == group_size:
+                    break  # Stop adding words once the group is full
+        if len(group) == group_size:
+            # Add the group to the groups dictionary
             group_name = f"Group{len(groups) + 1}"
             groups[group_name] = group
-            print(f"Formed group {group_name}: {group}")
+            log(f"Formed group {group_name}: {group}")
         else:
-            print(f"Could not form a full group with seed word: {word1}")
-            used_words.difference_update(group)
+            log(f"Could not form a full group with seed word: {word1}")
+            used_words.difference_update(group)  # Remove words if group is incomplete
+
+
+def _pair_sum(group, matrix):
+    """Sum of the pairwise scores within a group of positions (the diagonal of `matrix` is 0)."""
+    return matrix[np.ix_(group, group)].sum() / 2
+
+
+def _best_first_groups(matrix, threshold, group_size=GROUP_SIZE):
+    """
+    Form semantic groups best-first instead of in seed order.
+
+    Seeds grow a candidate group by the word with the highest mean score to the
+    members (among words whose best score passes the threshold); the most
+    cohesive complete candidate is committed, and the process repeats on the
+    positions that are left. Only the SEARCH_BEAM_WIDTH seeds with the highest
+    mean score to their group_size - 1 best partners are grown, and words that
+    cannot pass the threshold with any remaining word are pruned, so a commit
+    costs O(beam * group_size * n) vectorized operations on an n-word board.
+
+    Parameters:
+    - matrix (np.ndarray): (n, n) symmetric pairwise scores with a zero diagonal.
+    - threshold (float): A word joins a group if its best score to a member reaches it.
+    - group_size (int): The number of words per group.
+
+    Returns:
+    - list: The committed groups, as lists of positions in `matrix`.
+    """
+    remaining = np.arange(matrix.shape[0])
+    committed = []
+    while len(remaining) >= group_size:
+        sub = matrix[np.ix_(remaining, remaining)]
+        passes = sub >= threshold
+        np.fill_diagonal(passes, False)
+        # Prune words without any partner passing the threshold: they can only be seeds of singletons
+        viable = passes.any(axis=1)
+        if viable.sum() < group_size:
+            break
+        masked = np.where(viable[None, :], sub, -np.inf)
+        np.fill_diagonal(masked, -np.inf)
+        partners = np.sort(masked, axis=1)[:, ::-1][:, :group_size - 1]
+        seed_scores = np.where(viable, partners.mean(axis=1), -np.inf)
+        seeds = np.argsort(-seed_scores, kind='stable')[:min(SEARCH_BEAM_WIDTH, int(viable.sum()))]
+
+        best_group, best_cohesion = None, None
+        for seed in seeds:
+            group = [seed]
+            in_group = np.zeros(len(remaining), dtype=bool)
+            in_group[seed] = True
+            score_sums = sub[seed].copy()  # Summed score of every word to the members
+            reachable = passes[seed].copy()  # Best score to a member passes the threshold
+            while len(group) < group_size:
+                eligible = reachable & viable & ~in_group
+                if not eligible.any():
+                    break
+                word = int(np.argmax(np.where(eligible, score_sums, -np.inf)))
+                group.append(word)
+                in_group[word] = True
+                score_sums += sub[word]
+                reachable |= passes[word]
+            if len(group) == group_size:
+                cohesion = _pair_sum(group, sub)
+                if best_cohesion is None or cohesion > best_cohesion:
+                    best_group, best_cohesion = group, cohesion
+        if best_group is None:
+            break
+        committed.append([int(remaining[position]) for position in best_group])
+        remaining = np.delete(remaining, best_group)
+    return committed
+
+
+def _swap_gains(a, b, matrix):
+    """
+    Change of the summed cohesion of two groups for every swap of a word of `a` with a word of `b`.
+
+    Returns:
+    - np.ndarray: (len(a), len(b)) array; entry [i, j] is the gain when a[i] and b[j] trade places.
+    """
+    a, b = np.asarray(a), np.asarray(b)
+    # Summed score of each word to the members of each group
+    a_to_a, a_to_b = matrix[np.ix_(a, a)].sum(axis=1), matrix[np.ix_(a, b)].sum(axis=1)
+    b_to_b, b_to_a = matrix[np.ix_(b, b)].sum(axis=1), matrix[np.ix_(b, a)].sum(axis=1)
+    cross = matrix[np.ix_(a, b)]
+    return (b_to_a[None, :] - a_to_a[:, None] - cross) + (a_to_b[:, None] - b_to_b[None, :] - cross)
 
-    # Final grouping of remaining words to ensure all words are grouped
-    remaining_words = [word for word in words if word not in used_words]
-    if remaining_words:
-        print("\nFinal grouping of remaining words")
-        while remaining_words:
-            group = remaining_words[:4]
-            group_name = f"Group{len(groups) + 1}"
-            groups[group_name] = group
-            print(f"Formed group {group_name}: {group}")
-            used_words.update(group)
-            remaining_words = remaining_words[4:]
 
+def _refine_by_swaps(groups, matrix, words, deadline, log=print):
+    """
+    Improve a set of groups by swapping words between them.
+
+    For every pair of groups, the gain of all word swaps is computed at once from
+    each word's summed score to both groups; the best swap is applied while it
+    increases the summed cohesion of the two groups, until no swap helps or the
+    deadline passes.
+
+    Parameters:
+    - groups (list): Groups of equal size, as lists of positions in `matrix`.
+    - matrix (np.ndarray): (n, n) symmetric pairwise scores with a zero diagonal.
+    - words (list): The word at each position, for logging.
+    - deadline (float): perf_counter() time after which refinement stops.
+    - log (callable): Prints the swaps (print, or _discard in quiet runs).
+
+    Returns:
+    - list: The refined groups.
+    """
+    groups = [list(group) for group in groups]
+    improved = True
+    while improved and _remaining(deadline) != 0:
+        improved = False
+        for g1, g2 in itertools.combinations(range(len(groups)), 2):
+            gain = _swap_gains(groups[g1], groups[g2], matrix)
+            i, j = np.unravel_index(np.argmax(gain), gain.shape)
+            if gain[i, j] > 1e-12:
+                groups[g1][i], groups[g2][j] = groups[g2][j], groups[g1][i]
+                improved = True
+                log(f"  Swapped {words[groups[g2][j]]} and {words[groups[g1][i]]} (gain {gain[i, j]:.4f})")
     return groups
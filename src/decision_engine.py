@@ -0,0 +1,271 @@
+# src/decision_engine.py
+
+###############################################################################
+#                                                                             #
+#                             Decision Engine                                 #
+#                                                                             #
+#      Chooses the guess (or endTurn) with the highest expected points. The   #
+#      true partition of the remaining words is sampled from the pairwise     #
+#      scores, conditioned on earlier feedback, and the rest of the game is   #
+#      simulated for every candidate guess at once with NumPy.                #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import time
+import numpy as np
+
+from game_rules import group_multiplier, STRIKE_MULTIPLIERS, MAX_STRIKES  # Evaluator scoring
+
+# Sampled partitions of the remaining words per turn
+DECISION_SAMPLES = 256
+# Standard deviation of the noise added to the pairwise scores when sampling a partition
+PARTITION_NOISE = 0.15
+# Score added to pairs that the solver placed in the same group (its grouping also uses lexical signals)
+SOLVER_BONUS = 0.2
+# Number of most frequent sampled partitions whose groups are candidate guesses
+TOP_K_PARTITIONS = 8
+# Most probable candidate guesses simulated per turn
+MAX_CANDIDATES = 12
+
+
+def _canonical(words):
+    """Case-insensitive key of a group of words, as the evaluator compares them."""
+    return tuple(sorted(word.upper() for word in words))
+
+
+def sample_partitions(matrix, group_size, num_samples, rng):
+    """
+    Sample partitions of n words into groups of group_size, all at once.
+
+    Each sample perturbs the symmetric scores with Gaussian noise and partitions
+    greedily: the free word with the best partner seeds a group, which grows by
+    the free word with the highest summed score to its members.
+
+    Parameters:
+    - matrix (np.ndarray): (n, n) symmetric pairwise scores; n must be a multiple of group_size.
+    - group_size (int): The number of words per group.
+    - num_samples (int): The number of partitions to sample.
+    - rng (np.random.Generator): The random generator.
+
+    Returns:
+    - np.ndarray: (num_samples, n) int16 array; entry [s, i] is the smallest position
+      in the group of word i, so equal rows are equal partitions.
+    """
+    n = matrix.shape[0]
+    rows, columns = np.triu_indices(n, 1)
+    noise = np.zeros((num_samples, n, n), dtype=np.float32)
+    noise[:, rows, columns] = PARTITION_NOISE * rng.standard_normal((num_samples, len(rows)), dtype=np.float32)
+    noisy = np.asarray(matrix, dtype=np.float32) + noise + noise.transpose(0, 2, 1)
+    noisy[:, np.arange(n), np.arange(n)] = -np.inf
+    best_partner = noisy.max(axis=2)
+
+    samples = np.arange(num_samples)
+    labels = np.empty((num_samples, n), dtype=np.int16)
+    free = np.ones((num_samples, n), dtype=bool)
+    for _ in range(n // group_size - 1):
+        members = [np.argmax(np.where(free, best_partner, -np.inf), axis=1)]
+        free[samples, members[0]] = False
+        sums = noisy[samples, members[0]].copy()
+        for _ in range(group_size - 1):
+            word = np.argmax(np.where(free, sums, -np.inf), axis=1)
+            members.append(word)
+            free[samples, word] = False
+            sums += noisy[samples, word]
+        members = np.stack(members, axis=1)
+        labels[samples[:, None], members] = members.min(axis=1)[:, None]
+    # The words left form the last group
+    last = np.where(free, np.arange(n)[None, :], n).min(axis=1)
+    labels[free] = np.repeat(last, free.sum(axis=1))
+    return labels
+
+
+def _largest_share(labels, positions):
+    """(samples,) int: the most words at `positions` that share a group, in each sampled partition."""
+    group_labels = labels[:, positions]
+    return np.max([(group_labels == group_labels[:, [k]]).sum(axis=1) for k in range(len(positions))], axis=0)
+
+
+def _points_table(max_found):
+    """score_game as a table: entry [f, k] holds the points of f groups found (in total) with k strikes."""
+    cumulative = np.cumsum([0] + [group_multiplier(i + 1) for i in range(max_found)])
+    strike_table = np.array([STRIKE_MULTIPLIERS.get(k, 0.25) for k in range(MAX_STRIKES + 2)])
+    return cumulative[:, None] * strike_table[None, :]
+
+
+def simulate(candidates, outcomes, found, strikes, num_remaining, group_size):
+    """
+    Simulate the rest of the game for every first guess, over every sampled partition.
+
+    Every simulated game reacts to its own feedback: samples that would have
+    given the same answers (correct, one away or wrong) to the same guesses share
+    a history, and the next guess of a history is the candidate most often a
+    group among its samples, skipping guessed candidates and those overlapping a
+    found group. A history stops when that guess has a negative expected
+    one-step gain, and the last group is guessed correctly once only its words remain.
+
+    Parameters:
+    - candidates (list): Candidate groups as position arrays (at most 64 positions).
+    - outcomes (np.ndarray): (samples, candidates) int; 2 when a candidate is a true group
+      of the sample, 1 when it is one away from one, 0 otherwise.
+    - found (int): Groups found so far.
+    - strikes (int): Strikes so far.
+    - num_remaining (int): The number of words not yet in a found group.
+    - group_size (int): The number of words per group.
+
+    Returns:
+    - np.ndarray: (candidates,) expected points when each candidate is guessed first.
+    """
+    num_samples, num_candidates = outcomes.shape
+    is_group = outcomes == 2
+    # Words of each candidate as a bitmask (boards of up to 64 words), and which candidates share words
+    membership = np.array([np.bitwise_or.reduce(np.left_shift(np.uint64(1), np.asarray(positions, dtype=np.uint64)))
+                           for positions in candidates], dtype=np.uint64)
+    overlapping = (membership[:, None] & membership[None, :]) != 0
+
+    # Row a plays candidate a first; every (row, sample) pair is one simulated game
+    shape = (num_candidates, num_samples)
+    sample_index = np.broadcast_to(np.arange(num_samples)[None, :], shape)
+    history = np.broadcast_to(np.arange(num_candidates)[:, None], shape).ravel()
+    found_count = np.full(shape, found)
+    strike_count = np.full(shape, strikes)
+    blocked = np.zeros(shape + (num_candidates,), dtype=bool)  # Guessed, or overlapping a found group
+    done = np.zeros(shape, dtype=bool)
+    max_found = found + num_remaining // group_size
+    points = _points_table(max_found)
+
+    for step in range(num_candidates):
+        if step == 0:
+            action = np.broadcast_to(np.arange(num_candidates)[:, None], shape)
+            active = ~done
+        else:
+            # Probability of each candidate among the samples of each history
+            _, first, history = np.unique(history, return_index=True, return_inverse=True)
+            history = history.ravel()
+            sizes = np.bincount(history, minlength=len(first))
+            group_share = np.stack([np.bincount(history, weights=np.broadcast_to(is_group[:, c], shape).ravel(),
+                                                minlength=len(first)) for c in range(num_candidates)], axis=1)
+            available = ~blocked.reshape(-1, num_candidates)[first]
+            probability = np.where(available, group_share / sizes[:, None], -1.0)
+            best = np.argmax(probability, axis=1)
+            p = probability[np.arange(len(first)), best]
+            f, k = found_count.ravel()[first], strike_count.ravel()[first]
+            gain = (p * points[np.minimum(f + 1, max_found), k] + (1 - p) * points[f, np.minimum(k + 1, MAX_STRIKES + 1)]
+                    - points[f, k])
+            stop = ((p < 0) | (gain < 0))[history].reshape(shape)
+            action = best[history].reshape(shape)
+            done |= stop
+            active = ~done
+
+        outcome = np.where(active, outcomes[sample_index, action], 0)
+        correct = outcome == 2
+        found_count += correct
+        strike_count += active & ~correct
+        blocked |= active[:, :, None] & (np.arange(num_candidates) == action[:, :, None])
+        blocked |= correct[:, :, None] & overlapping[action]
+        # Once one group is left, its words are guessed correctly
+        last_group = ~done & (found_count == max_found - 1)
+        found_count += last_group
+        done |= last_group | (found_count == max_found) | (strike_count >= MAX_STRIKES)
+        if done.all():
+            break
+        history = history * 3 + outcome.ravel()  # Split every history by the feedback to this guess
+
+    return points[found_count, strike_count].mean(axis=1)
+
+
+def choose_guess(words, matrix, groups, strikes, isOneAway, correctGroups, previousGuesses, error,
+                 group_size=4, num_samples=DECISION_SAMPLES, seed=0):
+    """
+    Choose the guess, or endTurn, with the highest expected points.
+
+    Partitions of the words not yet in a correct group are sampled from the
+    pairwise scores (with a bonus for the solver's own groups); samples that
+    contradict the feedback (a wrong earlier guess forming a group, or the
+    one-away flag of the last guess) are dropped. The groups of the
+    TOP_K_PARTITIONS most frequent partitions and of the solver are the candidate
+    guesses (the MAX_CANDIDATES most probable are kept); the game is simulated
+    from each of them, and ending the turn scores the points already earned.
+
+    Parameters:
+    - words (list): The board.
+    - matrix (np.ndarray): (len(words), len(words)) pairwise scores from connections_model.
+    - groups (dict): The solver's groups.
+    - strikes, isOneAway, correctGroups, previousGuesses, error: The game state, as passed to model().
+    - group_size (int): The number of words per group.
+    - num_samples (int): The number of sampled partitions.
+    - seed (int): Seed of the sampling, so equal game states get equal answers.
+
+    Returns:
+    - tuple: (guess, endTurn, decision), where decision is a JSON-serializable dict with
+      the expected points of the chosen action and of ending the turn, or None when
+      the remaining words cannot be split into groups of group_size or exceed 64.
+    """
+    start_time = time.perf_counter()
+    found_words = {word.upper() for group in correctGroups for word in group}
+    remaining = [i for i, word in enumerate(words) if word.upper() not in found_words]
+    if not remaining or len(remaining) % group_size or len(remaining) > 64:
+        return None
+    position = {words[i].upper(): p for p, i in enumerate(remaining)}
+    sub = np.nan_to_num(np.asarray(matrix, dtype=np.float64)[np.ix_(remaining, remaining)])
+
+    solver_groups = [[position[word.upper()] for word in group if word.upper() in position]
+                     for group in groups.values()]
+    for members in solver_groups:
+        sub[np.ix_(members, members)] += SOLVER_BONUS
+    labels = sample_partitions(sub, group_size, num_samples, np.random.default_rng(seed))
+
+    # Condition on the feedback: wrong guesses are not groups, and the last one was (or was not) one away
+    guessed = {_canonical(guess) for guess in previousGuesses}
+    correct_keys = {_canonical(group) for group in correctGroups}
+    consistent = np.ones(num_samples, dtype=bool)
+    for index, guess in enumerate(previousGuesses):
+        if _canonical(guess) in correct_keys or any(word.upper() not in position for word in guess):
+            continue
+        positions = [position[word.upper()] for word in guess]
+        largest = _largest_share(labels, positions)
+        consistent &= largest < len(positions)
+        if index == len(previousGuesses) - 1 and not error and len(positions) == group_size:
+            consistent &= (largest == group_size - 1) == bool(isOneAway)
+    if consistent.any():
+        labels = labels[consistent]
+
+    # The most frequent partitions, and their groups plus the solver's as candidate guesses
+    rows = np.ascontiguousarray(labels).view(np.dtype((np.void, labels.shape[1] * labels.itemsize))).ravel()
+    _, first, counts = np.unique(rows, return_index=True, return_counts=True)
+    partitions = labels[first]
+    top = np.argsort(-counts, kind='stable')[:TOP_K_PARTITIONS]
+    candidates, seen = [], set()
+    for members in [np.flatnonzero(partitions[k] == root) for k in top for root in np.unique(partitions[k])] + \
+            [np.array(sorted(members)) for members in solver_groups if len(members) == group_size]:
+        key = _canonical(words[remaining[p]] for p in members)
+        if key not in seen and key not in guessed:
+            seen.add(key)
+            candidates.append(members)
+    end_points = float(_points_table(len(correctGroups))[len(correctGroups), min(strikes, MAX_STRIKES)])
+    if not candidates:
+        return [], True, {'action': 'endTurn', 'expected_points': end_points}
+
+    largest = np.stack([_largest_share(labels, members) for members in candidates], axis=1)
+    outcomes = np.where(largest == group_size, 2, np.where(largest == group_size - 1, 1, 0))
+    is_group = outcomes == 2
+    by_probability = np.argsort(-is_group.mean(axis=0), kind='stable')[:MAX_CANDIDATES]
+    candidates, outcomes, is_group = ([candidates[c] for c in by_probability], outcomes[:, by_probability],
+                                      is_group[:, by_probability])
+    values = simulate(candidates, outcomes, len(correctGroups), strikes, len(remaining), group_size)
+
+    # Candidates are by decreasing probability, so (near) ties go to the most probable one
+    best = int(np.flatnonzero(values >= values.max() - 1e-9)[0])
+    guess = [words[remaining[p]] for p in candidates[best]]
+    endTurn = bool(values[best] < end_points)
+    decision = {
+        'action': 'endTurn' if endTurn else 'guess',
+        'expected_points': float(max(values[best], end_points)),
+        'end_turn_points': end_points,
+        'probability': float(is_group[:, best].mean()),
+        'candidates': len(candidates),
+        'samples': int(len(labels)),
+        'top_partitions': [float(count / len(labels)) for count in counts[top]],
+        'elapsed_ms': (time.perf_counter() - start_time) * 1000,
+    }
+    return ([] if endTurn else guess), endTurn, decision
@@ -0,0 +1,31 @@
+# src/diagnostics.py
+
+###############################################################################
+#                                                                             #
+#                            Diagnostics Routes                               #
+#                                                                             #
+#      A Flask Blueprint exposing runtime figures (memory usage, admission    #
+#      control) as JSON. Registered on the app by serve.py, since app.py      #
+#      must not change.                                                       #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+from flask import Blueprint, jsonify
+
+from memory_telemetry import telemetry  # Process-wide memory telemetry
+from admission import admission  # Process-wide admission controller
+
+diagnostics = Blueprint('diagnostics', __name__, url_prefix='/diagnostics')
+
+
+@diagnostics.get('/memory')
+def memory():
+    """Return RSS/PSS, memory after loading, sampled per-request peaks and cache sizes."""
+    return jsonify(telemetry.snapshot())
+
+
+@diagnostics.get('/admission')
+def admission_metrics():
+    """Return the queue depth, running calls, rejection and shedding counts of admission control."""
+    return jsonify(admission.snapshot())
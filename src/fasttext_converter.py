@@ -0,0 +1,277 @@
+# src/fasttext_converter.py
+
+###############################################################################
+#                                                                             #
+#                           fastText Converter                                #
+#                                                                             #
+#      Streams a local fastText .vec (optionally gzipped), .bin or saved      #
+#      gensim .kv file row by row into a preallocated memory-mapped .npy      #
+#      matrix plus a vocabulary file and its compact index.                   #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import gzip
+import mmap
+import time
+import struct
+import logging
+import argparse
+import numpy as np
+
+from config import RAW_VECTORS_PATH, RAW_VOCAB_PATH  # Import centralized paths
+from vocab_index import ensure_vocab_index  # Compact key -> row index of the vocabulary
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+FASTTEXT_MAGIC = 793712314
+# End-of-sentence token; fastText gives it no subwords
+FASTTEXT_EOS = '</s>'
+
+
+def _open_text(path):
+    """Open a .vec file for reading, transparently handling gzip."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def _log_progress(done, total, start_time, progress_every):
+    if done % progress_every == 0 or done == total:
+        elapsed = time.time() - start_time
+        rate = done / elapsed if elapsed > 0 else 0.0
+        logging.info(f"  {done}/{total} rows converted ({rate:.0f} rows/s)")
+
+
+def convert_vec(source_path, vectors_path, vocab_path, max_words=None, progress_every=100000):
+    """
+    Convert a fastText .vec text file into a memory-mapped matrix and vocabulary.
+
+    Rows are parsed one at a time and written straight into a preallocated
+    `.npy` memmap, so peak memory does not depend on the vocabulary size.
+
+    Parameters:
+    - source_path (str): Path to the .vec or .vec.gz file.
+    - vectors_path (str): Output path for the (V, D) float32 .npy matrix.
+    - vocab_path (str): Output path for the vocabulary (one word per line, in row order).
+    - max_words (int): Keep only the first max_words rows (the most frequent words).
+    - progress_every (int): Log progress every this many rows.
+
+    Returns:
+    - tuple: The (V, D) shape of the written matrix.
+    """
+    with _open_text(source_path) as source:
+        num_words, dim = (int(value) for value in source.readline().split())
+        if max_words is not None:
+            num_words = min(num_words, max_words)
+
+        logging.info(f"Converting '{source_path}' ({num_words} words, {dim} dimensions)...")
+        vectors = np.lib.format.open_memmap(vectors_path, mode='w+', dtype=np.float32, shape=(num_words, dim))
+        start_time = time.time()
+        row = 0
+        with open(vocab_path, 'w', encoding='utf-8') as vocab:
+            for line in source:
+                if row >= num_words:
+                    break
+                # Split from the right so that the word itself may contain spaces
+                parts = line.rstrip('\n').rsplit(' ', dim)
+                if len(parts) != dim + 1:
+                    continue  # Skip malformed rows
+                vectors[row] = np.asarray(parts[1:], dtype=np.float32)
+                vocab.write(parts[0].replace('\n', ' ') + '\n')
+                row += 1
+                _log_progress(row, num_words, start_time, progress_every)
+
+    if row != num_words:
+        raise ValueError(f"Expected {num_words} rows in '{source_path}' but found {row}.")
+    vectors.flush()
+    del vectors
+    return num_words, dim
+
+
+def _fasttext_hash(ngram):
+    """FNV-1a hash as computed by fastText (bytes are sign-extended first)."""
+    h = 2166136261
+    for byte in ngram:
+        h ^= (byte - 256 if byte > 127 else byte) & 0xFFFFFFFF
+        h = (h * 16777619) & 0xFFFFFFFF
+    return h
+
+
+def _subword_rows(word, word_id, nwords, minn, maxn, bucket, pruneidx):
+    """Return the input-matrix rows whose mean is the fastText vector of a word."""
+    rows = [word_id]
+    if maxn <= 0 or bucket == 0 or word == FASTTEXT_EOS:
+        return rows
+    token = ('<' + word + '>').encode('utf-8')
+    for i in range(len(token)):
+        if (token[i] & 0xC0) == 0x80:
+            continue  # Skip UTF-8 continuation bytes
+        j = i
+        n = 1
+        while j < len(token) and n <= maxn:
+            j += 1
+            while j < len(token) and (token[j] & 0xC0) == 0x80:
+                j += 1
+            if n >= minn and not (n == 1 and (i == 0 or j == len(token))):
+                h = _fasttext_hash(token[i:j]) % bucket
+                if pruneidx is None:
+                    rows.append(nwords + h)
+                elif h in pruneidx:
+                    rows.append(nwords + pruneidx[h])
+            n += 1
+    return rows
+
+
+def convert_bin(source_path, vectors_path, vocab_path, max_words=None, progress_every=100000):
+    """
+    Convert a fastText .bin model into a memory-mapped matrix and vocabulary.
+
+    The binary file is memory-mapped and its input matrix is read in place;
+    each word vector is the mean of its word row and subword rows, exactly as
+    fastText computes it, and is written straight into the output memmap.
+
+    Parameters:
+    - source_path (str): Path to the .bin file.
+    - vectors_path (str): Output path for the (V, D) float32 .npy matrix.
+    - vocab_path (str): Output path for the vocabulary (one word per line, in row order).
+    - max_words (int): Keep only the first max_words words (the most frequent words).
+    - progress_every (int): Log progress every this many rows.
+
+    Returns:
+    - tuple: The (V, D) shape of the written matrix.
+    """
+    with open(source_path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        magic, version = struct.unpack_from('<ii', data, 0)
+        if magic != FASTTEXT_MAGIC:
+            raise ValueError(f"'{source_path}' is not a fastText binary model.")
+        (dim, _ws, _epoch, _min_count, _neg, _word_ngrams, _loss, _model,
+         bucket, minn, maxn, _lr_update_rate) = struct.unpack_from('<12i', data, 8)
+        offset = 8 + 12 * 4 + 8  # Header, integer arguments and the sampling threshold
+
+        # Dictionary: all words come first, followed by labels
+        size, nwords, _nlabels, _ntokens, pruneidx_size = struct.unpack_from('<iiiqq', data, offset)
+        offset += 4 * 3 + 8 * 2
+        words = []
+        for _ in range(size):
+            end = data.find(b'\0', offset)
+            entry_type = data[end + 1 + 8]
+            if entry_type == 0:
+                words.append(data[offset:end].decode('utf-8', errors='replace'))
+            offset = end + 1 + 8 + 1  # Word, count (int64) and type (int8)
+        pruneidx = None
+        if pruneidx_size >= 0:
+            pairs = np.frombuffer(data, dtype='<i4', count=2 * pruneidx_size, offset=offset).reshape(-1, 2)
+            pruneidx = {int(key): int(value) for key, value in pairs}
+            del pairs  # Release the view into the mapped file
+            offset += 8 * pruneidx_size
+
+        if data[offset]:
+            raise ValueError("Quantized fastText models (.ftz) are not supported.")
+        offset += 1
+        rows, cols = struct.unpack_from('<qq', data, offset)
+        offset += 16
+        if cols != dim:
+            raise ValueError(f"Unexpected input matrix shape ({rows}, {cols}) for dimension {dim}.")
+        matrix = np.frombuffer(data, dtype='<f4', count=rows * cols, offset=offset).reshape(rows, cols)
+
+        num_words = len(words) if max_words is None else min(len(words), max_words)
+        logging.info(f"Converting '{source_path}' (version {version}, {num_words} words, {dim} dimensions)...")
+        vectors = np.lib.format.open_memmap(vectors_path, mode='w+', dtype=np.float32, shape=(num_words, dim))
+        start_time = time.time()
+        with open(vocab_path, 'w', encoding='utf-8') as vocab:
+            for word_id in range(num_words):
+                word = words[word_id]
+                subword_rows = _subword_rows(word, word_id, nwords, minn, maxn, bucket, pruneidx)
+                vectors[word_id] = matrix[subword_rows].mean(axis=0)
+                vocab.write(word.replace('\n', ' ') + '\n')
+                _log_progress(word_id + 1, num_words, start_time, progress_every)
+
+        vectors.flush()
+        del vectors, matrix
+    return num_words, dim
+
+
+def convert_kv(source_path, vectors_path, vocab_path, max_words=None, progress_every=100000):
+    """
+    Export a saved gensim KeyedVectors (.kv) to the raw format, so it is served
+    without unpickling its million-entry vocabulary dict.
+
+    Parameters and return value are the same as for convert_vec.
+    """
+    from gensim.models import KeyedVectors
+
+    model = KeyedVectors.load(source_path, mmap='r')
+    num_words, dim = model.vectors.shape
+    if max_words is not None:
+        num_words = min(num_words, max_words)
+
+    logging.info(f"Converting '{source_path}' ({num_words} words, {dim} dimensions)...")
+    vectors = np.lib.format.open_memmap(vectors_path, mode='w+', dtype=np.float32, shape=(num_words, dim))
+    start_time = time.time()
+    with open(vocab_path, 'w', encoding='utf-8') as vocab:
+        for start in range(0, num_words, progress_every):
+            end = min(start + progress_every, num_words)
+            vectors[start:end] = model.vectors[start:end]
+            vocab.write(''.join(key.replace('\n', ' ') + '\n' for key in model.index_to_key[start:end]))
+            _log_progress(end, num_words, start_time, progress_every)
+    vectors.flush()
+    del vectors
+    return num_words, dim
+
+
+def convert_fasttext(source_path, vectors_path=None, vocab_path=None, max_words=None, progress_every=100000):
+    """
+    Convert a local fastText file to the memory-mapped format read by ModelLoader.
+
+    The compact vocabulary index (see vocab_index.py) is built as well, so
+    workers do not build it on their first load.
+
+    Parameters:
+    - source_path (str): Path to a .vec, .vec.gz, .bin or gensim .kv file.
+    - vectors_path (str): Output path for the .npy matrix (defaults to RAW_VECTORS_PATH).
+    - vocab_path (str): Output path for the vocabulary (defaults to RAW_VOCAB_PATH).
+    - max_words (int): Keep only the first max_words words.
+    - progress_every (int): Log progress every this many rows.
+
+    Returns:
+    - tuple: The (V, D) shape of the written matrix.
+    """
+    if vectors_path is None:
+        vectors_path = RAW_VECTORS_PATH
+    if vocab_path is None:
+        vocab_path = RAW_VOCAB_PATH
+    output_dir = os.path.dirname(vectors_path)
+    if output_dir and not os.path.isdir(output_dir):
+        os.makedirs(output_dir)
+
+    # Write to temporary names first so a partial conversion is never picked up by the loader
+    tmp_vectors_path = vectors_path + '.partial.npy'
+    tmp_vocab_path = vocab_path + '.partial'
+    start_time = time.time()
+    if source_path.endswith('.kv'):
+        shape = convert_kv(source_path, tmp_vectors_path, tmp_vocab_path, max_words, progress_every)
+    elif source_path.endswith('.bin'):
+        shape = convert_bin(source_path, tmp_vectors_path, tmp_vocab_path, max_words, progress_every)
+    else:
+        shape = convert_vec(source_path, tmp_vectors_path, tmp_vocab_path, max_words, progress_every)
+    os.replace(tmp_vectors_path, vectors_path)
+    os.replace(tmp_vocab_path, vocab_path)
+    ensure_vocab_index(vocab_path, shape[0])
+
+    logging.info(f"Converted {shape[0]} vectors to '{vectors_path}' in {time.time() - start_time:.2f} seconds.")
+    return shape
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert a local fastText .vec/.bin (or gensim .kv) file to memory-mapped .npy format.")
+    parser.add_argument('source_path', help="Path to a .vec, .vec.gz, .bin or .kv file.")
+    parser.add_argument('--vectors-path', default=RAW_VECTORS_PATH, help="Output .npy matrix path.")
+    parser.add_argument('--vocab-path', default=RAW_VOCAB_PATH, help="Output vocabulary path.")
+    parser.add_argument('--max-words', type=int, default=None, help="Keep only the first N words.")
+    parser.add_argument('--progress-every', type=int, default=100000, help="Log progress every N rows.")
+    args = parser.parse_args()
+
+    convert_fasttext(args.source_path, args.vectors_path, args.vocab_path, args.max_words, args.progress_every)
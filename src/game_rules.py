@@ -0,0 +1,160 @@
+# src/game_rules.py
+
+###############################################################################
+#                                                                             #
+#                               Game Rules                                    #
+#                                                                             #
+#      The Connections game rules used by the evaluator: guess validation,    #
+#      one-away detection and scoring.                                        #
+#                                                                             #
+###############################################################################
+
+# Scoring multipliers, by number of groups found and by number of strikes
+GROUP_MULTIPLIERS = {1: 1, 2: 2, 3: 3, 4: 3}
+# Multiplier of the fifth and later groups of larger boards (5x5, 6x4). The evaluator stops at
+# four groups; its if/elif chain would keep the fourth group's multiplier for any later one
+LATER_GROUP_MULTIPLIER = 3
+STRIKE_MULTIPLIERS = {0: 1, 1: 0.9, 2: 0.75, 3: 0.5, 4: 0.25}
+
+MAX_STRIKES = 4
+MAX_INVALID_GUESSES = 7
+
+
+def validate_guess(puzzle, guess, previousGuesses):
+    """
+    Check a guess the way the evaluator does, before judging it.
+
+    The evaluator compares words case-sensitively and rejects a repeated guess
+    first; any other guess then joins previousGuesses, even one with the wrong
+    number of words, which is rejected next.
+
+    Parameters:
+    - puzzle (list): The correct groups of the puzzle (of any equal size).
+    - guess (list): The guessed words.
+    - previousGuesses (list): The guesses made so far.
+
+    Returns:
+    - tuple: (error, record) where error is the error message of an invalid guess (empty
+      otherwise) and record tells whether the guess joins previousGuesses.
+    """
+    if not isinstance(guess, list):
+        return "Model returned an invalid guess.", False
+    if any(sorted(guess) == sorted(previous) for previous in previousGuesses):
+        return "You have already guessed this combination.", False
+    group_size = len(puzzle[0]) if puzzle else 4
+    if len(guess) != group_size:
+        return f"Please enter {group_size} words.", True
+    return "", True
+
+
+def judge_guess(puzzle, guess, isOneAway=False):
+    """
+    Judge a valid guess against the puzzle the way the evaluator does.
+
+    Groups are scanned in order: the scan stops at the group the guess matches or
+    is one away from, and every other group scanned clears the one-away flag. A
+    correct guess therefore leaves the previous flag unchanged when it matches
+    the first group.
+
+    Parameters:
+    - puzzle (list): The correct groups of the puzzle.
+    - guess (list): The guessed words.
+    - isOneAway (bool): The one-away flag before this guess.
+
+    Returns:
+    - tuple: (correct_group, isOneAway) where correct_group is the matched group or None.
+    """
+    sortedGuess = sorted(guess)
+    for group in puzzle:
+        if sorted(group) == sortedGuess:
+            return group, isOneAway
+        if len(set(group).symmetric_difference(guess)) == 2:
+            return None, True
+        isOneAway = False
+    return None, isOneAway
+
+
+def check_guess(puzzle, guess, previousGuesses, isOneAway=False):
+    """
+    Validate and judge a guess (see `validate_guess` and `judge_guess`).
+
+    Returns:
+    - tuple: (error, correct_group, isOneAway); an invalid guess leaves isOneAway unchanged.
+    """
+    error, _ = validate_guess(puzzle, guess, previousGuesses)
+    if error:
+        return error, None, isOneAway
+    return ("",) + judge_guess(puzzle, guess, isOneAway)
+
+
+def group_multiplier(number):
+    """Return the multiplier of the number-th group found (1-based), LATER_GROUP_MULTIPLIER past the fourth."""
+    return GROUP_MULTIPLIERS.get(number, LATER_GROUP_MULTIPLIER)
+
+
+def score_game(correctGroups, strikes):
+    """
+    Calculate the points scored in a puzzle.
+
+    Parameters:
+    - correctGroups (list): The groups found, in the order they were found.
+    - strikes (int): The number of strikes at the end of the puzzle.
+
+    Returns:
+    - float: The points scored.
+    """
+    strikeMult = STRIKE_MULTIPLIERS.get(strikes, 0.25)
+    return sum(group_multiplier(i + 1) * strikeMult for i in range(len(correctGroups)))
+
+
+def play_game(puzzle, words, guess_fn, invalidGuesses=0):
+    """
+    Play one full puzzle, calling `guess_fn` once per turn, in the order of tests/evaluator.py.
+
+    Parameters:
+    - puzzle (list): The correct groups of the puzzle.
+    - words (list): The shuffled words shown to the player.
+    - guess_fn (callable): Called as guess_fn(words, strikes, isOneAway, correctGroups,
+      previousGuesses, error) and returning (guess, endTurn).
+    - invalidGuesses (int): Invalid guesses made on earlier puzzles; the evaluator counts
+      them across all puzzles and stops asking once there are MAX_INVALID_GUESSES.
+
+    Returns:
+    - dict: The final correctGroups, strikes, invalidGuesses (including earlier puzzles),
+      turns and points.
+    """
+    strikes = 0
+    correctGroups = []
+    previousGuesses = []
+    error = 0  # The evaluator sends 0 when there is no error
+    isOneAway = False
+    turns = 0
+
+    while strikes < MAX_STRIKES and len(correctGroups) < len(puzzle) and invalidGuesses < MAX_INVALID_GUESSES:
+        guess, endTurn = guess_fn(words, strikes, isOneAway, correctGroups, previousGuesses, error)
+        turns += 1
+
+        # Invalid guesses are counted even with endTurn, which only ends the game after a valid guess
+        error, record = validate_guess(puzzle, guess, previousGuesses)
+        if record:
+            previousGuesses.append(guess)
+        if error:
+            invalidGuesses += 1
+            continue
+        error = 0
+        if endTurn:
+            break
+
+        correct_group, isOneAway = judge_guess(puzzle, guess, isOneAway)
+        if correct_group is not None:
+            correctGroups.append(correct_group)
+        else:
+            strikes += 1
+
+    return {
+        'correctGroups': correctGroups,
+        'strikes': strikes,
+        'invalidGuesses': invalidGuesses,
+        'turns': turns,
+        'points': score_game(correctGroups, strikes),
+    }
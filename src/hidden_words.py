@@ -0,0 +1,247 @@
+# src/hidden_words.py
+
+###############################################################################
+#                                                                             #
+#                          Hidden Word Detector                               #
+#                                                                             #
+#      An Aho-Corasick automaton over classes of words (animals, body         #
+#      parts, ...) that finds, in one linear pass per board word, which       #
+#      classes a word hides, for "words containing a ..." categories.         #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import json
+import logging
+from collections import deque, defaultdict
+import numpy as np
+
+from config import HIDDEN_WORD_LISTS_PATH, HIDDEN_WORDS_TOP_K  # Import centralized settings
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Shorter hidden words match almost anything
+MIN_HIDDEN_LENGTH = 3
+
+# Word classes used when no HIDDEN_WORD_LISTS_PATH file is provided
+DEFAULT_WORD_LISTS = {
+    'animal': ['ant', 'ape', 'asp', 'bat', 'bear', 'bee', 'boar', 'cat', 'cod', 'cow', 'crow', 'deer', 'doe',
+               'dog', 'eel', 'elk', 'emu', 'ewe', 'fox', 'gnu', 'goat', 'hare', 'hen', 'hog', 'lion', 'lynx',
+               'mole', 'moth', 'mule', 'newt', 'owl', 'pig', 'puma', 'ram', 'rat', 'seal', 'slug', 'swan',
+               'toad', 'wasp', 'wolf', 'worm', 'yak'],
+    'body part': ['arm', 'back', 'brow', 'calf', 'chin', 'ear', 'elbow', 'eye', 'foot', 'hand', 'head', 'heel',
+                  'hip', 'knee', 'leg', 'lip', 'lung', 'nail', 'neck', 'nose', 'palm', 'rib', 'shin', 'skin',
+                  'toe', 'thigh', 'wrist'],
+    'color': ['red', 'tan', 'blue', 'gold', 'gray', 'grey', 'green', 'jade', 'lime', 'navy', 'pink', 'rose',
+              'ruby', 'teal'],
+    'number': ['one', 'two', 'six', 'ten', 'four', 'five', 'nine', 'seven', 'eight', 'three'],
+}
+
+
+class HiddenWordDetector:
+    """
+    Aho-Corasick automaton reporting the classes of the words hidden in a string.
+
+    The automaton is built once from {class: [words]}; scanning a word then
+    takes time linear in its length plus the number of matches, whatever the
+    number of hidden words.
+    """
+
+    def __init__(self, word_lists, min_length=MIN_HIDDEN_LENGTH):
+        self.classes = sorted(word_lists)
+        # Trie transitions, failure links and (class, word) outputs per node
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        for class_name, class_words in word_lists.items():
+            for hidden in class_words:
+                hidden = hidden.lower()
+                if len(hidden) < min_length:
+                    continue
+                node = 0
+                for char in hidden:
+                    if char not in self._goto[node]:
+                        self._goto[node][char] = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append([])
+                    node = self._goto[node][char]
+                self._output[node].append((class_name, hidden))
+
+        # Breadth-first pass: failure links point to the longest proper suffix in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(char, 0) if node else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    @property
+    def num_nodes(self):
+        """Number of automaton states."""
+        return len(self._goto)
+
+    def scan(self, text):
+        """
+        Find every listed word hidden in a string.
+
+        Parameters:
+        - text (str): The string to scan (case-insensitive).
+
+        Returns:
+        - list: (class, hidden word, start offset) tuples, in order of their end position.
+        """
+        matches = []
+        node = 0
+        for position, char in enumerate(text.lower()):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for class_name, hidden in self._output[node]:
+                matches.append((class_name, hidden, position - len(hidden) + 1))
+        return matches
+
+    def hidden_classes(self, word):
+        """
+        Return the classes a word hides, ignoring the word itself and its plural.
+
+        A board word that simply is an animal ('cat', 'cats') belongs to a
+        semantic category, not to a "contains an animal" one.
+        """
+        word = word.lower()
+        return {class_name for class_name, hidden, _ in self.scan(word)
+                if word not in (hidden, hidden + 's', hidden + 'es')}
+
+
+def hidden_class_matrix(words, detector):
+    """
+    Pairwise hidden-word signal: 1 if two words hide words of a common class.
+
+    Parameters:
+    - words (list): The board words.
+    - detector (HiddenWordDetector): The automaton to scan with.
+
+    Returns:
+    - np.ndarray: A (len(words), len(words)) matrix of 0/1 values (0 on the diagonal).
+    - list: The set of hidden classes of each word.
+    """
+    classes = [detector.hidden_classes(word) for word in words]
+    class_index = {class_name: i for i, class_name in enumerate(detector.classes)}
+    membership = np.zeros((len(words), len(class_index)))
+    for row, word_classes in enumerate(classes):
+        for class_name in word_classes:
+            membership[row, class_index[class_name]] = 1.0
+    matrix = np.minimum(membership @ membership.T, 1.0)
+    np.fill_diagonal(matrix, 0.0)
+    return matrix, classes
+
+
+def hidden_class_groups(words, classes, group_size=4):
+    """
+    Group words hiding words of the same class, one bucket per class.
+
+    Parameters:
+    - words (list): The words to group.
+    - classes (dict): The set of hidden classes of each word, by word.
+    - group_size (int): The number of words per group.
+
+    Returns:
+    - list: (class, group) pairs; classes with exactly group_size words come first,
+      since a larger bucket means some of its words belong elsewhere.
+    """
+    buckets = defaultdict(list)
+    for word in words:
+        for class_name in sorted(classes[word]):
+            buckets[class_name].append(word)
+
+    groups = []
+    used = set()
+    for class_name, bucket in sorted(buckets.items(), key=lambda item: (len(item[1]) != group_size, item[0])):
+        bucket = [word for word in bucket if word not in used]
+        if len(bucket) >= group_size:
+            groups.append((class_name, bucket[:group_size]))
+            used.update(bucket[:group_size])
+    return groups
+
+
+def expand_word_lists(word_lists, model, top_k, min_similarity=0.6, min_length=MIN_HIDDEN_LENGTH,
+                      chunk_size=65536):
+    """
+    Grow every class with the top_k most frequent vocabulary words close to it.
+
+    A vocabulary word joins a class when its cosine similarity to the centroid
+    of the class's listed words reaches min_similarity.
+
+    Parameters:
+    - word_lists (dict): {class: [words]} to start from.
+    - model: The loaded KeyedVectors (vocabulary sorted by frequency).
+    - top_k (int): The number of vocabulary words considered.
+    - min_similarity (float): Cosine similarity needed to join a class.
+    - min_length (int): Minimum length of added words.
+
+    Returns:
+    - dict: The expanded {class: [words]}.
+    """
+    names, centroids = [], []
+    for class_name, class_words in word_lists.items():
+        known = [word for word in class_words if word in model.key_to_index]
+        if known:
+            centroid = np.mean([model[word] for word in known], axis=0)
+            centroids.append(centroid / (np.linalg.norm(centroid) or 1.0))
+            names.append(class_name)
+    expanded = {class_name: list(class_words) for class_name, class_words in word_lists.items()}
+    if not centroids:
+        return expanded
+
+    centroids = np.asarray(centroids, dtype=np.float32)
+    top_k = min(top_k, len(model.index_to_key))
+    for start in range(0, top_k, chunk_size):
+        end = min(start + chunk_size, top_k)
+        vectors = np.asarray(model.vectors[start:end], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        norms[norms == 0] = 1.0
+        similarities = (vectors @ centroids.T) / norms[:, None]
+        for row, column in zip(*np.nonzero(similarities >= min_similarity)):
+            word = model.index_to_key[start + row]
+            if len(word) >= min_length and word.isalpha() and word.islower():
+                expanded[names[column]].append(word)
+    return {class_name: sorted(set(class_words)) for class_name, class_words in expanded.items()}
+
+
+def load_detector(model=None, path=None, top_k=None):
+    """
+    Build the detector from the configured word lists.
+
+    Parameters:
+    - model: Optional KeyedVectors used to expand the lists from the vocabulary.
+    - path (str): JSON file of {class: [words]} (defaults to HIDDEN_WORD_LISTS_PATH,
+      falling back to DEFAULT_WORD_LISTS when it does not exist).
+    - top_k (int): Vocabulary words considered for expansion (defaults to
+      HIDDEN_WORDS_TOP_K; 0 disables expansion).
+
+    Returns:
+    - HiddenWordDetector: The built automaton.
+    """
+    if path is None:
+        path = HIDDEN_WORD_LISTS_PATH
+    if top_k is None:
+        top_k = HIDDEN_WORDS_TOP_K
+
+    word_lists = DEFAULT_WORD_LISTS
+    if os.path.isfile(path):
+        with open(path, 'r', encoding='utf-8') as file:
+            word_lists = json.load(file)
+    if model is not None and top_k:
+        word_lists = expand_word_lists(word_lists, model, top_k)
+
+    detector = HiddenWordDetector(word_lists)
+    logging.info(f"Hidden word detector built with {sum(len(words) for words in word_lists.values())} words "
+                 f"in {len(word_lists)} classes.")
+    return detector
@@ -0,0 +1,221 @@
+# src/knn_graph.py
+
+###############################################################################
+#                                                                             #
+#                              kNN Graph Builder                              #
+#                                                                             #
+#      Precomputes the exact top-N neighbors of the most frequent words and   #
+#      stores them as memory-mapped CSR arrays (indptr/indices/scores).       #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import json
+import time
+import logging
+import argparse
+import multiprocessing
+import numpy as np
+
+from config import EMBEDDINGS_PATH, KNN_GRAPH_DIR  # Import centralized paths
+from similarity_metrics import _chunked_top_k
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Per-worker state, filled in by _init_worker
+_worker_vectors = None
+_worker_norms = None
+_worker_top_n = None
+_worker_chunk_size = None
+
+
+class KnnGraph:
+    """
+    Read-only neighbor graph in CSR layout.
+
+    Row i holds the neighbors of vocabulary index i, ordered by descending
+    cosine similarity: indices[indptr[i]:indptr[i + 1]].
+    """
+
+    def __init__(self, indptr, indices, scores, top_n, meta=None):
+        self.indptr = indptr
+        self.indices = indices
+        self.scores = scores
+        self.top_n = top_n
+        self.meta = meta  # The meta.json of a loaded graph (source vectors, sizes)
+
+    @property
+    def num_rows(self):
+        return self.indptr.shape[0] - 1
+
+    @classmethod
+    def load(cls, graph_dir=KNN_GRAPH_DIR, vectors_path=None, num_vectors=None):
+        """
+        Load a graph written by `build_knn_graph` with memory mapping.
+
+        Row and neighbor indices are only meaningful for the vectors the graph was
+        built from, so a graph built from other vectors is refused.
+
+        Parameters:
+        - graph_dir (str): The directory holding the CSR arrays.
+        - vectors_path (str): The vectors file of the model the graph will be used with, if known.
+        - num_vectors (int): The vocabulary size of that model, if known.
+
+        Returns:
+        - KnnGraph: The memory-mapped graph, or None if it was built from other vectors.
+        """
+        with open(os.path.join(graph_dir, 'meta.json'), 'r', encoding='utf-8') as file:
+            meta = json.load(file)
+        if vectors_path is not None and meta.get('source') != os.path.abspath(vectors_path):
+            logging.warning(f"kNN graph at '{graph_dir}' was built from '{meta.get('source')}', not from "
+                            f"'{os.path.abspath(vectors_path)}'. Rebuild it for the loaded vectors with knn_graph.py.")
+            return None
+        if num_vectors is not None and meta.get('num_vectors', num_vectors) != num_vectors:
+            logging.warning(f"kNN graph at '{graph_dir}' was built for {meta['num_vectors']} vectors, but the model "
+                            f"has {num_vectors}. Rebuild it for the loaded vectors with knn_graph.py.")
+            return None
+        indptr = np.load(os.path.join(graph_dir, 'indptr.npy'), mmap_mode='r')
+        indices = np.load(os.path.join(graph_dir, 'indices.npy'), mmap_mode='r')
+        scores = np.load(os.path.join(graph_dir, 'scores.npy'), mmap_mode='r')
+        if num_vectors is not None and indptr.shape[0] - 1 > num_vectors:
+            logging.warning(f"kNN graph at '{graph_dir}' covers {indptr.shape[0] - 1} words, but the model has "
+                            f"{num_vectors}. Rebuild it for the loaded vectors with knn_graph.py.")
+            return None
+        return cls(indptr, indices, scores, meta['top_n'], meta)
+
+    def neighbors(self, index, top_n=None):
+        """
+        Return the neighbor indices of a vocabulary index.
+
+        Parameters:
+        - index (int): The vocabulary index of the word.
+        - top_n (int): The number of neighbors wanted (defaults to all stored).
+
+        Returns:
+        - np.ndarray: The neighbor indices, or None if the graph does not cover
+          this word or stores fewer than top_n neighbors.
+        """
+        if top_n is None:
+            top_n = self.top_n
+        if index >= self.num_rows or top_n > self.top_n:
+            return None
+        start = self.indptr[index]
+        return self.indices[start:start + top_n]
+
+
+def _init_worker(vectors_path, norms_path, top_n, chunk_size):
+    """Open the memory-mapped arrays once per worker process."""
+    global _worker_vectors, _worker_norms, _worker_top_n, _worker_chunk_size
+    _worker_vectors = np.load(vectors_path, mmap_mode='r')
+    _worker_norms = np.load(norms_path, mmap_mode='r')
+    _worker_top_n = top_n
+    _worker_chunk_size = chunk_size
+
+
+def _process_block(block):
+    """Compute the exact neighbors of the query rows [start, end)."""
+    start, end = block
+    queries = np.asarray(_worker_vectors[start:end], dtype=np.float32)
+    query_norms = np.array(_worker_norms[start:end], dtype=np.float32)
+    query_norms[query_norms == 0] = 1.0
+    queries = queries / query_norms[:, None]
+    exclude = np.arange(start, end)
+    indices, scores = _chunked_top_k(
+        queries, _worker_vectors, _worker_norms, _worker_top_n,
+        chunk_size=_worker_chunk_size, exclude=exclude
+    )
+    return start, indices.astype(np.int32), scores.astype(np.float32)
+
+
+def build_knn_graph(model_path=None, graph_dir=None, top_k=100000, top_n=50,
+                    block_size=1024, chunk_size=65536, workers=None):
+    """
+    Build the exact top_n neighbor graph for the top_k vocabulary words.
+
+    Query rows are split into blocks of `block_size` and scored against the
+    whole vocabulary in chunks of `chunk_size`, so every worker holds at most
+    block_size * chunk_size floats of similarities at a time.
+
+    Parameters:
+    - model_path (str): Path to the saved KeyedVectors (its `.vectors.npy` is read), or to the
+      `.npy` vectors of a raw export.
+    - graph_dir (str): Output directory for the CSR arrays.
+    - top_k (int): The number of most frequent words to compute neighbors for.
+    - top_n (int): The number of neighbors stored per word.
+    - block_size (int): The number of query rows per task.
+    - chunk_size (int): The number of vocabulary rows per matrix product.
+    - workers (int): The number of worker processes (defaults to the CPU count).
+
+    Returns:
+    - str: The directory the graph was written to.
+    """
+    if model_path is None:
+        model_path = EMBEDDINGS_PATH
+    if graph_dir is None:
+        graph_dir = KNN_GRAPH_DIR
+
+    vectors_path = model_path if model_path.endswith('.npy') else model_path + '.vectors.npy'
+    if not os.path.isfile(vectors_path):
+        raise FileNotFoundError(f"Vectors file not found at '{vectors_path}'. Load the model once to create it.")
+    if not os.path.isdir(graph_dir):
+        os.makedirs(graph_dir)
+
+    vectors = np.load(vectors_path, mmap_mode='r')
+    top_k = min(top_k, vectors.shape[0])
+
+    # Compute the row norms once, chunk by chunk, and share them with the workers
+    logging.info(f"Computing norms for {vectors.shape[0]} vectors...")
+    norms_path = os.path.join(graph_dir, 'norms.npy')
+    norms = np.lib.format.open_memmap(norms_path, mode='w+', dtype=np.float32, shape=(vectors.shape[0],))
+    for start in range(0, vectors.shape[0], chunk_size):
+        end = min(start + chunk_size, vectors.shape[0])
+        norms[start:end] = np.linalg.norm(np.asarray(vectors[start:end], dtype=np.float32), axis=1)
+    norms.flush()
+    del norms
+
+    # Preallocate the CSR arrays on disk; every row holds exactly top_n neighbors
+    np.save(os.path.join(graph_dir, 'indptr.npy'), np.arange(top_k + 1, dtype=np.int64) * top_n)
+    indices = np.lib.format.open_memmap(os.path.join(graph_dir, 'indices.npy'), mode='w+',
+                                        dtype=np.int32, shape=(top_k * top_n,))
+    scores = np.lib.format.open_memmap(os.path.join(graph_dir, 'scores.npy'), mode='w+',
+                                       dtype=np.float32, shape=(top_k * top_n,))
+
+    blocks = [(start, min(start + block_size, top_k)) for start in range(0, top_k, block_size)]
+    workers = workers or os.cpu_count() or 1
+    logging.info(f"Building kNN graph for {top_k} words (top_n={top_n}) with {workers} workers...")
+    start_time = time.time()
+    with multiprocessing.Pool(workers, initializer=_init_worker,
+                              initargs=(vectors_path, norms_path, top_n, chunk_size)) as pool:
+        for done, (start, block_indices, block_scores) in enumerate(pool.imap_unordered(_process_block, blocks), 1):
+            end = start + block_indices.shape[0]
+            indices[start * top_n:end * top_n] = block_indices.ravel()
+            scores[start * top_n:end * top_n] = block_scores.ravel()
+            if done % 10 == 0 or done == len(blocks):
+                logging.info(f"  {done}/{len(blocks)} blocks done ({time.time() - start_time:.1f} seconds)")
+    indices.flush()
+    scores.flush()
+
+    with open(os.path.join(graph_dir, 'meta.json'), 'w', encoding='utf-8') as file:
+        json.dump({'source': os.path.abspath(vectors_path), 'num_vectors': int(vectors.shape[0]), 'top_k': top_k,
+                   'top_n': top_n}, file)
+
+    logging.info(f"kNN graph written to '{graph_dir}' in {time.time() - start_time:.2f} seconds.")
+    return graph_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the precomputed kNN graph used for neighbor overlap.")
+    parser.add_argument('--model-path', default=EMBEDDINGS_PATH,
+                        help="Path to the saved KeyedVectors (or to the .npy vectors of a raw export).")
+    parser.add_argument('--graph-dir', default=KNN_GRAPH_DIR, help="Output directory for the CSR arrays.")
+    parser.add_argument('--top-k', type=int, default=100000, help="Number of most frequent words to cover.")
+    parser.add_argument('--top-n', type=int, default=50, help="Number of neighbors stored per word.")
+    parser.add_argument('--block-size', type=int, default=1024, help="Query rows per task.")
+    parser.add_argument('--chunk-size', type=int, default=65536, help="Vocabulary rows per matrix product.")
+    parser.add_argument('--workers', type=int, default=None, help="Number of worker processes.")
+    args = parser.parse_args()
+
+    build_knn_graph(args.model_path, args.graph_dir, args.top_k, args.top_n,
+                    args.block_size, args.chunk_size, args.workers)
@@ -0,0 +1,186 @@
+# src/memory_telemetry.py
+
+###############################################################################
+#                                                                             #
+#                             Memory Telemetry                                #
+#                                                                             #
+#      Reports process RSS/PSS (so mmap sharing between workers is visible),  #
+#      sampled peak allocations per model() call and the size of every       #
+#      registered cache.                                                      #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import time
+import random
+import resource
+import threading
+import tracemalloc
+from contextlib import contextmanager
+
+from config import MEMORY_SAMPLE_RATE  # Import centralized setting
+
+# Fields of /proc/self/smaps_rollup reported, in bytes
+SMAPS_FIELDS = {
+    'Rss': 'rss_bytes',
+    'Pss': 'pss_bytes',
+    'Shared_Clean': 'shared_clean_bytes',
+    'Private_Clean': 'private_clean_bytes',
+    'Private_Dirty': 'private_dirty_bytes',
+    'Swap': 'swap_bytes',
+}
+
+
+def process_memory():
+    """
+    Read the memory usage of the current process.
+
+    PSS (proportional set size) charges each shared page to the processes that
+    map it, so memory-mapped vectors shared by several workers are counted once
+    in total. It is only available on Linux; elsewhere RSS is estimated from the
+    peak resident size reported by getrusage.
+
+    Returns:
+    - dict: Memory figures in bytes (missing figures are None).
+    """
+    usage = {name: None for name in SMAPS_FIELDS.values()}
+    try:
+        with open('/proc/self/smaps_rollup', 'r') as file:
+            for line in file:
+                field, _, value = line.partition(':')
+                if field in SMAPS_FIELDS:
+                    usage[SMAPS_FIELDS[field]] = int(value.split()[0]) * 1024  # Reported in kB
+        return usage
+    except OSError:
+        pass
+
+    # ru_maxrss is in kB on Linux and in bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    usage['rss_bytes'] = max_rss if os.uname().sysname == 'Darwin' else max_rss * 1024
+    return usage
+
+
+def _object_size(value):
+    """Size in bytes of numpy arrays (including memory-mapped ones) held by a cached object."""
+    if hasattr(value, 'nbytes'):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(_object_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(_object_size(item) for item in value)
+    return sum(int(array.nbytes) for array in vars(value).values() if hasattr(array, 'nbytes')) \
+        if hasattr(value, '__dict__') else 0
+
+
+class MemoryTelemetry:
+    """
+    Collects memory figures for the diagnostics route and the benchmarks.
+
+    Per-request peaks are measured with tracemalloc, which slows down allocation
+    while it is tracing, so only a random fraction of the calls is traced and at
+    most one call at a time. Allocations of other threads during a traced call
+    are included in its peak, so peaks are an upper bound under concurrency.
+    """
+
+    def __init__(self, sample_rate=MEMORY_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._trace_lock = threading.Lock()
+        self._loads = {}
+        self._caches = {}
+        self._requests = 0
+        self._sampled = 0
+        self._peak_total = 0
+        self._peak_max = 0
+        self._peak_last = None
+
+    def record_load(self, label):
+        """Store the process memory right after a loading step (e.g. 'load_vectors')."""
+        usage = process_memory()
+        usage['time'] = time.time()
+        with self._lock:
+            self._loads[label] = usage
+        return usage
+
+    def register_cache(self, name, size_fn):
+        """
+        Register a cache to report.
+
+        Parameters:
+        - name (str): Name shown in the report.
+        - size_fn (callable): Returns the cached object (its array bytes are summed),
+          or a dict with 'entries' and/or 'bytes'.
+        """
+        with self._lock:
+            self._caches[name] = size_fn
+
+    def cache_sizes(self):
+        """Return {name: {'entries': ..., 'bytes': ...}} for every registered cache."""
+        with self._lock:
+            caches = dict(self._caches)
+        sizes = {}
+        for name, size_fn in caches.items():
+            value = size_fn()
+            if isinstance(value, dict) and ('entries' in value or 'bytes' in value):
+                sizes[name] = {'entries': value.get('entries'), 'bytes': value.get('bytes')}
+            else:
+                entries = None if value is None else len(value) if isinstance(value, (dict, list, tuple)) else 1
+                sizes[name] = {'entries': entries, 'bytes': _object_size(value)}
+        return sizes
+
+    @contextmanager
+    def sample_request(self):
+        """Context manager around one model() call; traces its peak allocations if sampled."""
+        with self._lock:
+            self._requests += 1
+        traced = (self.sample_rate > 0 and random.random() < self.sample_rate
+                  and not tracemalloc.is_tracing() and self._trace_lock.acquire(blocking=False))
+        if not traced:
+            yield
+            return
+
+        try:
+            tracemalloc.start()
+            try:
+                yield
+            finally:
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                with self._lock:
+                    self._sampled += 1
+                    self._peak_total += peak
+                    self._peak_max = max(self._peak_max, peak)
+                    self._peak_last = peak
+        finally:
+            self._trace_lock.release()
+
+    def snapshot(self):
+        """
+        Return every memory figure as a JSON-serializable dict.
+
+        Returns:
+        - dict: 'process' (current RSS/PSS), 'loads' (memory after each loading
+          step), 'requests' (sampled per-call peaks) and 'caches'.
+        """
+        with self._lock:
+            requests = {
+                'count': self._requests,
+                'sampled': self._sampled,
+                'sample_rate': self.sample_rate,
+                'peak_bytes_mean': self._peak_total / self._sampled if self._sampled else None,
+                'peak_bytes_max': self._peak_max if self._sampled else None,
+                'peak_bytes_last': self._peak_last,
+            }
+            loads = {label: dict(usage) for label, usage in self._loads.items()}
+        return {
+            'pid': os.getpid(),
+            'process': process_memory(),
+            'loads': loads,
+            'requests': requests,
+            'caches': self.cache_sizes(),
+        }
+
+
+# Process-wide telemetry shared by Model.py, serve.py and the benchmarks
+telemetry = MemoryTelemetry()
@@ -3,22 +3,88 @@
 import os
 import time
 import logging
-import gensim.downloader as api
-from gensim.models import KeyedVectors
-from config import EMBEDDINGS_PATH  # Import centralized path
+import functools
+import threading
+import numpy as np
+from config import (  # Import centralized paths
+    EMBEDDINGS_PATH,
+    KNN_GRAPH_DIR,
+    EMBEDDING_ENSEMBLE,
+    RAW_VECTORS_PATH,
+    RAW_VOCAB_PATH,
+    FASTTEXT_SOURCE_PATH,
+    CATEGORY_INDEX_DIR,
+    PAIR_SCORER_PATH
+)
+from knn_graph import KnnGraph
+from category_index import CategoryIndex
+from pairwise_scorer import PairScorer
+from artifacts import ensure_artifacts, model_fingerprint
+from fasttext_converter import convert_fasttext
+from vector_store import MmapKeyedVectors
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+def _synchronized(method):
+    """Serialize a loader: the first caller loads, concurrent callers wait and reuse the cached result."""
+    @functools.wraps(method)
+    def wrapper(cls, *args, **kwargs):
+        with cls._lock:
+            return method(cls, *args, **kwargs)
+    return wrapper
+
+
 class ModelLoader:
     _vectors = None
+    _vectors_path = None  # The vectors file behind _vectors, which a kNN graph must have been built from
+    _knn_graph = None
+    _ensemble = None
+    _category_index = None
+    _pair_scorer = None
+    _lock = threading.RLock()  # Reentrant, since load_ensemble calls load_vectors
+
+    @staticmethod
+    def _prepare_for_sharing(model):
+        """
+        Make a loaded model safe to share between request threads.
+
+        gensim and MmapKeyedVectors fill `norms` lazily on first use, which would
+        be a write from a request thread; it is filled here instead, and in-memory
+        arrays are made read-only (memory-mapped ones already are).
+        """
+        model.fill_norms()
+        for array in (model.vectors, model.norms, getattr(model, 'frequency_ranks', None)):
+            if isinstance(array, np.ndarray) and array.flags.writeable and not isinstance(array, np.memmap):
+                array.flags.writeable = False
+        return model
 
     @classmethod
+    @_synchronized
     def load_vectors(cls, model_path=None):
+        """
+        Load the word vectors once and share them.
+
+        The raw export (RAW_VECTORS_PATH and RAW_VOCAB_PATH) is preferred when it
+        exists: it is served by MmapKeyedVectors and gensim is never imported.
+        Otherwise the saved KeyedVectors at `model_path` is loaded with gensim,
+        after converting a local fastText file or downloading the model if needed.
+        """
         if cls._vectors is None:
             if model_path is None:
                 model_path = EMBEDDINGS_PATH  # Use centralized path
-            
+
+            # Serve the memory-mapped export when present (or when it can be converted from a local file)
+            export_exists = os.path.isfile(RAW_VECTORS_PATH) and os.path.isfile(RAW_VOCAB_PATH)
+            if export_exists or (not os.path.isfile(model_path) and FASTTEXT_SOURCE_PATH):
+                cls._vectors = cls._prepare_for_sharing(cls._load_export())
+                cls._vectors_path = RAW_VECTORS_PATH
+                return cls._vectors
+
+            # gensim is only needed for saved KeyedVectors and downloads
+            import gensim.downloader as api
+            from gensim.models import KeyedVectors
+
             if not os.path.isfile(model_path):
                 logging.info(f"Model file not found at '{model_path}'. Initiating download of FastText vectors.")
                 try:
@@ -47,7 +113,10 @@ class ModelLoader:
             try:
                 logging.info(f"Loading word vectors from '{model_path}' with memory mapping...")
                 start_time = time.time()
-                cls._vectors = KeyedVectors.load(model_path, mmap='r')
+                vectors = KeyedVectors.load(model_path, mmap='r')
+                ensure_artifacts(vectors, model_path)  # Attach norms and ranks without recomputing them
+                cls._vectors = cls._prepare_for_sharing(vectors)  # Published only once fully initialized
+                cls._vectors_path = model_path + '.vectors.npy'
                 end_time = time.time()
                 loading_time = end_time - start_time
                 logging.info(f"Word vectors loaded successfully in {loading_time:.2f} seconds.")
@@ -58,3 +127,162 @@ class ModelLoader:
             logging.info("Word vectors already loaded. Using cached version.")
         
         return cls._vectors
+
+    @classmethod
+    def _load_export(cls, vectors_path=None, vocab_path=None):
+        """
+        Open the memory-mapped export as MmapKeyedVectors, without copying the vectors.
+
+        When the export does not exist yet, it is first converted by streaming the
+        local fastText file at FASTTEXT_SOURCE_PATH, so the model is never
+        materialized in memory and no network access is needed.
+        """
+        if vectors_path is None:
+            vectors_path = RAW_VECTORS_PATH
+        if vocab_path is None:
+            vocab_path = RAW_VOCAB_PATH
+
+        if not (os.path.isfile(vectors_path) and os.path.isfile(vocab_path)):
+            logging.info(f"Converting local fastText file '{FASTTEXT_SOURCE_PATH}' to '{vectors_path}'...")
+            convert_fasttext(FASTTEXT_SOURCE_PATH, vectors_path, vocab_path)
+
+        try:
+            logging.info(f"Loading word vectors from '{vectors_path}' with memory mapping...")
+            start_time = time.time()
+            keyed_vectors = MmapKeyedVectors.load(vectors_path, vocab_path)
+            ensure_artifacts(keyed_vectors, vocab_path, vectors_path)
+            logging.info(f"Word vectors loaded successfully in {time.time() - start_time:.2f} seconds.")
+        except Exception as e:
+            logging.error(f"An error occurred while loading the exported vectors: {e}")
+            raise e
+
+        return keyed_vectors
+
+    @classmethod
+    @_synchronized
+    def load_knn_graph(cls, graph_dir=None):
+        """
+        Load the precomputed kNN graph with memory mapping, if it has been built.
+
+        Returns None when no graph exists, or when it was built from other vectors
+        than the loaded ones, in which case neighbor overlap falls back to
+        searching the vocabulary.
+        """
+        if cls._knn_graph is None:
+            if graph_dir is None:
+                graph_dir = KNN_GRAPH_DIR
+
+            if not os.path.isfile(os.path.join(graph_dir, 'meta.json')):
+                logging.info(f"No kNN graph found at '{graph_dir}'. Neighbor overlap will search the vocabulary.")
+                return None
+
+            try:
+                logging.info(f"Loading kNN graph from '{graph_dir}' with memory mapping...")
+                num_vectors = None if cls._vectors is None else len(cls._vectors.index_to_key)
+                graph = KnnGraph.load(graph_dir, vectors_path=cls._vectors_path, num_vectors=num_vectors)
+                if graph is None:
+                    logging.warning("kNN graph refused. Neighbor overlap will search the vocabulary.")
+                    return None
+                cls._knn_graph = graph
+                logging.info(f"kNN graph loaded ({cls._knn_graph.num_rows} words, top_n={cls._knn_graph.top_n}).")
+            except Exception as e:
+                logging.error(f"An error occurred while loading the kNN graph: {e}")
+                raise e
+
+        return cls._knn_graph
+
+    @classmethod
+    @_synchronized
+    def load_ensemble(cls, ensemble=None):
+        """
+        Load every model of the embedding ensemble with memory mapping.
+
+        Parameters:
+        - ensemble (dict): Maps a model name to {'path': ..., 'weight': ...}
+          (defaults to EMBEDDING_ENSEMBLE in config.py).
+
+        Returns:
+        - dict: Maps each model name to its KeyedVectors; empty when no ensemble is configured.
+        """
+        if cls._ensemble is None:
+            if ensemble is None:
+                ensemble = EMBEDDING_ENSEMBLE
+
+            models = {}
+            for name, spec in ensemble.items():
+                # The default model goes through load_vectors so it is shared, not loaded twice
+                if os.path.abspath(spec['path']) == os.path.abspath(EMBEDDINGS_PATH):
+                    models[name] = cls.load_vectors()
+                    continue
+                from gensim.models import KeyedVectors  # Only imported when the ensemble has other models
+                try:
+                    logging.info(f"Loading ensemble model '{name}' from '{spec['path']}' with memory mapping...")
+                    start_time = time.time()
+                    models[name] = KeyedVectors.load(spec['path'], mmap='r')
+                    ensure_artifacts(models[name], spec['path'])
+                    cls._prepare_for_sharing(models[name])
+                    logging.info(f"Ensemble model '{name}' loaded in {time.time() - start_time:.2f} seconds.")
+                except Exception as e:
+                    logging.error(f"An error occurred while loading ensemble model '{name}': {e}")
+                    raise e
+            cls._ensemble = models
+
+        return cls._ensemble
+
+    @classmethod
+    @_synchronized
+    def load_category_index(cls, index_dir=None):
+        """
+        Load the category-centroid index with memory mapping, if it has been built.
+
+        Returns None when no index exists, or when it was built from other vectors than
+        the loaded model (or ensemble models), in which case grouping starts from the
+        board order.
+        """
+        if cls._category_index is None:
+            if index_dir is None:
+                index_dir = CATEGORY_INDEX_DIR
+
+            if not os.path.isfile(os.path.join(index_dir, 'centroids.npy')):
+                logging.info(f"No category index found at '{index_dir}'. Seeds follow the board order.")
+                return None
+
+            try:
+                logging.info(f"Loading category index from '{index_dir}' with memory mapping...")
+                models = ([] if cls._vectors is None else [cls._vectors]) + list((cls._ensemble or {}).values())
+                index = CategoryIndex.load(index_dir, [model_fingerprint(model) for model in models] or None)
+                if index is None:
+                    logging.warning("Category index refused. Seeds follow the board order.")
+                    return None
+                cls._category_index = index
+                logging.info(f"Category index loaded ({len(cls._category_index.labels)} categories).")
+            except Exception as e:
+                logging.error(f"An error occurred while loading the category index: {e}")
+                raise e
+
+        return cls._category_index
+
+    @classmethod
+    @_synchronized
+    def load_pair_scorer(cls, path=None):
+        """
+        Load the learned pairwise scorer, if it has been trained.
+
+        Returns None when no scorer exists, in which case the hand-weighted semantic score is used.
+        """
+        if cls._pair_scorer is None:
+            if path is None:
+                path = PAIR_SCORER_PATH
+
+            if not os.path.isfile(path):
+                logging.info(f"No pair scorer found at '{path}'. Using the hand-weighted semantic score.")
+                return None
+
+            try:
+                logging.info(f"Loading pair scorer from '{path}'...")
+                cls._pair_scorer = PairScorer.load(path)
+            except Exception as e:
+                logging.error(f"An error occurred while loading the pair scorer: {e}")
+                raise e
+
+        return cls._pair_scorer
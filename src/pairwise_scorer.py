@@ -0,0 +1,291 @@
+# src/pairwise_scorer.py
+
+###############################################################################
+#                                                                             #
+#                            Pairwise Scorer                                  #
+#                                                                             #
+#      Learns, from historical boards, the probability that two words         #
+#      belong to the same group from their semantic, lexical and spelling     #
+#      similarities, and scores every pair of a board in one call.            #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import json
+import time
+import hashlib
+import logging
+import argparse
+import numpy as np
+
+from config import DATA_PATH, PAIR_SCORER_PATH, PAIR_FEATURES_CACHE_PATH  # Import centralized paths
+from similarity_metrics import semantic_components, ngram_jaccard_matrix, levenshtein_distance_matrix
+from puzzle_generator import iter_puzzles  # Historical boards (.json or .jsonl)
+from artifacts import hash_arrays  # Block-wise hashing of (memory-mapped) arrays
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Per-pair features, in column order
+FEATURE_NAMES = ('cosine', 'euclidean', 'neighbor', 'jaccard', 'edit_similarity')
+# Bump when the features change, so that cached feature sets are rebuilt
+FEATURES_VERSION = 1
+
+
+def board_feature_matrices(words, model, knn_graph=None, top_n=50):
+    """
+    Compute every feature for every pair of board words.
+
+    Parameters:
+    - words (list): The board words.
+    - model: The pre-trained word embedding model.
+    - knn_graph (KnnGraph): Optional precomputed neighbor graph for neighbor overlap.
+    - top_n (int): The number of neighbors considered for neighbor overlap.
+
+    Returns:
+    - np.ndarray: A (len(words), len(words), len(FEATURE_NAMES)) array.
+    """
+    components = semantic_components(words, model, top_n, knn_graph=knn_graph)
+    lengths = np.array([len(word) for word in words], dtype=np.float64)
+    longest = np.maximum(np.maximum.outer(lengths, lengths), 1.0)
+    features = {
+        'cosine': components['cosine'],
+        'euclidean': components['euclidean'],
+        'neighbor': components['neighbor'],
+        'jaccard': ngram_jaccard_matrix(words, n=2),
+        'edit_similarity': 1.0 - levenshtein_distance_matrix(words) / longest,
+    }
+    return np.stack([features[name] for name in FEATURE_NAMES], axis=-1)
+
+
+def pair_features(words, model, knn_graph=None, top_n=50):
+    """
+    Feature vectors of every unordered pair of board words.
+
+    Returns:
+    - tuple: (rows, columns, features) where rows[k] < columns[k] index the
+      k-th pair and features is a (num_pairs, len(FEATURE_NAMES)) array.
+    """
+    matrices = board_feature_matrices(words, model, knn_graph, top_n)
+    rows, columns = np.triu_indices(len(words), k=1)
+    return rows, columns, matrices[rows, columns]
+
+
+class PairScorer:
+    """
+    Logistic regression over standardized pair features.
+
+    The fitted parameters are a few floats, so scoring a board costs one
+    feature extraction plus a (num_pairs, F) matrix-vector product.
+    """
+
+    def __init__(self, weights, bias, mean, scale, feature_names=FEATURE_NAMES):
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.feature_names = tuple(feature_names)
+
+    @classmethod
+    def fit(cls, features, labels, l2=1.0, max_iter=50, tol=1e-8, balanced=True):
+        """
+        Fit by Newton's method (iteratively reweighted least squares) with an L2 penalty.
+
+        Parameters:
+        - features (np.ndarray): (num_pairs, F) pair features.
+        - labels (np.ndarray): 1 for pairs of the same group, 0 otherwise.
+        - l2 (float): Strength of the penalty on the weights (not on the bias).
+        - max_iter (int): The maximum number of Newton steps.
+        - tol (float): Stop once the largest parameter update is below this.
+        - balanced (bool): Weight the classes equally (same-group pairs are a minority).
+
+        Returns:
+        - PairScorer: The fitted scorer.
+        """
+        features = np.asarray(features, dtype=np.float64)
+        labels = np.asarray(labels, dtype=np.float64)
+        mean = features.mean(axis=0)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        design = np.hstack([(features - mean) / scale, np.ones((len(features), 1))])
+
+        sample_weights = np.ones(len(labels))
+        if balanced and 0 < labels.sum() < len(labels):
+            positive_share = labels.mean()
+            sample_weights = np.where(labels == 1, 0.5 / positive_share, 0.5 / (1 - positive_share))
+        penalty = np.full(design.shape[1], l2)
+        penalty[-1] = 0.0  # The bias is not penalized
+
+        params = np.zeros(design.shape[1])
+        for _ in range(max_iter):
+            probabilities = 1.0 / (1.0 + np.exp(-design @ params))
+            gradient = design.T @ (sample_weights * (probabilities - labels)) + penalty * params
+            curvature = sample_weights * probabilities * (1 - probabilities)
+            hessian = (design * curvature[:, None]).T @ design + np.diag(penalty) + 1e-9 * np.eye(len(params))
+            step = np.linalg.solve(hessian, gradient)
+            params -= step
+            if np.abs(step).max() < tol:
+                break
+        return cls(params[:-1], params[-1], mean, scale)
+
+    def predict_proba(self, features):
+        """Probability that each pair belongs to the same group, for a (num_pairs, F) array."""
+        logits = ((np.asarray(features, dtype=np.float64) - self.mean) / self.scale) @ self.weights + self.bias
+        return 1.0 / (1.0 + np.exp(-logits))
+
+    def score_matrix(self, words, model, knn_graph=None, top_n=50):
+        """
+        Score every pair of a board in one vectorized call.
+
+        Parameters:
+        - words (list): The board words.
+        - model: The pre-trained word embedding model.
+        - knn_graph (KnnGraph): Optional precomputed neighbor graph for neighbor overlap.
+        - top_n (int): The number of neighbors considered for neighbor overlap.
+
+        Returns:
+        - np.ndarray: A symmetric (len(words), len(words)) matrix of same-group
+          probabilities, 0 on the diagonal.
+        """
+        rows, columns, features = pair_features(words, model, knn_graph, top_n)
+        matrix = np.zeros((len(words), len(words)))
+        matrix[rows, columns] = matrix[columns, rows] = self.predict_proba(features)
+        return matrix
+
+    def save(self, path):
+        """Write the fitted parameters to a .npz file."""
+        directory = os.path.dirname(path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        np.savez(path, weights=self.weights, bias=self.bias, mean=self.mean, scale=self.scale,
+                 feature_names=np.array(self.feature_names))
+
+    @classmethod
+    def load(cls, path):
+        """Read a scorer written by `save`."""
+        with np.load(path) as data:
+            feature_names = tuple(str(name) for name in data['feature_names'])
+            if feature_names != FEATURE_NAMES:
+                raise ValueError(f"Scorer '{path}' was trained on features {feature_names}, "
+                                 f"expected {FEATURE_NAMES}.")
+            return cls(data['weights'], data['bias'], data['mean'], data['scale'], feature_names)
+
+
+def _training_key(paths, model, top_n, knn_graph=None):
+    """
+    Checksum of everything the cached features depend on.
+
+    Models loaded by ModelLoader are identified by the `source_checksum` of their
+    files (set by ensure_artifacts) and built kNN graphs by their meta.json; other
+    models and graphs are hashed whole.
+    """
+    digest = hashlib.sha1(json.dumps([FEATURES_VERSION, FEATURE_NAMES, top_n, len(model.index_to_key),
+                                      int(model.vectors.shape[1]), getattr(model, 'source_fingerprint', None),
+                                      None if knn_graph is None else getattr(knn_graph, 'meta', None)],
+                                     sort_keys=True).encode('utf-8'))
+    if getattr(model, 'source_fingerprint', None) is None:
+        digest.update('\n'.join(model.index_to_key).encode('utf-8'))
+        hash_arrays(digest, [model.vectors])
+    if knn_graph is not None and getattr(knn_graph, 'meta', None) is None:
+        hash_arrays(digest, [knn_graph.indptr, knn_graph.indices])
+    for path in paths:
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_training_set(paths, model, knn_graph=None, top_n=50, cache_path=None):
+    """
+    Build (or read from cache) the pair features and labels of historical boards.
+
+    Parameters:
+    - paths (list): Puzzle files (.json in the sample_data schema, or .jsonl).
+    - model: The pre-trained word embedding model.
+    - knn_graph (KnnGraph): Optional precomputed neighbor graph for neighbor overlap.
+    - top_n (int): The number of neighbors considered for neighbor overlap.
+    - cache_path (str): Optional .npz cache, reused while the inputs are unchanged.
+
+    Returns:
+    - tuple: (features, labels, boards) where boards holds the board number of each pair.
+    """
+    key = _training_key(paths, model, top_n, knn_graph)
+    if cache_path and os.path.isfile(cache_path):
+        with np.load(cache_path) as data:
+            if str(data['key']) == key:
+                logging.info(f"Using cached pair features from '{cache_path}'.")
+                return data['features'], data['labels'], data['boards']
+
+    start_time = time.time()
+    all_features, all_labels, all_boards = [], [], []
+    board_number = 0
+    for path in paths:
+        for puzzle in iter_puzzles(path):
+            words = [word for entry in puzzle for word in entry['words']]
+            group_of = np.array([group for group, entry in enumerate(puzzle) for _ in entry['words']])
+            rows, columns, features = pair_features(words, model, knn_graph, top_n)
+            all_features.append(features)
+            all_labels.append((group_of[rows] == group_of[columns]).astype(np.int8))
+            all_boards.append(np.full(len(rows), board_number, dtype=np.int32))
+            board_number += 1
+    features = np.concatenate(all_features) if all_features else np.empty((0, len(FEATURE_NAMES)))
+    labels = np.concatenate(all_labels) if all_labels else np.empty(0, dtype=np.int8)
+    boards = np.concatenate(all_boards) if all_boards else np.empty(0, dtype=np.int32)
+    logging.info(f"Extracted {len(labels)} pairs from {board_number} boards "
+                 f"in {time.time() - start_time:.2f} seconds.")
+
+    if cache_path:
+        directory = os.path.dirname(cache_path)
+        if directory and not os.path.isdir(directory):
+            os.makedirs(directory)
+        np.savez(cache_path, key=key, features=features, labels=labels, boards=boards)
+    return features, labels, boards
+
+
+def roc_auc(scores, labels):
+    """Area under the ROC curve, from the ranks of the scores (ties share their mean rank)."""
+    labels = np.asarray(labels, dtype=bool)
+    num_positive, num_negative = labels.sum(), (~labels).sum()
+    if num_positive == 0 or num_negative == 0:
+        return float('nan')
+    order = np.argsort(scores, kind='stable')
+    sorted_scores = np.asarray(scores)[order]
+    ranks = np.empty(len(scores))
+    ranks[order] = np.arange(1, len(scores) + 1)
+    _, first, counts = np.unique(sorted_scores, return_index=True, return_counts=True)
+    for start, count in zip(first, counts):
+        if count > 1:
+            ranks[order[start:start + count]] = start + (count + 1) / 2
+    return float((ranks[labels].sum() - num_positive * (num_positive + 1) / 2) / (num_positive * num_negative))
+
+
+if __name__ == "__main__":
+    from model_loader import ModelLoader
+
+    parser = argparse.ArgumentParser(description="Train the pairwise same-group scorer on historical boards.")
+    parser.add_argument('paths', nargs='*', default=[DATA_PATH], help="Puzzle files (.json or .jsonl).")
+    parser.add_argument('--output', default=PAIR_SCORER_PATH, help="Output .npz path of the scorer.")
+    parser.add_argument('--cache', default=PAIR_FEATURES_CACHE_PATH, help="Cache of the extracted pair features.")
+    parser.add_argument('--holdout', type=float, default=0.2, help="Fraction of boards held out for evaluation.")
+    parser.add_argument('--l2', type=float, default=1.0, help="L2 penalty on the weights.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed of the holdout split.")
+    args = parser.parse_args()
+
+    model = ModelLoader.load_vectors()
+    features, labels, boards = extract_training_set(args.paths, model, ModelLoader.load_knn_graph(),
+                                                    cache_path=args.cache)
+    held_out = np.random.default_rng(args.seed).random(boards.max() + 1 if len(boards) else 0) < args.holdout
+    test = held_out[boards]
+    if test.any() and (~test).any():
+        scorer = PairScorer.fit(features[~test], labels[~test], l2=args.l2)
+        baseline = features[test] @ np.array([{'cosine': 0.4, 'euclidean': 0.3, 'neighbor': 0.3}.get(name, 0.0)
+                                              for name in FEATURE_NAMES])
+        learned_auc = roc_auc(scorer.predict_proba(features[test]), labels[test])
+        logging.info(f"Holdout ROC AUC on {test.sum()} pairs: learned {learned_auc:.4f}, "
+                     f"hand-weighted semantic score {roc_auc(baseline, labels[test]):.4f}.")
+    scorer = PairScorer.fit(features, labels, l2=args.l2)
+    scorer.save(args.output)
+    logging.info("Standardized weights: " +
+                 ", ".join(f"{name} {weight:+.3f}" for name, weight in zip(FEATURE_NAMES, scorer.weights)))
+    logging.info(f"Pair scorer written to '{args.output}'.")
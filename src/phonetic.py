@@ -0,0 +1,238 @@
+# src/phonetic.py
+
+###############################################################################
+#                                                                             #
+#                             Phonetic Codes                                  #
+#                                                                             #
+#      Metaphone encoding of words, cached per word and optionally            #
+#      precomputed for the vocabulary, and O(n) sound-alike grouping by       #
+#      hash buckets on the codes.                                             #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import time
+import logging
+import argparse
+from functools import lru_cache
+from collections import defaultdict
+
+from config import EMBEDDINGS_PATH, PHONETIC_CODES_PATH  # Import centralized paths
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+VOWELS = set('AEIOU')
+FRONT_VOWELS = set('EIY')
+# Leading letter pairs whose first letter is silent (AE, GN, KN, PN, WR)
+SILENT_INITIALS = {'AE': 'E', 'GN': 'N', 'KN': 'N', 'PN': 'N', 'WR': 'R'}
+
+# Codes precomputed for the vocabulary (see build_phonetic_codes), by word
+_precomputed_codes = {}
+
+
+def metaphone(word, max_length=None):
+    """
+    Encode a word with the original Metaphone algorithm.
+
+    Words that sound alike get the same code, e.g. 'knight' and 'night' both
+    give 'NT'. '0' stands for 'th' and 'X' for 'sh'.
+
+    Parameters:
+    - word (str): The word to encode (non-letters are ignored).
+    - max_length (int): Truncate the code to this length (None for no limit).
+
+    Returns:
+    - str: The Metaphone code ('' if the word has no letters).
+    """
+    letters = ''.join(char for char in word.upper() if 'A' <= char <= 'Z')
+    if not letters:
+        return ''
+
+    # Initial exceptions
+    if letters[:2] in SILENT_INITIALS:
+        letters = SILENT_INITIALS[letters[:2]] + letters[2:]
+    elif letters[0] == 'X':
+        letters = 'S' + letters[1:]
+    elif letters[:2] == 'WH':
+        letters = 'W' + letters[2:]
+
+    # Drop duplicate adjacent letters, except C
+    deduplicated = [letters[0]]
+    for char in letters[1:]:
+        if char != deduplicated[-1] or char == 'C':
+            deduplicated.append(char)
+    letters = ''.join(deduplicated)
+
+    code = []
+    length = len(letters)
+    for i, char in enumerate(letters):
+        prev_char = letters[i - 1] if i > 0 else ''
+        next_char = letters[i + 1] if i + 1 < length else ''
+        next_next = letters[i + 2] if i + 2 < length else ''
+
+        if char in VOWELS:
+            if i == 0:
+                code.append(char)
+        elif char == 'B':
+            if not (prev_char == 'M' and i == length - 1):
+                code.append('B')
+        elif char == 'C':
+            if next_char == 'I' and next_next == 'A':
+                code.append('X')
+            elif next_char == 'H':
+                code.append('K' if prev_char == 'S' else 'X')
+            elif next_char in FRONT_VOWELS:
+                if prev_char != 'S':
+                    code.append('S')
+            else:
+                code.append('K')
+        elif char == 'D':
+            code.append('J' if next_char == 'G' and next_next in FRONT_VOWELS else 'T')
+        elif char == 'G':
+            if next_char == 'H' and not (i + 2 >= length or next_next in VOWELS):
+                continue  # Silent, as in 'night'
+            if next_char == 'N' and (i + 2 == length or letters[i + 2:] == 'ED'):
+                continue  # Silent, as in 'sign' or 'signed'
+            if prev_char == 'D' and next_char in FRONT_VOWELS:
+                continue  # Already encoded as J by 'DG'
+            code.append('J' if next_char in FRONT_VOWELS else 'K')
+        elif char == 'H':
+            # Pronounced only before a vowel and when not part of CH, SH, PH, TH, GH
+            if next_char in VOWELS and not (prev_char and prev_char in 'CSPTG'):
+                code.append('H')
+        elif char == 'K':
+            if prev_char != 'C':
+                code.append('K')
+        elif char == 'P':
+            code.append('F' if next_char == 'H' else 'P')
+        elif char == 'Q':
+            code.append('K')
+        elif char == 'S':
+            if next_char == 'H' or (next_char == 'I' and next_next in ('O', 'A')):
+                code.append('X')
+            else:
+                code.append('S')
+        elif char == 'T':
+            if next_char == 'I' and next_next in ('O', 'A'):
+                code.append('X')
+            elif next_char == 'H':
+                code.append('0')
+            elif not (next_char == 'C' and next_next == 'H'):
+                code.append('T')
+        elif char == 'V':
+            code.append('F')
+        elif char in ('W', 'Y'):
+            if next_char in VOWELS:
+                code.append(char)
+        elif char == 'X':
+            code.append('KS')
+        elif char == 'Z':
+            code.append('S')
+        else:
+            code.append(char)  # F, J, L, M, N, R
+
+    code = ''.join(code)
+    return code[:max_length] if max_length else code
+
+
+@lru_cache(maxsize=65536)
+def _cached_metaphone(word):
+    return metaphone(word)
+
+
+def phonetic_code(word):
+    """Return the Metaphone code of a word, from the precomputed codes or the per-word cache."""
+    code = _precomputed_codes.get(word)
+    if code is None:
+        code = _cached_metaphone(word)
+    return code
+
+
+def phonetic_cache_size():
+    """Return the number of precomputed and cached codes, for memory telemetry."""
+    return {'entries': len(_precomputed_codes) + _cached_metaphone.cache_info().currsize}
+
+
+def phonetic_groups(words, group_size=4):
+    """
+    Group words whose phonetic codes are identical, using hash buckets.
+
+    Each word is encoded once and dropped into the bucket of its code, so the
+    cost is linear in the number of words. Buckets with at least group_size
+    words yield groups, in board order.
+
+    Parameters:
+    - words (list): The words to group.
+    - group_size (int): The number of words per group.
+
+    Returns:
+    - list: Groups of group_size words sharing a code.
+    """
+    buckets = defaultdict(list)
+    for word in words:
+        code = phonetic_code(word)
+        if code:
+            buckets[code].append(word)
+
+    groups = []
+    for bucket in buckets.values():
+        for start in range(0, len(bucket) - group_size + 1, group_size):
+            groups.append(bucket[start:start + group_size])
+    return groups
+
+
+def load_phonetic_codes(path=None):
+    """
+    Load codes precomputed for the vocabulary, if the file exists.
+
+    Returns:
+    - int: The number of codes loaded (0 if there is no file).
+    """
+    if path is None:
+        path = PHONETIC_CODES_PATH
+    if not os.path.isfile(path):
+        return 0
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            word, _, code = line.rstrip('\n').partition('\t')
+            _precomputed_codes[word] = code
+    logging.info(f"Loaded {len(_precomputed_codes)} precomputed phonetic codes from '{path}'.")
+    return len(_precomputed_codes)
+
+
+def build_phonetic_codes(model, path=None, top_k=None):
+    """
+    Precompute the phonetic codes of the vocabulary and write them as TSV.
+
+    Parameters:
+    - model: The loaded KeyedVectors.
+    - path (str): Output path (defaults to PHONETIC_CODES_PATH).
+    - top_k (int): Encode only the top_k most frequent words (None for all).
+
+    Returns:
+    - int: The number of codes written.
+    """
+    if path is None:
+        path = PHONETIC_CODES_PATH
+    words = model.index_to_key if top_k is None else model.index_to_key[:top_k]
+    start_time = time.time()
+    with open(path, 'w', encoding='utf-8') as file:
+        for word in words:
+            if '\t' not in word and '\n' not in word:
+                file.write(f"{word}\t{metaphone(word)}\n")
+    logging.info(f"Wrote {len(words)} phonetic codes to '{path}' in {time.time() - start_time:.2f} seconds.")
+    return len(words)
+
+
+if __name__ == "__main__":
+    from gensim.models import KeyedVectors
+
+    parser = argparse.ArgumentParser(description="Precompute phonetic codes for the vocabulary.")
+    parser.add_argument('--model-path', default=EMBEDDINGS_PATH, help="Path to the saved KeyedVectors.")
+    parser.add_argument('--output', default=PHONETIC_CODES_PATH, help="Output TSV path.")
+    parser.add_argument('--top-k', type=int, default=None, help="Encode only the top K words.")
+    args = parser.parse_args()
+
+    build_phonetic_codes(KeyedVectors.load(args.model_path, mmap='r'), args.output, args.top_k)
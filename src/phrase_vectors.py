@@ -0,0 +1,191 @@
+# src/phrase_vectors.py
+
+###############################################################################
+#                                                                             #
+#                             Phrase Vectors                                  #
+#                                                                             #
+#      Composes vectors for multi-word, hyphenated and compound board         #
+#      entries from their in-vocabulary parts, with a bounded LRU cache.      #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import re
+import weakref
+import itertools
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from config import PHRASE_CACHE_SIZE  # Import centralized setting
+
+# Separators between the parts of an entry ("ice cream", "t-shirt", "rock_n_roll", "AC/DC")
+TOKEN_SEPARATORS = re.compile(r"[\s\-_/]+")
+# Shortest part accepted when splitting a compound ("firetruck" -> "fire" + "truck")
+MIN_SUBTOKEN_LENGTH = 3
+
+
+class _LRUCache:
+    """Thread-safe mapping that evicts the least recently used entry beyond maxsize."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+# Composed vectors by (model token, entry); None is cached too, for entries with no known part
+_phrase_cache = _LRUCache(PHRASE_CACHE_SIZE)
+_MISSING = object()
+
+# Cache token of every model seen. Unlike id(), which CPython reuses once a model is freed,
+# a token is never handed out twice; entries of freed models age out of the LRU
+_model_tokens = weakref.WeakKeyDictionary()
+_token_counter = itertools.count()
+_token_lock = threading.Lock()
+
+
+def _model_token(model):
+    """Return the cache token of a model, assigning a new one on first use."""
+    with _token_lock:
+        token = _model_tokens.get(model)
+        if token is None:
+            token = _model_tokens[model] = next(_token_counter)
+        return token
+
+
+def _lookup(token, model):
+    """Return the vocabulary index of a token, trying its case variants, or None."""
+    for variant in (token, token.lower(), token.capitalize()):
+        index = model.key_to_index.get(variant)
+        if index is not None:
+            return index
+    return None
+
+
+def _split_compound(token, model):
+    """
+    Split an out-of-vocabulary token into two in-vocabulary parts.
+
+    Among the valid split points, the most balanced one is chosen.
+
+    Returns:
+    - list: The vocabulary indices of the two parts, or [] if no split is found.
+    """
+    best_split, best_length = [], 0
+    for split in range(MIN_SUBTOKEN_LENGTH, len(token) - MIN_SUBTOKEN_LENGTH + 1):
+        left, right = _lookup(token[:split], model), _lookup(token[split:], model)
+        shorter = min(split, len(token) - split)
+        if left is not None and right is not None and shorter > best_length:
+            best_split, best_length = [left, right], shorter
+    return best_split
+
+
+def _frequency_rank(index, model):
+    """Frequency rank of a vocabulary index (attached ranks, or the frequency-sorted index itself)."""
+    ranks = getattr(model, 'frequency_ranks', None)
+    return int(ranks[index]) if ranks is not None else index
+
+
+def compose_vector(entry, model):
+    """
+    Compose a vector for an entry that is not in the vocabulary.
+
+    The entry is looked up as a phrase first ('ice_cream'), then split into
+    tokens; each token is looked up (with case variants) or split into two
+    in-vocabulary parts. Part vectors are averaged with weight log(2 + rank),
+    so frequent function words ('the', 'of') count less than content words.
+
+    Parameters:
+    - entry (str): The board entry.
+    - model: The pre-trained word embedding model.
+
+    Returns:
+    - np.ndarray: The composed float32 vector, or None if no part is known.
+    """
+    index = _lookup(TOKEN_SEPARATORS.sub('_', entry.strip()), model)
+    if index is not None:
+        return np.asarray(model.vectors[index], dtype=np.float32)
+
+    indices = []
+    for token in TOKEN_SEPARATORS.split(entry.strip()):
+        if not token:
+            continue
+        index = _lookup(token, model)
+        indices.extend([index] if index is not None else _split_compound(token, model))
+    if not indices:
+        return None
+
+    weights = np.log(2.0 + np.array([_frequency_rank(index, model) for index in indices], dtype=np.float64))
+    vectors = np.asarray(model.vectors[indices], dtype=np.float64)
+    return (weights @ vectors / weights.sum()).astype(np.float32)
+
+
+def get_word_vector(word, model):
+    """
+    Return the vector of a board entry: its own vector, or a cached composed one.
+
+    Parameters:
+    - word (str): The board entry.
+    - model: The pre-trained word embedding model.
+
+    Returns:
+    - np.ndarray: The vector, or None if the entry and all of its parts are unknown.
+    """
+    index = model.key_to_index.get(word)
+    if index is not None:
+        return model.vectors[index]
+
+    key = (_model_token(model), word)
+    vector = _phrase_cache.get(key, _MISSING)
+    if vector is _MISSING:
+        vector = compose_vector(word, model)
+        _phrase_cache.put(key, vector)
+    return vector
+
+
+def has_vector(word, model):
+    """Return True if the entry is in the vocabulary or a vector can be composed for it."""
+    return get_word_vector(word, model) is not None
+
+
+def word_vectors(words, model):
+    """
+    Collect the vectors of several board entries.
+
+    Returns:
+    - list: The positions in `words` of the entries with a vector.
+    - np.ndarray: A (len(rows), d) float32 array of their vectors.
+    """
+    rows, vectors = [], []
+    for i, word in enumerate(words):
+        vector = get_word_vector(word, model)
+        if vector is not None:
+            rows.append(i)
+            vectors.append(vector)
+    if not rows:
+        return rows, np.empty((0, model.vectors.shape[1]), dtype=np.float32)
+    return rows, np.asarray(vectors, dtype=np.float32)
+
+
+def phrase_cache_size():
+    """Return the number of cached composed vectors, for memory telemetry."""
+    return {'entries': len(_phrase_cache)}
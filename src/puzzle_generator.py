@@ -0,0 +1,228 @@
+# src/puzzle_generator.py
+
+###############################################################################
+#                                                                             #
+#                          Synthetic Puzzle Generator                         #
+#                                                                             #
+#      Generates any number of valid boards (4x4 or larger) in the            #
+#      sample_data.json schema from embedding neighborhoods, shared           #
+#      n-grams and hidden words, with tunable red herrings, streamed to       #
+#      JSONL.                                                                 #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import json
+import time
+import random
+import logging
+import argparse
+from collections import defaultdict
+import numpy as np
+
+from similarity_metrics import _chunked_top_k  # Batched neighbor search
+from hidden_words import load_detector  # Hidden-word classes
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+DEFAULT_MIX = {'semantic': 0.6, 'ngram': 0.2, 'hidden': 0.2}
+
+
+def iter_puzzles(path):
+    """
+    Stream puzzles from a file in the sample_data.json schema (a JSON list) or from JSONL.
+
+    Yields:
+    - list: One puzzle, as a list of {'category': ..., 'words': [...]} entries.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from json.load(file)
+
+
+class PuzzleGenerator:
+    """
+    Draws boards from candidate pools precomputed once over the top_k vocabulary words.
+
+    - semantic: a seed word and its nearest neighbors
+    - ngram: words sharing a letter n-gram
+    - hidden: words hiding a word of a common class (see hidden_words.py)
+
+    With probability `red_herring`, a group swaps one of its words for a word
+    that satisfies its own rule but is also a close neighbor of another group's
+    seed on the board.
+    """
+
+    def __init__(self, model, top_k=30000, seed_pool=5000, neighbors=24, ngram=3, mix=None, red_herring=0.3,
+                 seed=0, num_groups=4, group_size=4):
+        self.model = model
+        self.num_groups = num_groups
+        self.group_size = group_size
+        self.mix = dict(mix or DEFAULT_MIX)
+        self.red_herring = red_herring
+        self.rng = random.Random(seed)
+
+        # Plain lowercase words among the most frequent ones
+        top_k = min(top_k, len(model.index_to_key))
+        self.vocab = [index for index in range(top_k)
+                      if model.index_to_key[index].isalpha() and model.index_to_key[index].islower()
+                      and len(model.index_to_key[index]) >= 3]
+        self.words = [model.index_to_key[index] for index in self.vocab]
+        if len(self.words) < num_groups * group_size or neighbors + 1 < group_size:
+            raise ValueError(f"vocabulary too small for {num_groups}x{group_size} boards")
+        start_time = time.time()
+
+        # Semantic pools: neighbors of seed words, restricted to the candidate vocabulary
+        vectors = np.asarray(model.vectors[self.vocab], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1)
+        seeds = np.random.default_rng(seed).choice(len(self.vocab), size=min(seed_pool, len(self.vocab)),
+                                                   replace=False)
+        queries = vectors[seeds] / np.maximum(norms[seeds], 1e-12)[:, None]
+        neighbor_rows, _ = _chunked_top_k(queries, vectors, norms, neighbors, exclude=seeds)
+        self.semantic_pools = [(self.words[seed_row], [self.words[row] for row in rows])
+                               for seed_row, rows in zip(seeds, neighbor_rows)]
+        self.neighbor_sets = {seed_word: set(pool) for seed_word, pool in self.semantic_pools}
+
+        # Lexical pools: words sharing an n-gram (not too rare, not too common)
+        ngram_words = defaultdict(list)
+        for word in self.words:
+            for gram in {word[i:i + ngram] for i in range(len(word) - ngram + 1)}:
+                ngram_words[gram].append(word)
+        self.ngram_pools = [(f"contains '{gram}'", pool) for gram, pool in sorted(ngram_words.items())
+                            if 2 * group_size <= len(pool) <= 500]
+
+        # Hidden-word pools: words hiding a word of each class
+        detector = load_detector()
+        hidden_words = defaultdict(list)
+        for word in self.words:
+            for class_name in detector.hidden_classes(word):
+                hidden_words[class_name].append(word)
+        self.hidden_pools = [(f"hidden {class_name}", pool) for class_name, pool in sorted(hidden_words.items())
+                             if len(pool) >= group_size]
+
+        available = {'semantic': self.semantic_pools, 'ngram': self.ngram_pools, 'hidden': self.hidden_pools}
+        self.mix = {source: weight for source, weight in self.mix.items() if weight > 0 and available.get(source)}
+        if 'semantic' not in self.mix:
+            raise ValueError("The vocabulary is too small to build semantic groups.")
+        logging.info(f"Generator ready in {time.time() - start_time:.2f} seconds: {len(self.semantic_pools)} semantic, "
+                     f"{len(self.ngram_pools)} n-gram and {len(self.hidden_pools)} hidden-word pools.")
+
+    def _draw_group(self, source, used):
+        """Pick a pool of the given source and unused words from it; returns (label, seed, words, pool)."""
+        if source == 'semantic':
+            seed_word, pool = self.rng.choice(self.semantic_pools)
+            label, candidates = f"like '{seed_word}'", [seed_word] + pool
+        else:
+            seed_word = None
+            label, candidates = self.rng.choice(self.ngram_pools if source == 'ngram' else self.hidden_pools)
+        # Words overlapping an earlier board word (plurals, compounds) would make the board ambiguous
+        candidates = [word for word in candidates
+                      if not any(word in other or other in word for other in used)]
+        if len(candidates) < self.group_size or (seed_word is not None and candidates[0] != seed_word):
+            return None
+        if seed_word is not None:
+            # The seed and some of its closest neighbors
+            words = [seed_word] + self.rng.sample(candidates[1:self.group_size * 2], self.group_size - 1)
+        else:
+            words = self.rng.sample(candidates, self.group_size)
+        return label, seed_word, words, candidates
+
+    def _add_red_herring(self, words, candidates, seed_word, other_seeds):
+        """Swap one word for a candidate that also sits among another group's seed neighbors."""
+        decoys = [word for word in candidates if word not in words
+                  and any(word in self.neighbor_sets[other] for other in other_seeds)]
+        if decoys:
+            # A semantic group keeps its seed, which names the category
+            words[self.rng.randrange(0 if seed_word is None else 1, self.group_size)] = self.rng.choice(decoys)
+        return words
+
+    def generate(self, max_attempts=50, max_restarts=100):
+        """
+        Generate one board.
+
+        Parameters:
+        - max_attempts (int): Group draws per board before starting over.
+        - max_restarts (int): Boards started before giving up.
+
+        Returns:
+        - list: num_groups entries {'category': ..., 'words': [...]} with distinct words.
+
+        Raises:
+        - ValueError: No board could be completed (too few unrelated words for this size).
+        """
+        sources, weights = list(self.mix), list(self.mix.values())
+        for _ in range(max_restarts):
+            groups, used, seeds = [], set(), []
+            for _ in range(max_attempts):
+                drawn = self._draw_group(self.rng.choices(sources, weights)[0], used)
+                if drawn is None:
+                    continue
+                label, seed_word, words, candidates = drawn
+                if seeds and self.rng.random() < self.red_herring:
+                    words = self._add_red_herring(words, candidates, seed_word, seeds)
+                if len(set(words)) < self.group_size or any(word in used for word in words):
+                    continue
+                groups.append({'category': label, 'words': words})
+                used.update(words)
+                if seed_word is not None:
+                    seeds.append(seed_word)
+                if len(groups) == self.num_groups:
+                    return groups
+        raise ValueError(f"vocabulary too small for {self.num_groups}x{self.group_size} boards")
+
+    def write_jsonl(self, path, count, progress_every=100000):
+        """
+        Stream `count` boards to a JSONL file, one board per line.
+
+        Returns:
+        - int: The number of boards written.
+        """
+        start_time = time.time()
+        with open(path, 'w', encoding='utf-8') as file:
+            for written in range(1, count + 1):
+                file.write(json.dumps(self.generate()) + '\n')
+                if written % progress_every == 0 or written == count:
+                    logging.info(f"  {written}/{count} boards ({written / (time.time() - start_time):.0f} boards/s)")
+        return count
+
+
+def parse_size(text):
+    """Parse a board size 'NxK' (N groups of K words) into (N, K)."""
+    num_groups, _, group_size = text.lower().partition('x')
+    return int(num_groups), int(group_size)
+
+
+def parse_mix(text):
+    """Parse 'semantic=0.6,ngram=0.2,hidden=0.2' into a dict."""
+    mix = {}
+    for item in text.split(','):
+        source, _, weight = item.partition('=')
+        mix[source.strip()] = float(weight)
+    return mix
+
+
+if __name__ == "__main__":
+    from model_loader import ModelLoader
+
+    parser = argparse.ArgumentParser(description="Generate synthetic Connections boards as JSONL.")
+    parser.add_argument('output', help="Output .jsonl path.")
+    parser.add_argument('--count', type=int, default=10000, help="Number of boards.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (same seed, same boards).")
+    parser.add_argument('--size', type=parse_size, default=(4, 4), help="Board size as groups x words, e.g. 5x5.")
+    parser.add_argument('--red-herring', type=float, default=0.3,
+                        help="Probability that a group contains a word fitting another group (0 to 1).")
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help="Group source weights, e.g. semantic=0.6,ngram=0.2,hidden=0.2.")
+    parser.add_argument('--top-k', type=int, default=30000, help="Vocabulary words used.")
+    parser.add_argument('--seed-pool', type=int, default=5000, help="Number of semantic seed words.")
+    args = parser.parse_args()
+
+    generator = PuzzleGenerator(ModelLoader.load_vectors(), top_k=args.top_k, seed_pool=args.seed_pool,
+                                mix=args.mix, red_herring=args.red_herring, seed=args.seed,
+                                num_groups=args.size[0], group_size=args.size[1])
+    generator.write_jsonl(args.output, args.count)
@@ -0,0 +1,107 @@
+# src/request_log.py
+
+###############################################################################
+#                                                                             #
+#                               Request Log                                   #
+#                                                                             #
+#      Records model() calls and their results to compressed JSONL so that    #
+#      production traffic can be replayed against the current code.           #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import gzip
+import atexit
+import json
+import time
+import logging
+import threading
+
+from config import REQUEST_LOG_PATH  # Import centralized path
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Set by disable_recording
+_recording_disabled = False
+
+
+class RequestRecorder:
+    """
+    Appends one JSON record per model() call to a gzip-compressed JSONL file.
+
+    Each record holds the request arguments, the result (or the exception raised)
+    and the latency in milliseconds. Writes are serialized with a lock so the
+    recorder can be shared by request threads.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, 'at', encoding='utf-8')
+        logging.info(f"Recording model() calls to '{path}'.")
+
+    def record(self, request, result=None, latency_ms=None, exception=None, details=None):
+        """
+        Write a single record.
+
+        Parameters:
+        - request (dict): The model() arguments (words, strikes, isOneAway, correctGroups,
+          previousGuesses, error), captured when the call started.
+        - result (tuple): The (guess, endTurn) returned by model(), if any.
+        - latency_ms (float): The time spent in model(), in milliseconds.
+        - exception (str): The exception raised by model(), if any.
+        - details (dict): Solver details, such as the refinement level reached.
+        """
+        entry = {
+            'timestamp': time.time(),
+            'request': request,
+            'result': None if result is None else {'guess': result[0], 'endTurn': result[1]},
+            'exception': exception,
+            'latency_ms': latency_ms,
+            'details': details,
+        }
+        line = json.dumps(entry, default=str) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def read_records(path):
+    """
+    Iterate over the records of a request log.
+
+    Parameters:
+    - path (str): Path to a .jsonl.gz file written by RequestRecorder.
+
+    Returns:
+    - generator: The decoded records, in the order they were written.
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        try:
+            for line in file:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+        except EOFError:
+            # The recorder is still writing (or was killed); keep the complete records
+            logging.warning(f"Request log '{path}' ends with an incomplete block; stopping there.")
+
+
+def disable_recording():
+    """Make get_recorder return None in this process, whatever REQUEST_LOG_PATH says (e.g. when replaying a log)."""
+    global _recording_disabled
+    _recording_disabled = True
+
+
+def get_recorder():
+    """Return a RequestRecorder when REQUEST_LOG_PATH is configured, otherwise None."""
+    if not REQUEST_LOG_PATH or _recording_disabled:
+        return None
+    recorder = RequestRecorder(REQUEST_LOG_PATH)
+    atexit.register(recorder.close)
+    return recorder
@@ -12,7 +12,295 @@
 import numpy as np  # For numerical computations
 import Levenshtein  # For computing Levenshtein distance
 import time  # For profiling
-def calculate_semantic_similarity(word1, word2, model, top_n=50, weights=None):
+from concurrent.futures import ThreadPoolExecutor  # For concurrent per-model scoring
+from phrase_vectors import get_word_vector, has_vector, word_vectors  # Vectors of multi-word entries
+from config import ENSEMBLE_WORKERS  # Size of the shared ensemble pool
+
+# Shared worker pool for the per-model matrices of ensembles. It is separate from the signal pool
+# of connections_model, whose tasks call ensemble_similarity_matrix and wait on this pool
+_ensemble_executor = ThreadPoolExecutor(max_workers=ENSEMBLE_WORKERS, thread_name_prefix='ensemble')
+
+
+def _chunked_top_k(queries, vectors, norms, top_n, chunk_size=65536, exclude=None):
+    """
+    Find the top_n most cosine-similar rows of `vectors` for every query vector.
+
+    The vocabulary is scanned in chunks of `chunk_size` rows so that memory stays
+    bounded at (len(queries), chunk_size) floats, whatever the vocabulary size.
+
+    Parameters:
+    - queries (np.ndarray): A (q, d) array of unit-normalized query vectors.
+    - vectors (np.ndarray): A (V, d) array (typically memory-mapped) of word vectors.
+    - norms (np.ndarray): A (V,) array with the L2 norm of every row of `vectors`.
+    - top_n (int): The number of neighbors to keep per query.
+    - chunk_size (int): The number of vocabulary rows scored per matrix product.
+    - exclude (np.ndarray): Optional (q,) array of vocabulary indices to skip per query
+      (e.g. the query word itself); use -1 for no exclusion.
+
+    Returns:
+    - tuple: (indices, scores), two (q, top_n) arrays sorted by descending similarity.
+    """
+    num_queries = queries.shape[0]
+    best_indices = np.full((num_queries, 0), -1, dtype=np.int64)
+    best_scores = np.full((num_queries, 0), -np.inf, dtype=np.float32)
+    rows = np.arange(num_queries)
+
+    for start in range(0, vectors.shape[0], chunk_size):
+        end = min(start + chunk_size, vectors.shape[0])
+        chunk_norms = np.asarray(norms[start:end], dtype=np.float32)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sims = (queries @ np.asarray(vectors[start:end], dtype=np.float32).T) / chunk_norms
+        sims[:, chunk_norms == 0] = -np.inf
+
+        # Mask out excluded indices that fall inside this chunk
+        if exclude is not None:
+            in_chunk = (exclude >= start) & (exclude < end)
+            sims[rows[in_chunk], exclude[in_chunk] - start] = -np.inf
+
+        # Keep only the best top_n candidates of this chunk
+        if sims.shape[1] > top_n:
+            part = np.argpartition(-sims, top_n - 1, axis=1)[:, :top_n]
+        else:
+            part = np.broadcast_to(np.arange(sims.shape[1]), sims.shape)
+        chunk_scores = np.take_along_axis(sims, part, axis=1)
+
+        # Merge the chunk candidates with the running best
+        merged_indices = np.concatenate([best_indices, part + start], axis=1)
+        merged_scores = np.concatenate([best_scores, chunk_scores], axis=1)
+        if merged_scores.shape[1] > top_n:
+            keep = np.argpartition(-merged_scores, top_n - 1, axis=1)[:, :top_n]
+            merged_indices = np.take_along_axis(merged_indices, keep, axis=1)
+            merged_scores = np.take_along_axis(merged_scores, keep, axis=1)
+        best_indices, best_scores = merged_indices, merged_scores
+
+    # Sort the surviving candidates by descending similarity
+    order = np.argsort(-best_scores, axis=1, kind='stable')
+    return np.take_along_axis(best_indices, order, axis=1), np.take_along_axis(best_scores, order, axis=1)
+
+
+def _batch_neighbors(words, model, top_n=50, chunk_size=65536):
+    """
+    Run a single batched neighbor search for all words with a vector (including
+    composed phrase vectors).
+
+    Returns:
+    - tuple: (found_words, indices, scores) where indices and scores are
+      (len(found_words), top_n) arrays sorted by descending similarity.
+    """
+    unique_words = list(dict.fromkeys(words))
+    rows, queries = word_vectors(unique_words, model)
+    found_words = [unique_words[row] for row in rows]
+    if not found_words:
+        return [], np.empty((0, top_n), dtype=np.int64), np.empty((0, top_n), dtype=np.float32)
+
+    # Norms are computed once per model and reused by every search
+    model.fill_norms()
+    queries = queries / np.maximum(np.linalg.norm(queries, axis=1), 1e-12)[:, None]
+    # Vocabulary words are not their own neighbors; composed phrases exclude nothing
+    word_indices = np.array([model.key_to_index.get(word, -1) for word in found_words])
+
+    indices, scores = _chunked_top_k(queries, model.vectors, model.norms, top_n,
+                                     chunk_size=chunk_size, exclude=word_indices)
+    return found_words, indices, scores
+
+
+def batch_most_similar(words, model, top_n=50, chunk_size=65536):
+    """
+    Find the nearest neighbors of several words with one pass over the vocabulary.
+
+    Every vocabulary chunk is scored for all words with a single matrix product,
+    instead of one full scan (and one V-length result) per word.
+
+    Parameters:
+    - words (list): The words to find neighbors for.
+    - model: The pre-trained word embedding model.
+    - top_n (int): The number of neighbors to return per word.
+    - chunk_size (int): The number of vocabulary rows scored per matrix product.
+
+    Returns:
+    - dict: Maps each word with a vector to a list of (neighbor, similarity) tuples,
+            like `model.most_similar`. Words without any known part are omitted.
+    """
+    found_words, indices, scores = _batch_neighbors(words, model, top_n, chunk_size)
+    return {
+        word: [(model.index_to_key[index], float(score)) for index, score in zip(indices[row], scores[row])]
+        for row, word in enumerate(found_words)
+    }
+
+
+def batch_neighbor_indices(words, model, top_n=50, knn_graph=None, chunk_size=65536):
+    """
+    Collect the neighbor indices of several words for neighbor overlap.
+
+    Words covered by the precomputed `knn_graph` are answered by a slice lookup;
+    all remaining words share one batched search.
+
+    Parameters:
+    - words (list): The words to find neighbors for.
+    - model: The pre-trained word embedding model.
+    - top_n (int): The number of neighbors per word.
+    - knn_graph (KnnGraph): Optional precomputed neighbor graph.
+    - chunk_size (int): The number of vocabulary rows scored per matrix product.
+
+    Returns:
+    - dict: Maps each word with a vector to an array of its neighbor indices.
+    """
+    neighbors = {}
+    missing_words = []
+    for word in words:
+        graph_neighbors = None
+        if knn_graph is not None and word in model.key_to_index:
+            graph_neighbors = knn_graph.neighbors(model.key_to_index[word], top_n)
+        if graph_neighbors is not None:
+            neighbors[word] = graph_neighbors
+        else:
+            missing_words.append(word)
+
+    found_words, indices, _ = _batch_neighbors(missing_words, model, top_n, chunk_size)
+    for row, word in enumerate(found_words):
+        neighbors[word] = indices[row]
+    return neighbors
+
+
+def semantic_components(words, model, top_n=50, knn_graph=None, neighbors=None, include_neighbors=True):
+    """
+    Calculate the cosine, Euclidean and neighbor-overlap similarities of every pair of words.
+
+    Cosine and Euclidean similarities come from one Gram matrix and neighbor
+    overlap from one batched neighbor search.
+
+    Parameters:
+    - words (list): The words to compare.
+    - model: The pre-trained word embedding model.
+    - top_n (int): The number of neighbors to consider for neighbor overlap.
+    - knn_graph (KnnGraph): Optional precomputed neighbor graph used for neighbor overlap.
+    - neighbors (dict): Optional neighbor indices from `batch_neighbor_indices`.
+    - include_neighbors (bool): If False, skip the neighbor search (neighbor overlap is 0).
+
+    Returns:
+    - dict: Maps 'cosine', 'euclidean' and 'neighbor' to (len(words), len(words)) matrices.
+            Multi-word entries use composed phrase vectors; rows and columns of
+            entries without any known part are 0.0.
+    """
+    components = {name: np.zeros((len(words), len(words))) for name in ('cosine', 'euclidean', 'neighbor')}
+    rows, vectors = word_vectors(words, model)
+    if not rows:
+        return components
+    found_words = [words[i] for i in rows]
+
+    # Cosine and Euclidean similarities from a single Gram matrix
+    vectors = vectors.astype(np.float64)
+    gram = vectors @ vectors.T
+    squared_norms = np.diag(gram)
+    norms = np.sqrt(squared_norms)
+    cosine_sim = (gram / np.maximum(np.outer(norms, norms), 1e-12) + 1) / 2
+    distances = np.sqrt(np.maximum(squared_norms[:, None] + squared_norms[None, :] - 2 * gram, 0.0))
+    euclidean_sim = 1 / (1 + distances)
+
+    # Neighbor overlap by counting shared neighbor indices with a one-hot product
+    if not include_neighbors:
+        neighbors = {}
+    elif neighbors is None:
+        neighbors = batch_neighbor_indices(found_words, model, top_n, knn_graph=knn_graph)
+    neighbor_lists = [np.asarray(neighbors.get(word, [])[:top_n]) for word in found_words]
+    _, inverse = np.unique(np.concatenate(neighbor_lists), return_inverse=True)
+    one_hot = np.zeros((len(found_words), inverse.max() + 1 if inverse.size else 0))
+    offsets = np.cumsum([0] + [len(neighbor_list) for neighbor_list in neighbor_lists])
+    for row in range(len(found_words)):
+        one_hot[row, inverse[offsets[row]:offsets[row + 1]]] = 1.0
+    neighbor_sim = (one_hot @ one_hot.T) / top_n
+
+    for name, values in (('cosine', cosine_sim), ('euclidean', euclidean_sim), ('neighbor', neighbor_sim)):
+        components[name][np.ix_(rows, rows)] = values
+    return components
+
+
+def semantic_similarity_matrix(words, model, top_n=50, weights=None, knn_graph=None, neighbors=None,
+                               include_neighbors=True):
+    """
+    Calculate the combined semantic similarity for every pair of words at once.
+
+    Vectorized equivalent of calling `calculate_semantic_similarity` on all pairs,
+    as the weighted sum of the `semantic_components` matrices.
+
+    Parameters:
+    - words (list): The words to compare.
+    - model: The pre-trained word embedding model.
+    - top_n (int): The number of neighbors to consider for neighbor overlap.
+    - weights (dict): The weights for each similarity component.
+    - knn_graph (KnnGraph): Optional precomputed neighbor graph used for neighbor overlap.
+    - neighbors (dict): Optional neighbor indices from `batch_neighbor_indices`.
+    - include_neighbors (bool): If False, skip the neighbor search and drop the neighbor
+      component, renormalizing the other weights so the score keeps the same scale.
+
+    Returns:
+    - np.ndarray: A (len(words), len(words)) matrix of combined similarity scores.
+                  Multi-word entries use composed phrase vectors; rows and columns
+                  of entries without any known part are 0.0.
+    """
+    if weights is None:
+        weights = {'cosine': 0.4, 'euclidean': 0.3, 'neighbor': 0.3}
+    if not include_neighbors:
+        weights = {**weights, 'neighbor': 0.0}
+    total_weight = sum(weights.values())
+    weights = {k: v / total_weight for k, v in weights.items()}
+
+    components = semantic_components(words, model, top_n, knn_graph=knn_graph, neighbors=neighbors,
+                                     include_neighbors=include_neighbors)
+    return (
+        weights['cosine'] * components['cosine'] +
+        weights['euclidean'] * components['euclidean'] +
+        weights['neighbor'] * components['neighbor']
+    )
+
+
+def ensemble_similarity_matrix(words, models, model_weights=None, top_n=50, weights=None, knn_graphs=None,
+                               include_neighbors=True):
+    """
+    Combine the semantic similarity matrices of several embedding models.
+
+    The models' matrices are computed concurrently on a shared, bounded pool of
+    ENSEMBLE_WORKERS threads; the matrix products and neighbor searches run in
+    NumPy/BLAS with the GIL released, so extra models add little wall time. For
+    every pair, only the models that know both words contribute, with their
+    weights renormalized.
+
+    Parameters:
+    - words (list): The words to compare.
+    - models (dict): Maps a model name to a loaded word embedding model.
+    - model_weights (dict): Maps a model name to its weight (defaults to equal weights).
+    - top_n (int): The number of neighbors to consider for neighbor overlap.
+    - weights (dict): The weights for each similarity component.
+    - knn_graphs (dict): Optional precomputed neighbor graphs by model name.
+    - include_neighbors (bool): If False, skip the neighbor searches (see `semantic_similarity_matrix`).
+
+    Returns:
+    - np.ndarray: A (len(words), len(words)) matrix of combined similarity scores.
+    """
+    if model_weights is None:
+        model_weights = {}
+    if knn_graphs is None:
+        knn_graphs = {}
+    names = list(models)
+
+    futures = {
+        name: _ensemble_executor.submit(semantic_similarity_matrix, words, models[name], top_n, weights,
+                                        knn_graphs.get(name), include_neighbors=include_neighbors)
+        for name in names
+    }
+    matrices = {name: future.result() for name, future in futures.items()}
+
+    weighted_sum = np.zeros((len(words), len(words)))
+    weight_total = np.zeros((len(words), len(words)))
+    for name in names:
+        known = np.array([has_vector(word, models[name]) for word in words], dtype=float)
+        coverage = np.outer(known, known) * model_weights.get(name, 1.0)
+        weighted_sum += coverage * matrices[name]
+        weight_total += coverage
+    return np.divide(weighted_sum, weight_total, out=np.zeros_like(weighted_sum), where=weight_total > 0)
+
+
+def calculate_semantic_similarity(word1, word2, model, top_n=50, weights=None, knn_graph=None, neighbors=None):
     """
     Calculate the combined semantic similarity between two words.
     
@@ -22,15 +310,17 @@ def calculate_semantic_similarity(word1, word2, model, top_n=50, weights=None):
     - model: The pre-trained word embedding model.
     - top_n (int): The number of neighbors to consider for neighbor overlap.
     - weights (dict): The weights for each similarity component.
+    - knn_graph (KnnGraph): Optional precomputed neighbor graph used for neighbor overlap.
+    - neighbors (dict): Optional neighbor indices from `batch_neighbor_indices`.
     
     Returns:
     - float: The combined semantic similarity score.
     """
     try:
-        # Check if both words are in the vocabulary
-        if word1 not in model.key_to_index:
+        # Check if both words are in the vocabulary (or can be composed from known parts)
+        if not has_vector(word1, model):
             raise ValueError(f"The word '{word1}' is not in the vocabulary.")
-        if word2 not in model.key_to_index:
+        if not has_vector(word2, model):
             raise ValueError(f"The word '{word2}' is not in the vocabulary.")
         
         if weights is None:
@@ -52,7 +342,7 @@ def calculate_semantic_similarity(word1, word2, model, top_n=50, weights=None):
         euclidean_sim = calculate_euclidean_similarity(word1, word2, model)
         
         # Compute Neighbor Overlap Similarity
-        neighbor_sim = calculate_neighbor_overlap(word1, word2, model, top_n)
+        neighbor_sim = calculate_neighbor_overlap(word1, word2, model, top_n, knn_graph=knn_graph, neighbors=neighbors)
 
         # Combine similarities with weights
         combined_similarity = (
@@ -67,15 +357,21 @@ def calculate_semantic_similarity(word1, word2, model, top_n=50, weights=None):
         return 0.0
 
    
-def calculate_neighbor_overlap(word1, word2, model, top_n=50):
+def calculate_neighbor_overlap(word1, word2, model, top_n=50, knn_graph=None, neighbors=None):
     """
     Calculate the neighbor overlap similarity between two words.
 
+    Neighbors already collected by `batch_neighbor_indices` are reused; otherwise,
+    when a precomputed `knn_graph` covers both words, their neighbors are read
+    with a slice lookup instead of searching the whole vocabulary.
+
     Parameters:
     - word1 (str): The first word.
     - word2 (str): The second word.
     - model: The pre-trained word embedding model (e.g., FastText, Word2Vec).
     - top_n (int): The number of nearest neighbors to consider for each word.
+    - knn_graph (KnnGraph): Optional precomputed neighbor graph (see knn_graph.py).
+    - neighbors (dict): Optional neighbor indices from `batch_neighbor_indices`.
 
     Returns:
     - float: The neighbor overlap similarity score between 0 and 1.
@@ -85,14 +381,27 @@ def calculate_neighbor_overlap(word1, word2, model, top_n=50):
     start_time = time.time()
 
     try:
+        # Reuse neighbors from a batched search when both words have them
+        if neighbors is not None and word1 in neighbors and word2 in neighbors:
+            overlap_count = np.intersect1d(neighbors[word1][:top_n], neighbors[word2][:top_n], assume_unique=True).size
+            return overlap_count / top_n
+
+        # Use the precomputed neighbor graph when it covers both words
+        if knn_graph is not None and word1 in model.key_to_index and word2 in model.key_to_index:
+            graph_neighbors1 = knn_graph.neighbors(model.key_to_index[word1], top_n)
+            graph_neighbors2 = knn_graph.neighbors(model.key_to_index[word2], top_n)
+            if graph_neighbors1 is not None and graph_neighbors2 is not None:
+                overlap_count = np.intersect1d(graph_neighbors1, graph_neighbors2, assume_unique=True).size
+                return overlap_count / top_n
+
         # Retrieve the top_n most similar words (neighbors) for word1
         neighbors1 = set()
-        for neighbor, _ in model.most_similar(word1, topn=top_n):
+        for neighbor, _ in _most_similar(word1, model, top_n):
             neighbors1.add(neighbor)
 
         # Retrieve the top_n most similar words (neighbors) for word2
         neighbors2 = set()
-        for neighbor, _ in model.most_similar(word2, topn=top_n):
+        for neighbor, _ in _most_similar(word2, model, top_n):
             neighbors2.add(neighbor)
 
         # Calculate the intersection of the neighbor sets
@@ -121,6 +430,16 @@ def calculate_neighbor_overlap(word1, word2, model, top_n=50):
         return None
 
 
+def _most_similar(word, model, top_n):
+    """`model.most_similar` for vocabulary words, a vector search for composed phrases."""
+    if word in model.key_to_index:
+        return model.most_similar(word, topn=top_n)
+    vector = get_word_vector(word, model)
+    if vector is None:
+        raise KeyError(word)
+    return model.similar_by_vector(vector, topn=top_n)
+
+
 def calculate_euclidean_similarity(word1, word2, model):
     """
     Calculate the Euclidean similarity between two words using gensim FastText embeddings.
@@ -139,10 +458,10 @@ def calculate_euclidean_similarity(word1, word2, model):
     
     try:
         # Check if both words are in the model's vocabulary
-        if word1 in model.key_to_index and word2 in model.key_to_index:
-            # Retrieve word vectors from the gensim model
-            vec1 = model[word1]
-            vec2 = model[word2]
+        vec1 = get_word_vector(word1, model)
+        vec2 = get_word_vector(word2, model)
+        if vec1 is not None and vec2 is not None:
+            # Vectors come from the gensim model, composed from known parts for phrases
             
             # Compute Euclidean distance
             distance = np.linalg.norm(vec1 - vec2)
@@ -162,7 +481,7 @@ def calculate_euclidean_similarity(word1, word2, model):
         
         else:
             # Handle out-of-vocabulary words
-            missing_words = [word for word in [word1, word2] if word not in model.key_to_index]
+            missing_words = [word for word, vec in [(word1, vec1), (word2, vec2)] if vec is None]
             print(f"Error: Word(s) not in vocabulary - {', '.join(missing_words)}")
             return None  # Indicates that similarity could not be computed
     
@@ -192,10 +511,10 @@ def calculate_cosine_similarity(word1, word2, model):
     
     try:
         # Check if both words are in the model's vocabulary
-        if word1 in model.key_to_index and word2 in model.key_to_index:
-            # Retrieve word vectors from the gensim model
-            vec1 = model[word1]
-            vec2 = model[word2]
+        vec1 = get_word_vector(word1, model)
+        vec2 = get_word_vector(word2, model)
+        if vec1 is not None and vec2 is not None:
+            # Vectors come from the gensim model, composed from known parts for phrases
             
             # Compute cosine similarity
             dot_product = np.dot(vec1, vec2)
@@ -218,7 +537,7 @@ def calculate_cosine_similarity(word1, word2, model):
         
         else:
             # Identify which word(s) are not in the vocabulary
-            missing_words = [word for word in [word1, word2] if word not in model.key_to_index]
+            missing_words = [word for word, vec in [(word1, vec1), (word2, vec2)] if vec is None]
             print(f"Error: Word(s) not in vocabulary - {', '.join(missing_words)}")
             return None  # Indicates that similarity could not be computed
     
@@ -255,6 +574,41 @@ def ngram_jaccard_similarity(word1, word2, n=2):
     union = ngrams1.union(ngrams2)
     return len(intersection) / len(union) if union else 0
 
+def ngram_jaccard_matrix(words, n=2):
+    """
+    Calculate the n-gram Jaccard similarity for every pair of words.
+
+    Parameters:
+    - words (list): The words to compare.
+    - n (int): The n-gram length.
+
+    Returns:
+    - np.ndarray: A (len(words), len(words)) matrix of n-gram Jaccard similarities.
+    """
+    matrix = np.zeros((len(words), len(words)))
+    for i in range(len(words)):
+        for j in range(i + 1, len(words)):
+            matrix[i, j] = matrix[j, i] = ngram_jaccard_similarity(words[i], words[j], n=n)
+    return matrix
+
+
+def levenshtein_distance_matrix(words):
+    """
+    Calculate the Levenshtein distance for every pair of words.
+
+    Parameters:
+    - words (list): The words to compare.
+
+    Returns:
+    - np.ndarray: A (len(words), len(words)) integer matrix of edit distances.
+    """
+    matrix = np.zeros((len(words), len(words)), dtype=int)
+    for i in range(len(words)):
+        for j in range(i + 1, len(words)):
+            matrix[i, j] = matrix[j, i] = Levenshtein.distance(words[i], words[j])
+    return matrix
+
+
 def calculate_levenshtein_distance(word1, word2):
     """
     Calculate the Levenshtein distance between two words.
@@ -0,0 +1,79 @@
+# src/single_flight.py
+
+###############################################################################
+#                                                                             #
+#                              Single Flight                                  #
+#                                                                             #
+#      Coalesces identical in-flight calls: concurrent callers with the       #
+#      same key wait on one computation and share its result.                 #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import threading
+
+
+class _Call:
+    """An in-flight computation shared by every caller with the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.exception = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Run at most one computation per key at a time.
+
+    The first caller for a key runs the function; callers arriving while it is
+    still running block until it finishes and receive the same result (or the
+    same exception). Nothing is cached once the computation completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Call fn(*args, **kwargs), or join an identical call already in flight.
+
+        Parameters:
+        - key (hashable): Identifies calls that are interchangeable.
+        - fn (callable): The computation to run.
+
+        Returns:
+        - The result of the (possibly shared) computation.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """Return the number of distinct computations currently running."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,228 @@
+# src/speculative.py
+
+###############################################################################
+#                                                                             #
+#                          Speculative Precomputation                         #
+#                                                                             #
+#      While the client judges a guess, computes the answer to each of the    #
+#      three possible next game states (correct, one away, wrong) on a        #
+#      background worker and keeps them in a short-lived cache.              #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from collections import OrderedDict, deque
+
+from game_rules import MAX_STRIKES  # Games end at this many strikes
+
+
+def request_key(words, strikes, isOneAway, correctGroups, previousGuesses, error):
+    """
+    Canonical form of a game state: requests with equal keys produce equal guesses.
+
+    Word order on the board is kept (it decides the seed words), while the order
+    of groups and of words within groups is not. The decision engine reads the
+    one-away flag against the last guess, and only when the last request had no
+    error, so the last guess and whether there was an error are part of the key;
+    the order of the earlier guesses and the error message are not.
+    """
+    return (
+        tuple(words),
+        strikes,
+        bool(isOneAway),
+        tuple(sorted(tuple(sorted(group)) for group in correctGroups)),
+        tuple(sorted(tuple(sorted(guess)) for guess in previousGuesses)),
+        tuple(sorted(previousGuesses[-1])) if previousGuesses else None,
+        bool(error),
+    )
+
+
+def next_states(words, strikes, correctGroups, previousGuesses, guess, num_groups=4):
+    """
+    List the game states the next request can carry after `guess`.
+
+    Follows game_rules.play_game: a correct guess joins correctGroups, any other
+    guess costs a strike, and every guess joins previousGuesses. States in which
+    the game is over are left out.
+
+    Returns:
+    - list: (outcome, state) pairs in the order 'correct', 'one_away', 'wrong', where state
+      holds the keyword arguments of `model` (the error message is empty).
+    """
+    states = []
+    guesses = [list(previous) for previous in previousGuesses] + [list(guess)]
+    if len(correctGroups) + 1 < num_groups:
+        states.append(('correct', dict(words=list(words), strikes=strikes, isOneAway=False,
+                                       correctGroups=[list(group) for group in correctGroups] + [list(guess)],
+                                       previousGuesses=guesses, error="")))
+    if strikes + 1 < MAX_STRIKES:
+        for outcome, isOneAway in (('one_away', True), ('wrong', False)):
+            states.append((outcome, dict(words=list(words), strikes=strikes + 1, isOneAway=isOneAway,
+                                         correctGroups=[list(group) for group in correctGroups],
+                                         previousGuesses=[list(previous) for previous in guesses], error="")))
+    return states
+
+
+class _Job:
+    """Pending speculative states of one board."""
+
+    def __init__(self, board, states):
+        self.board = board
+        self.states = states  # [(request key, state)]
+        self.cancelled = False
+
+
+class Speculator:
+    """
+    Background precomputation of next-turn answers.
+
+    `schedule` queues the possible next states of a board; a single daemon
+    worker computes them one at a time and stores each result under its request
+    key for `ttl` seconds, where `lookup` finds it. The worker only starts a
+    state while no foreground request is running (see `foreground`), so
+    speculation uses idle time only; a state already being computed finishes,
+    since solver runs cannot be interrupted. A new request for a board cancels
+    the states still queued for it, and at most `max_pending` boards wait in
+    the queue (the oldest is dropped). `compute` should run quietly, since its
+    output would interleave with the foreground requests'.
+    """
+
+    def __init__(self, compute, ttl=30.0, max_entries=256, max_pending=8):
+        """
+        Parameters:
+        - compute (callable): Called as compute(key, state) and returning the result to cache.
+        - ttl (float): Seconds a precomputed result stays valid.
+        - max_entries (int): Maximum number of cached results (least recently stored evicted first).
+        - max_pending (int): Maximum number of boards waiting for speculation.
+        """
+        self._compute = compute
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_pending = max_pending
+        self._condition = threading.Condition()
+        self._results = OrderedDict()  # key -> (expiry time, result)
+        self._pending = deque()
+        self._jobs = {}  # board -> its queued or running job
+        self._foreground = 0
+        self._worker = None
+        self.stats = {'scheduled': 0, 'computed': 0, 'hits': 0, 'misses': 0, 'cancelled': 0, 'failed': 0}
+
+    @contextmanager
+    def foreground(self):
+        """Mark a foreground request as running; the worker starts no new state meanwhile."""
+        with self._condition:
+            self._foreground += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._foreground -= 1
+                self._condition.notify_all()
+
+    def lookup(self, key):
+        """
+        Take the precomputed result of a request key.
+
+        Returns:
+        - The cached result, or None if it was not precomputed or has expired.
+        """
+        with self._condition:
+            entry = self._results.pop(key, None)
+            if entry is not None and entry[0] >= time.monotonic():
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['misses'] += 1
+            return None
+
+    def schedule(self, board, states):
+        """
+        Queue states of a board for speculation, replacing those still queued for it.
+
+        Parameters:
+        - board (hashable): Identifies the board (e.g. its tuple of words).
+        - states (list): (request key, state) pairs, most useful first.
+        """
+        if not states:
+            return
+        with self._condition:
+            self._cancel_locked(board)
+            if len(self._pending) >= self.max_pending:
+                oldest = self._pending.popleft()
+                oldest.cancelled = True
+                self.stats['cancelled'] += 1
+                if self._jobs.get(oldest.board) is oldest:
+                    del self._jobs[oldest.board]
+            job = _Job(board, states)
+            self._pending.append(job)
+            self._jobs[board] = job
+            self.stats['scheduled'] += len(states)
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, name='speculative', daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+
+    def cancel(self, board):
+        """Cancel the states not yet started for a board."""
+        with self._condition:
+            self._cancel_locked(board)
+
+    def _cancel_locked(self, board):
+        job = self._jobs.pop(board, None)
+        if job is not None and not job.cancelled:
+            job.cancelled = True
+            self.stats['cancelled'] += 1
+
+    def _next_state(self, job, position):
+        """Wait until no foreground request runs; return the job's state at `position`, or None once cancelled."""
+        with self._condition:
+            while self._foreground and not job.cancelled:
+                self._condition.wait()
+            if job.cancelled or position >= len(job.states):
+                return None
+            return job.states[position]
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                job = self._pending.popleft()
+
+            position = 0
+            while True:
+                state = self._next_state(job, position)
+                if state is None:
+                    break
+                key, kwargs = state
+                try:
+                    result = self._compute(key, kwargs)
+                except Exception as e:
+                    logging.warning(f"Speculative computation failed: {e!r}")
+                    self.stats['failed'] += 1
+                else:
+                    self._store(key, result)
+                position += 1
+
+            with self._condition:
+                if self._jobs.get(job.board) is job:
+                    del self._jobs[job.board]
+
+    def _store(self, key, result):
+        now = time.monotonic()
+        with self._condition:
+            for expired in [stored for stored, (expiry, _) in self._results.items() if expiry < now]:
+                del self._results[expired]
+            self._results[key] = (now + self.ttl, result)
+            self._results.move_to_end(key)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+            self.stats['computed'] += 1
+
+    def cache_size(self):
+        """Return the number of cached results, for memory telemetry."""
+        with self._condition:
+            return {'entries': len(self._results)}
@@ -0,0 +1,138 @@
+# src/vector_store.py
+
+###############################################################################
+#                                                                             #
+#                              Vector Store                                   #
+#                                                                             #
+#      A gensim-free, read-only stand-in for KeyedVectors over the raw        #
+#      memory-mapped export (vectors .npy + vocabulary .txt), so serving      #
+#      workers start without importing gensim and scipy.                      #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import numpy as np
+
+from similarity_metrics import _chunked_top_k  # Batched neighbor search
+from vocab_index import ensure_vocab_index  # Memory-mapped key -> row index
+
+
+class MmapKeyedVectors:
+    """
+    The subset of gensim's KeyedVectors used at request time.
+
+    Provides `vectors`, `index_to_key`, `key_to_index`, `vector_size`, `norms`,
+    item lookup, `fill_norms`, `most_similar` and `similar_by_vector`. Vectors
+    stay memory-mapped; norms are attached from the derived artifacts
+    (see artifacts.py) or computed in chunks by `fill_norms`. When loaded with
+    `compact=True`, the vocabulary is a memory-mapped VocabIndex instead of a
+    list and a dict.
+    """
+
+    def __init__(self, vectors, index_to_key, key_to_index=None):
+        self.vectors = vectors
+        self.index_to_key = index_to_key
+        if key_to_index is None:
+            key_to_index = {}
+            for index, key in enumerate(index_to_key):
+                key_to_index.setdefault(key, index)  # Keep the first (most frequent) duplicate
+        self.key_to_index = key_to_index
+        self.vector_size = vectors.shape[1]
+        self.norms = None
+
+    @classmethod
+    def load(cls, vectors_path, vocab_path, compact=True):
+        """
+        Open a raw export written by fasttext_converter.py (or profile_board.py snapshots).
+
+        Parameters:
+        - vectors_path (str): The (V, d) float32 .npy matrix, memory-mapped read-only.
+        - vocab_path (str): One word per line, in row order.
+        - compact (bool): Serve the vocabulary from its memory-mapped index (built
+          next to `vocab_path` if needed) rather than a Python list and dict.
+
+        Returns:
+        - MmapKeyedVectors: The loaded vectors.
+        """
+        vectors = np.load(vectors_path, mmap_mode='r')
+        if compact:
+            index = ensure_vocab_index(vocab_path, vectors.shape[0])
+            return cls(vectors, index.keys_view, index)
+        with open(vocab_path, 'r', encoding='utf-8') as file:
+            index_to_key = file.read().split('\n')[:vectors.shape[0]]
+        return cls(vectors, index_to_key)
+
+    def __len__(self):
+        return len(self.index_to_key)
+
+    def __contains__(self, key):
+        return key in self.key_to_index
+
+    def get_index(self, key):
+        """Return the row of a key; raises KeyError like gensim for unknown keys."""
+        index = self.key_to_index.get(key)
+        if index is None:
+            raise KeyError(f"Key '{key}' not present")
+        return index
+
+    def get_vector(self, key, norm=False):
+        """Return the vector of a key, optionally unit-normalized."""
+        vector = self.vectors[self.get_index(key)]
+        if norm:
+            self.fill_norms()
+            return vector / max(float(self.norms[self.get_index(key)]), 1e-12)
+        return vector
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.get_vector(key)
+        return np.vstack([self.get_vector(item) for item in key])
+
+    def fill_norms(self, force=False, chunk_size=65536):
+        """Compute the L2 norm of every row, unless they are already attached."""
+        if self.norms is not None and not force:
+            return
+        norms = np.empty(self.vectors.shape[0], dtype=np.float32)
+        for start in range(0, self.vectors.shape[0], chunk_size):
+            end = min(start + chunk_size, self.vectors.shape[0])
+            norms[start:end] = np.linalg.norm(np.asarray(self.vectors[start:end], dtype=np.float32), axis=1)
+        self.norms = norms
+
+    def _search(self, query, topn, exclude=()):
+        """Return the topn (key, similarity) pairs closest to a vector, skipping the `exclude` rows."""
+        self.fill_norms()
+        query = np.asarray(query, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        indices, scores = _chunked_top_k(query[None, :], self.vectors, self.norms,
+                                         min(topn + len(exclude), len(self)))
+        return [(self.index_to_key[index], float(score)) for index, score in zip(indices[0], scores[0])
+                if index not in exclude][:topn]
+
+    def most_similar(self, positive=None, topn=10):
+        """
+        Find the keys closest to the mean of the unit vectors of `positive` (keys or vectors).
+
+        Like gensim, the given keys are left out of the results.
+
+        Returns:
+        - list: (key, cosine similarity) tuples, most similar first.
+        """
+        if isinstance(positive, (str, np.ndarray)):
+            positive = [positive]
+        exclude = set()
+        units = []
+        for item in positive:
+            if isinstance(item, str):
+                exclude.add(self.get_index(item))
+                units.append(self.get_vector(item, norm=True))
+            else:
+                units.append(item / max(float(np.linalg.norm(item)), 1e-12))
+        return self._search(np.mean(units, axis=0), topn, exclude)
+
+    def similar_by_vector(self, vector, topn=10):
+        """Find the keys closest to a vector (nothing is excluded)."""
+        return self._search(vector, topn)
+
+    def similar_by_word(self, word, topn=10):
+        """Alias of most_similar for a single key."""
+        return self.most_similar(word, topn=topn)
@@ -0,0 +1,230 @@
+# src/vocab_index.py
+
+###############################################################################
+#                                                                             #
+#                         Compact Vocabulary Index                            #
+#                                                                             #
+#      Replaces the million-entry key_to_index dict with three mmap-able      #
+#      arrays (UTF-8 blob, row offsets, sorted row order) searched by         #
+#      bisection, so forked workers share the pages instead of copying.       #
+#                                                                             #
+###############################################################################
+
+# Import necessary libraries
+import os
+import json
+import time
+import logging
+import argparse
+import numpy as np
+from collections.abc import Mapping, Sequence
+
+from artifacts import source_checksum  # Same fingerprint as the derived artifacts
+from config import RAW_VECTORS_PATH, RAW_VOCAB_PATH  # Import centralized paths
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+# Bump whenever the layout of the index changes
+VOCAB_INDEX_VERSION = 1
+
+
+def _index_paths(vocab_path):
+    """Return the paths of the index files stored next to the vocabulary."""
+    return {
+        'manifest': vocab_path + '.index.json',
+        'blob': vocab_path + '.blob.npy',
+        'offsets': vocab_path + '.offsets.npy',
+        'order': vocab_path + '.order.npy',
+    }
+
+
+class VocabKeys(Sequence):
+    """Read-only `index_to_key` view: row -> key, decoded from the blob on access."""
+
+    def __init__(self, index):
+        self._index = index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self._index.key_at(item) for item in range(*row.indices(len(self)))]
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("vocabulary row out of range")
+        return self._index.key_at(row)
+
+
+class VocabIndex(Mapping):
+    """
+    A read-only key -> row mapping over memory-mapped arrays.
+
+    `blob` holds the UTF-8 keys back to back in row order and `offsets` (V + 1)
+    delimits them; `order` lists the rows sorted by key bytes (stable, so the
+    first row of a duplicated key comes first, like `dict.setdefault`). A lookup
+    bisects `order`, about 20 comparisons for a million keys.
+    """
+
+    def __init__(self, blob, offsets, order):
+        self.blob = blob
+        self.offsets = offsets
+        self.order = order
+        self.keys_view = VocabKeys(self)
+        # Zero-copy views: indexing them is much cheaper than indexing (memmapped) numpy arrays
+        self._blob = memoryview(np.ascontiguousarray(blob, dtype=np.uint8))
+        self._offsets = memoryview(np.ascontiguousarray(offsets, dtype=np.int64))
+        self._order = memoryview(np.ascontiguousarray(order, dtype=np.int64))
+
+    @classmethod
+    def from_keys(cls, index_to_key):
+        """Build an in-memory index from keys in row order."""
+        encoded = [key.encode('utf-8') for key in index_to_key]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(key) for key in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        order = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.int64)
+        return cls(blob, offsets, order)
+
+    @classmethod
+    def load(cls, vocab_path, num_rows=None):
+        """Open a built index with memory mapping; returns None when it is missing or stale."""
+        paths = _index_paths(vocab_path)
+        if not os.path.isfile(paths['manifest']):
+            return None
+        try:
+            with open(paths['manifest'], 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Could not read vocabulary index manifest '{paths['manifest']}': {e}")
+            return None
+
+        if manifest.get('version') != VOCAB_INDEX_VERSION:
+            logging.info("Vocabulary index was built by another version. It will be rebuilt.")
+            return None
+        if manifest.get('source') != source_checksum(vocab_path, vocab_path):
+            logging.info("Vocabulary index does not match the vocabulary checksum. It will be rebuilt.")
+            return None
+        if num_rows is not None and manifest.get('num_keys') != num_rows:
+            logging.info("Vocabulary index covers another number of rows. It will be rebuilt.")
+            return None
+        if any(not os.path.isfile(paths[name]) for name in ('blob', 'offsets', 'order')):
+            return None
+
+        return cls(*(np.load(paths[name], mmap_mode='r') for name in ('blob', 'offsets', 'order')))
+
+    def save(self, vocab_path):
+        """Write the arrays and a manifest fingerprinting the vocabulary file."""
+        paths = _index_paths(vocab_path)
+        for name in ('blob', 'offsets', 'order'):
+            np.save(paths[name], getattr(self, name))
+        manifest = {
+            'version': VOCAB_INDEX_VERSION,
+            'source': source_checksum(vocab_path, vocab_path),
+            'num_keys': len(self),
+            'files': {name: os.path.basename(path) for name, path in paths.items() if name != 'manifest'},
+        }
+        with open(paths['manifest'], 'w', encoding='utf-8') as file:
+            json.dump(manifest, file, indent=2)
+        return manifest
+
+    def _key_bytes(self, row):
+        return self._blob[self._offsets[row]:self._offsets[row + 1]].tobytes()
+
+    def key_at(self, row):
+        """Return the key stored at a row."""
+        return self._key_bytes(row).decode('utf-8')
+
+    def find(self, key):
+        """Return the first row holding `key`, or -1."""
+        if not isinstance(key, str):
+            return -1
+        target = key.encode('utf-8')
+        blob, offsets, order = self._blob, self._offsets, self._order
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            row = order[middle]
+            if blob[offsets[row]:offsets[row + 1]].tobytes() < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < len(order) and self._key_bytes(order[low]) == target:
+            return order[low]
+        return -1
+
+    def __getitem__(self, key):
+        row = self.find(key)
+        if row < 0:
+            raise KeyError(key)
+        return row
+
+    def get(self, key, default=None):
+        row = self.find(key)
+        return default if row < 0 else row
+
+    def __contains__(self, key):
+        return self.find(key) >= 0
+
+    def __len__(self):
+        """The number of rows (duplicated keys, if any, are counted once per row)."""
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        """Iterate over the distinct keys in row order, like the dict it replaces."""
+        duplicates, previous = set(), None
+        for row in self._order:
+            key = self._key_bytes(row)
+            if key == previous:
+                duplicates.add(row)
+            previous = key
+        for row in range(len(self)):
+            if row not in duplicates:
+                yield self.key_at(row)
+
+
+def ensure_vocab_index(vocab_path, num_rows=None):
+    """
+    Load the index of a vocabulary file, building and saving it first if needed.
+
+    The vocabulary file is only read (into a transient list) when building.
+
+    Parameters:
+    - vocab_path (str): The vocabulary file (one key per line, in row order).
+    - num_rows (int): The number of rows of the vectors; later lines are ignored.
+
+    Returns:
+    - VocabIndex: The memory-mapped index (or an in-memory one if it cannot be written).
+    """
+    index = VocabIndex.load(vocab_path, num_rows)
+    if index is not None:
+        return index
+
+    with open(vocab_path, 'r', encoding='utf-8') as file:
+        index_to_key = file.read().split('\n')
+    if num_rows is None:
+        num_rows = len(index_to_key) - 1 if index_to_key[-1] == '' else len(index_to_key)
+    index_to_key = index_to_key[:num_rows]
+
+    logging.info(f"Building vocabulary index for '{vocab_path}'...")
+    start_time = time.time()
+    index = VocabIndex.from_keys(index_to_key)
+    try:
+        index.save(vocab_path)
+    except OSError as e:
+        logging.warning(f"Could not save the vocabulary index next to '{vocab_path}': {e}")
+        return index
+    logging.info(f"Vocabulary index built in {time.time() - start_time:.2f} seconds.")
+    return VocabIndex.load(vocab_path, num_rows) or index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the compact vocabulary index of a raw export.")
+    parser.add_argument('--vocab-path', default=RAW_VOCAB_PATH, help="Vocabulary file of the export.")
+    parser.add_argument('--vectors-path', default=RAW_VECTORS_PATH, help="Vectors of the export (limits the rows).")
+    args = parser.parse_args()
+
+    num_rows = np.load(args.vectors_path, mmap_mode='r').shape[0] if os.path.isfile(args.vectors_path) else None
+    ensure_vocab_index(args.vocab_path, num_rows)
@@ -0,0 +1,202 @@
+# tests/benchmark.py
+
+import sys
+import os
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+import io
+import time
+import random
+import argparse
+import itertools
+import threading
+import contextlib
+import numpy as np
+
+from evaluator import load_puzzles, shufflePuzzles
+from memory_telemetry import telemetry, process_memory
+from puzzle_generator import iter_puzzles, parse_size, PuzzleGenerator
+from connections_model import connections_model
+
+
+def format_bytes(value):
+    """Human-readable size (or '-' when unknown)."""
+    if value is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(value) < 1024 or unit == 'GB':
+            return f"{value:.1f} {unit}"
+        value /= 1024
+
+
+def print_memory_report(snapshot):
+    """Print the memory telemetry snapshot as tables."""
+    print("-" * 80)
+    print(f"{'Memory':<20}{'RSS':>15}{'PSS':>15}{'shared clean':>15}{'private dirty':>15}")
+    rows = list(snapshot['loads'].items()) + [('now', snapshot['process'])]
+    for label, usage in rows:
+        print(f"{label:<20}{format_bytes(usage['rss_bytes']):>15}{format_bytes(usage['pss_bytes']):>15}"
+              f"{format_bytes(usage['shared_clean_bytes']):>15}{format_bytes(usage['private_dirty_bytes']):>15}")
+
+    requests = snapshot['requests']
+    print("-" * 80)
+    print(f"Per-request peak allocations ({requests['sampled']} of {requests['count']} calls traced): "
+          f"mean {format_bytes(requests['peak_bytes_mean'])}, max {format_bytes(requests['peak_bytes_max'])}")
+
+    print("-" * 80)
+    print(f"{'Cache':<20}{'entries':>10}{'size':>13}")
+    for name, size in snapshot['caches'].items():
+        entries = '-' if size['entries'] is None else size['entries']
+        print(f"{name:<20}{entries:>10}{format_bytes(size['bytes']):>13}")
+    print("-" * 80)
+
+
+def run_scaling(model, boards, thread_counts):
+    """
+    Serve the same boards from an increasing number of threads and report throughput.
+
+    Every thread takes the next board until all are answered; boards are distinct
+    so request coalescing does not inflate the figures.
+
+    Returns:
+    - dict: Maps each thread count to its throughput in requests per second.
+    """
+    throughputs = {}
+    for num_threads in thread_counts:
+        remaining = iter(boards)
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    words = next(remaining, None)
+                if words is None:
+                    return
+                model(words=words, strikes=0, isOneAway=False, correctGroups=[], previousGuesses=[], error="")
+
+        threads = [threading.Thread(target=worker) for _ in range(num_threads)]
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):  # Process-wide, so set once around all threads
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        throughputs[num_threads] = len(boards) / (time.perf_counter() - start_time)
+    return throughputs
+
+
+def run_board_sizes(solver_model, sizes, boards_per_size, seed=0, **solver_kwargs):
+    """
+    Time connections_model on synthetic boards of increasing size.
+
+    Parameters:
+    - solver_model: The word embedding model to solve with.
+    - sizes (list): (num_groups, group_size) board sizes.
+    - boards_per_size (int): The number of boards generated and solved per size.
+    - solver_kwargs: Passed on to connections_model (knn_graph, hidden_words, ...).
+
+    Returns:
+    - dict: Maps each size to an array of per-board latencies in milliseconds (sizes the
+      vocabulary cannot fill are skipped).
+    """
+    latencies = {}
+    for num_groups, group_size in sizes:
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                generator = PuzzleGenerator(solver_model, seed=seed, num_groups=num_groups, group_size=group_size)
+                boards = [[word for entry in generator.generate() for word in entry['words']]
+                          for _ in range(boards_per_size)]
+        except ValueError as e:
+            print(f"Skipping {num_groups}x{group_size} boards: {e}")
+            continue
+        size_latencies = []
+        for words in boards:
+            start_time = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                connections_model(words, solver_model, group_size=group_size, **solver_kwargs)
+            size_latencies.append((time.perf_counter() - start_time) * 1000)
+        latencies[(num_groups, group_size)] = np.asarray(size_latencies)
+    return latencies
+
+
+def board_stream(path=None):
+    """
+    Yield shuffled boards: streamed in file order from `path` (.json or .jsonl, e.g. the
+    output of puzzle_generator.py), or drawn at random from the sample puzzles.
+    """
+    if path:
+        for puzzle in iter_puzzles(path):
+            yield shufflePuzzles([entry['words'] for entry in puzzle])
+    else:
+        puzzles = load_puzzles()
+        while True:
+            yield shufflePuzzles(random.choice(puzzles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark model() latency and memory on the sample puzzles.")
+    parser.add_argument('--requests', type=int, default=50, help="Number of model() calls.")
+    parser.add_argument('--sample-rate', type=float, default=1.0,
+                        help="Fraction of calls whose peak allocations are traced.")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed for puzzle selection.")
+    parser.add_argument('--puzzles', default=None,
+                        help="Stream boards from this file (.json or .jsonl) instead of the sample puzzles.")
+    parser.add_argument('--board-sizes', default=None,
+                        help="Comma-separated synthetic board sizes to time the solver on (e.g. 4x4,5x5,6x4).")
+    parser.add_argument('--threads', default=None,
+                        help="Comma-separated thread counts for the scaling benchmark (e.g. 1,2,4,8).")
+    args = parser.parse_args()
+
+    baseline = process_memory()
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        import Model
+        from Model import model
+    load_seconds = time.perf_counter() - start_time
+    print(f"Model loaded in {load_seconds:.2f} seconds "
+          f"(RSS before loading: {format_bytes(baseline['rss_bytes'])})")
+
+    telemetry.sample_rate = args.sample_rate
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    boards = board_stream(args.puzzles)
+    latencies = []
+    for words in itertools.islice(boards, args.requests):
+        request_start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            model(words=words, strikes=0, isOneAway=False, correctGroups=[], previousGuesses=[], error="")
+        latencies.append((time.perf_counter() - request_start) * 1000)
+
+    latencies = np.asarray(latencies)
+    print("-" * 80)
+    print(f"{len(latencies)} requests: mean {latencies.mean():.1f} ms, p50 {np.percentile(latencies, 50):.1f} ms, "
+          f"p90 {np.percentile(latencies, 90):.1f} ms, p99 {np.percentile(latencies, 99):.1f} ms")
+    print_memory_report(telemetry.snapshot())
+
+    if args.threads:
+        telemetry.sample_rate = 0.0  # tracemalloc would serialize the threads
+        thread_counts = [int(count) for count in args.threads.split(',')]
+        throughputs = run_scaling(model, list(itertools.islice(boards, args.requests)), thread_counts)
+        baseline_throughput = throughputs[thread_counts[0]]
+        print(f"{'threads':>8}{'req/s':>10}{'speedup':>10}")
+        for num_threads, throughput in throughputs.items():
+            print(f"{num_threads:>8}{throughput:>10.1f}{throughput / baseline_throughput:>9.2f}x")
+        print("-" * 80)
+
+    if args.board_sizes:
+        sizes = [parse_size(size) for size in args.board_sizes.split(',')]
+        latencies = run_board_sizes(Model.model_instance, sizes, args.requests, seed=args.seed,
+                                    knn_graph=Model.knn_graph_instance, hidden_words=Model.hidden_word_detector)
+        print(f"{'board':>8}{'words':>8}{'mean ms':>10}{'p50 ms':>10}{'p90 ms':>10}")
+        for (num_groups, group_size), size_latencies in latencies.items():
+            print(f"{f'{num_groups}x{group_size}':>8}{num_groups * group_size:>8}{size_latencies.mean():>10.1f}"
+                  f"{np.percentile(size_latencies, 50):>10.1f}{np.percentile(size_latencies, 90):>10.1f}")
+        print("-" * 80)
+
+
+if __name__ == "__main__":
+    main()
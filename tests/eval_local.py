@@ -13,9 +13,7 @@ import json
 # Import the model function
 from Model import model
 from config import DATA_PATH
-
-GROUP_MULTIPLIERS = {1: 1, 2: 2, 3: 3, 4: 3}
-STRIKE_MULTIPLIERS = {0: 1, 1: 0.9, 2: 0.75, 3: 0.5, 4: 0.25}
+from game_rules import group_multiplier, STRIKE_MULTIPLIERS
 
 def evalFunction():
     # Load puzzles
@@ -127,7 +125,7 @@ def evalFunction():
         points = 0
 
         for i, group in enumerate(correctGroups):
-            groupMult = GROUP_MULTIPLIERS.get(i + 1, 1)
+            groupMult = group_multiplier(i + 1)
             strikeMult = STRIKE_MULTIPLIERS.get(strikes, 0.25)
             groupPoints = groupMult * strikeMult
             points += groupPoints
@@ -0,0 +1,161 @@
+# tests/load_test.py
+
+import sys
+import os
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+import time
+import random
+import argparse
+import threading
+import numpy as np
+import requests
+from urllib.parse import urlparse
+
+from evaluator import load_puzzles, shufflePuzzles
+from game_rules import play_game
+
+LOCAL_HOSTS = {'127.0.0.1', 'localhost', '::1'}
+
+
+class StepOver(Exception):
+    """Raised inside a game when the current concurrency step has ended."""
+
+
+class StepStats:
+    """Thread-safe collection of request latencies and outcomes for one step."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies_ms = []
+        self.errors = 0
+        self.rejected = 0
+        self.games = 0
+        self.points = 0.0
+
+    def add_request(self, latency_ms, ok):
+        with self._lock:
+            if ok:
+                self.latencies_ms.append(latency_ms)
+            else:
+                self.errors += 1
+
+    def add_rejection(self):
+        with self._lock:
+            self.rejected += 1
+
+    def add_game(self, points):
+        with self._lock:
+            self.games += 1
+            self.points += points
+
+
+def run_player(url, puzzles, stats, deadline, seed, timeout):
+    """Play full games against the server until the step deadline passes."""
+    rng = random.Random(seed)
+    session = requests.Session()
+
+    def guess_fn(words, strikes, isOneAway, correctGroups, previousGuesses, error):
+        if time.perf_counter() >= deadline:
+            raise StepOver()
+        data = {
+            "words": words,
+            "strikes": strikes,
+            "isOneAway": isOneAway,
+            "correctGroups": correctGroups,
+            "previousGuesses": previousGuesses,
+            "error": error
+        }
+        start_time = time.perf_counter()
+        try:
+            r = session.post(url, json=data, timeout=timeout)
+            # Admission control rejected the request: wait as told and retry it
+            while r.status_code == 503 and 'Retry-After' in r.headers:
+                stats.add_rejection()
+                time.sleep(float(r.headers['Retry-After']))
+                if time.perf_counter() >= deadline:
+                    raise StepOver()
+                start_time = time.perf_counter()
+                r = session.post(url, json=data, timeout=timeout)
+            r.raise_for_status()
+            response = r.json()
+        except (requests.RequestException, ValueError):
+            stats.add_request((time.perf_counter() - start_time) * 1000, ok=False)
+            raise
+        stats.add_request((time.perf_counter() - start_time) * 1000, ok=True)
+        return response['guess'], response['endTurn']
+
+    while time.perf_counter() < deadline:
+        puzzle = rng.choice(puzzles)
+        try:
+            result = play_game(puzzle, shufflePuzzles(puzzle), guess_fn)
+        except StepOver:
+            break
+        except (requests.RequestException, ValueError):
+            continue  # The failed request was counted; start a new game
+        stats.add_game(result['points'])
+
+
+def run_step(url, puzzles, concurrency, duration, timeout):
+    """Run `concurrency` simulated players for `duration` seconds."""
+    stats = StepStats()
+    start_time = time.perf_counter()
+    deadline = start_time + duration
+    players = [
+        threading.Thread(target=run_player, args=(url, puzzles, stats, deadline, seed, timeout), daemon=True)
+        for seed in range(concurrency)
+    ]
+    for player in players:
+        player.start()
+    for player in players:
+        player.join()
+    return stats, time.perf_counter() - start_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramp simulated concurrent games against a local Connections server.")
+    parser.add_argument('--url', default="http://127.0.0.1:5000/", help="URL of the local server.")
+    parser.add_argument('--steps', default="1,2,4,8,16,32", help="Comma-separated concurrency levels.")
+    parser.add_argument('--step-duration', type=float, default=30.0, help="Seconds per concurrency level.")
+    parser.add_argument('--slo-ms', type=float, default=1000.0, help="p99 latency objective in milliseconds.")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout in seconds.")
+    args = parser.parse_args()
+
+    # Never point the load generator at anything but this machine
+    host = urlparse(args.url).hostname
+    if host not in LOCAL_HOSTS:
+        parser.error(f"Refusing to load-test non-local host '{host}'. Use 127.0.0.1 or localhost.")
+
+    puzzles = load_puzzles()
+    if not puzzles:
+        sys.exit("No puzzles to play.")
+
+    print(f"{'players':>8}{'req/s':>10}{'games/s':>10}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'errors':>9}{'503s':>7}{'SLO':>6}")
+    max_within_slo = None
+    for concurrency in [int(step) for step in args.steps.split(',')]:
+        stats, elapsed = run_step(args.url, puzzles, concurrency, args.step_duration, args.timeout)
+        total = len(stats.latencies_ms) + stats.errors
+        error_rate = stats.errors / total if total else 0.0
+        if stats.latencies_ms:
+            p50, p90, p99 = np.percentile(stats.latencies_ms, [50, 90, 99])
+        else:
+            p50 = p90 = p99 = float('nan')
+        within_slo = bool(stats.latencies_ms) and p99 <= args.slo_ms and error_rate == 0.0
+        if within_slo:
+            max_within_slo = concurrency
+        print(f"{concurrency:>8}{len(stats.latencies_ms) / elapsed:>10.1f}{stats.games / elapsed:>10.2f}"
+              f"{p50:>10.1f}{p90:>10.1f}{p99:>10.1f}{error_rate:>9.1%}{stats.rejected:>7}{'ok' if within_slo else 'MISS':>6}")
+
+    print("-" * 80)
+    if max_within_slo is None:
+        print(f"No concurrency level met the p99 objective of {args.slo_ms:.0f} ms.")
+    else:
+        print(f"Highest concurrency within the p99 objective of {args.slo_ms:.0f} ms: {max_within_slo} players")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+# tests/profile_board.py
+
+import sys
+import os
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+import io
+import json
+import time
+import pstats
+import cProfile
+import argparse
+import contextlib
+from collections import defaultdict
+from concurrent.futures import Future
+import numpy as np
+
+import connections_model as connections_module
+from connections_model import connections_model
+from model_loader import ModelLoader
+from hidden_words import load_detector
+from phrase_vectors import TOKEN_SEPARATORS
+from puzzle_generator import iter_puzzles
+from config import EMBEDDINGS_PATH, DATA_PATH
+
+# Pipeline stages, as (module, function) entry points; a stage's time is the
+# cumulative time of its entry points, so nested stages are included in their parents
+STAGES = [
+    ('semantic matrix', [('similarity_metrics.py', 'semantic_similarity_matrix'),
+                         ('similarity_metrics.py', 'ensemble_similarity_matrix')]),
+    ('  neighbor search', [('similarity_metrics.py', '_batch_neighbors')]),
+    ('pair scorer', [('pairwise_scorer.py', 'score_matrix')]),
+    ('lexical n-grams', [('similarity_metrics.py', 'ngram_jaccard_matrix')]),
+    ('hidden words', [('hidden_words.py', 'hidden_class_matrix')]),
+    ('category seeds', [('connections_model.py', '_category_seeds')]),
+    ('grouping', [('connections_model.py', '_group_words')]),
+    ('  greedy stages', [('connections_model.py', '_greedy_stage')]),
+    ('  best-first search', [('connections_model.py', '_best_first_groups')]),
+    ('  swap refinement', [('connections_model.py', '_refine_by_swaps')]),
+    ('  phonetic', [('phonetic.py', 'phonetic_groups'), ('connections_model.py', '_phonetic_code_distance')]),
+]
+
+
+class InlineExecutor:
+    """Runs submitted work immediately, so that the profiler sees the signal threads' work."""
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class StackProfiler:
+    """
+    Deterministic profiler recording self time per full call stack.
+
+    The result is the "collapsed stack" format read by flamegraph.pl,
+    speedscope and similar tools: one 'frame;frame;frame microseconds' line per stack.
+    """
+
+    def __init__(self):
+        self.collapsed = defaultdict(float)
+        self._stack = []  # [label, start time, time spent in children]
+
+    @staticmethod
+    def _label(frame, event, arg):
+        if event.startswith('c_'):
+            module = getattr(arg, '__module__', None) or type(getattr(arg, '__self__', None)).__name__
+            return f"{module}.{arg.__name__}"
+        code = frame.f_code
+        return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+    def _callback(self, frame, event, arg):
+        now = time.perf_counter()
+        if event in ('call', 'c_call'):
+            self._stack.append([self._label(frame, event, arg), now, 0.0])
+        elif event in ('return', 'c_return', 'c_exception') and self._stack:
+            label, start, children = self._stack.pop()
+            elapsed = now - start
+            stack_key = ';'.join([entry[0] for entry in self._stack] + [label])
+            self.collapsed[stack_key] += elapsed - children
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def run(self, fn, *args, **kwargs):
+        sys.setprofile(self._callback)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sys.setprofile(None)
+
+    def write(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            for stack_key, seconds in sorted(self.collapsed.items()):
+                microseconds = int(round(seconds * 1e6))
+                if microseconds > 0:
+                    file.write(f"{stack_key} {microseconds}\n")
+
+
+def read_boards(path, limit=None):
+    """Read boards (lists of 16 words) from a file in the sample_data.json schema, or JSONL."""
+    boards = []
+    for puzzle in iter_puzzles(path):
+        boards.append([word for entry in puzzle for word in entry['words']])
+        if limit is not None and len(boards) >= limit:
+            break
+    return boards
+
+
+def make_snapshot(model, boards, snapshot_dir, size):
+    """
+    Write a small raw export: the top `size` words plus every board word and its tokens.
+
+    Neighbor overlap is then computed within the snapshot vocabulary, so absolute
+    timings and some scores differ from the full model, but profiles are repeatable.
+    """
+    needed = set()
+    for board in boards:
+        for word in board:
+            needed.add(word)
+            needed.update(token for token in TOKEN_SEPARATORS.split(word) if token)
+            needed.update(token.lower() for token in TOKEN_SEPARATORS.split(word) if token)
+    indices = list(range(min(size, len(model.index_to_key))))
+    indices += sorted(model.key_to_index[word] for word in needed
+                      if word in model.key_to_index and model.key_to_index[word] >= size)
+
+    if not os.path.isdir(snapshot_dir):
+        os.makedirs(snapshot_dir)
+    vectors_path = os.path.join(snapshot_dir, 'vectors.npy')
+    vocab_path = os.path.join(snapshot_dir, 'vocab.txt')
+    np.save(vectors_path, np.asarray(model.vectors[indices], dtype=np.float32))
+    with open(vocab_path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(model.index_to_key[index] for index in indices) + '\n')
+    print(f"Snapshot with {len(indices)} words written to '{snapshot_dir}'.")
+    return vectors_path, vocab_path
+
+
+def load_model(args, boards):
+    """Load the full model, a snapshot, or create a snapshot from the full model first."""
+    if args.snapshot:
+        vectors_path = os.path.join(args.snapshot, 'vectors.npy')
+        vocab_path = os.path.join(args.snapshot, 'vocab.txt')
+        if not os.path.isfile(vectors_path):
+            full_model = ModelLoader.load_vectors(args.model_path)
+            make_snapshot(full_model, boards, args.snapshot, args.snapshot_size)
+        return ModelLoader._prepare_for_sharing(ModelLoader._load_export(vectors_path, vocab_path)), None
+    return ModelLoader.load_vectors(args.model_path), ModelLoader.load_knn_graph()
+
+
+def stage_report(stats, total_seconds):
+    """Print cumulative time per pipeline stage from cProfile statistics."""
+    by_function = {(os.path.basename(filename), name): (calls, cumulative)
+                   for (filename, _, name), (_, calls, _, cumulative, _) in stats.stats.items()}
+    print(f"{'Stage':<24}{'calls':>8}{'seconds':>10}{'share':>8}")
+    for stage, entry_points in STAGES:
+        calls = sum(by_function.get(entry_point, (0, 0.0))[0] for entry_point in entry_points)
+        seconds = sum(by_function.get(entry_point, (0, 0.0))[1] for entry_point in entry_points)
+        print(f"{stage:<24}{calls:>8}{seconds:>10.4f}{seconds / total_seconds:>8.1%}")
+
+
+def hot_functions(stats, top):
+    """Print the functions with the highest self time."""
+    rows = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:top]
+    print(f"{'self s':>9}{'cum s':>9}{'calls':>9}  function")
+    for (filename, line, name), (_, calls, self_time, cumulative, _) in rows:
+        location = f"{os.path.basename(filename)}:{line}" if line else filename
+        print(f"{self_time:>9.4f}{cumulative:>9.4f}{calls:>9}  {name} ({location})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile connections_model per pipeline stage.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--puzzles', default=DATA_PATH, help="Puzzle file (.json in sample_data schema or .jsonl).")
+    source.add_argument('--words', help="A single game state: comma-separated board words.")
+    parser.add_argument('--correct-groups', default='[]',
+                        help="JSON list of groups already solved (removed from the --words board).")
+    parser.add_argument('--limit', type=int, default=20, help="Number of boards profiled from --puzzles.")
+    parser.add_argument('--model-path', default=EMBEDDINGS_PATH, help="Full KeyedVectors to profile against.")
+    parser.add_argument('--snapshot', help="Directory of a small raw export to profile against "
+                                           "(created from --model-path on first use).")
+    parser.add_argument('--snapshot-size', type=int, default=50000, help="Top words kept in a new snapshot.")
+    parser.add_argument('--budget', type=float, default=None, help="Solver latency budget in seconds.")
+    parser.add_argument('--top', type=int, default=25, help="Number of hot functions listed.")
+    parser.add_argument('--collapsed', default='profile.collapsed', help="Output path of the collapsed stacks.")
+    parser.add_argument('--pstats', default=None, help="Optional output path of the raw cProfile data.")
+    args = parser.parse_args()
+
+    if args.words:
+        solved = {word for group in json.loads(args.correct_groups) for word in group}
+        boards = [[word.strip() for word in args.words.split(',') if word.strip() not in solved]]
+    else:
+        boards = read_boards(args.puzzles, args.limit)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        model, knn_graph = load_model(args, boards)
+    hidden_words = load_detector(model)
+    category_index = ModelLoader.load_category_index()
+
+    def run_boards():
+        for board in boards:
+            connections_model(board, model, knn_graph=knn_graph, budget=args.budget,
+                              category_index=category_index, hidden_words=hidden_words)
+
+    # Run the signals inline so both profilers see them, and warm up caches first
+    connections_module._signal_executor = InlineExecutor()
+    connections_module._refinement_executor = InlineExecutor()
+    with contextlib.redirect_stdout(io.StringIO()):
+        connections_model(boards[0], model, knn_graph=knn_graph, budget=args.budget,
+                          category_index=category_index, hidden_words=hidden_words)
+
+        profiler = cProfile.Profile()
+        start_time = time.perf_counter()
+        profiler.runcall(run_boards)
+        total_seconds = time.perf_counter() - start_time
+
+        stack_profiler = StackProfiler()
+        stack_profiler.run(run_boards)
+
+    stats = pstats.Stats(profiler)
+    print("-" * 80)
+    print(f"Profiled {len(boards)} board(s) in {total_seconds:.3f} seconds "
+          f"({total_seconds / len(boards) * 1000:.1f} ms per board, profiler overhead included)")
+    print("-" * 80)
+    stage_report(stats, total_seconds)
+    print("-" * 80)
+    hot_functions(stats, args.top)
+    print("-" * 80)
+
+    stack_profiler.write(args.collapsed)
+    print(f"Collapsed stacks written to '{args.collapsed}' (e.g. flamegraph.pl {args.collapsed} > profile.svg)")
+    if args.pstats:
+        stats.dump_stats(args.pstats)
+        print(f"cProfile data written to '{args.pstats}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+# tests/replay_requests.py
+
+import sys
+import os
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+import io
+import time
+import argparse
+import contextlib
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from request_log import read_records, disable_recording
+
+# Per-worker model function, filled in by init_worker
+worker_model = None
+
+
+def init_worker():
+    """Load the model once per worker process, with recording disabled."""
+    global worker_model
+    # Forked workers inherit the parent's config, so CONNECTIONS_REQUEST_LOG cannot be unset here
+    disable_recording()
+    with contextlib.redirect_stdout(io.StringIO()):
+        import Model
+    Model.request_recorder = None  # In case Model was imported before recording was disabled
+    worker_model = Model.model
+
+
+def replay_record(record):
+    """
+    Run one recorded request against the current code.
+
+    Returns:
+    - dict: The replayed result (or exception) and its latency in milliseconds.
+    """
+    request = record['request']
+    start_time = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            guess, endTurn = worker_model(
+                words=request['words'],
+                strikes=request['strikes'],
+                isOneAway=request['isOneAway'],
+                correctGroups=request['correctGroups'],
+                previousGuesses=request['previousGuesses'],
+                error=request['error']
+            )
+        result, exception = {'guess': guess, 'endTurn': endTurn}, None
+    except Exception as e:
+        result, exception = None, repr(e)
+    return {
+        'result': result,
+        'exception': exception,
+        'latency_ms': (time.perf_counter() - start_time) * 1000,
+    }
+
+
+def latency_summary(latencies):
+    """Return mean and percentile latencies (in milliseconds) as a dict."""
+    if not latencies:
+        return {}
+    latencies = np.asarray(latencies, dtype=float)
+    return {
+        'mean': latencies.mean(),
+        'p50': np.percentile(latencies, 50),
+        'p90': np.percentile(latencies, 90),
+        'p99': np.percentile(latencies, 99),
+        'max': latencies.max(),
+    }
+
+
+def same_result(recorded, replayed):
+    """Compare two results the way the evaluator reads them: the guessed words in any order, and endTurn."""
+    if recorded is None or replayed is None:
+        return recorded == replayed
+    return sorted(recorded['guess']) == sorted(replayed['guess']) and recorded['endTurn'] == replayed['endTurn']
+
+
+def print_report(records, replays, max_diffs=10):
+    """Print result diffs and recorded vs replayed latency distributions."""
+    diffs = []
+    for index, (record, replay) in enumerate(zip(records, replays)):
+        if not same_result(record['result'], replay['result']) or bool(record['exception']) != bool(replay['exception']):
+            diffs.append((index, record, replay))
+
+    print("-" * 80)
+    print(f"Replayed {len(records)} requests: {len(records) - len(diffs)} identical, {len(diffs)} different")
+    print("-" * 80)
+    for index, record, replay in diffs[:max_diffs]:
+        print(f"Request {index}: words={record['request']['words']}")
+        print(f"  Recorded: {record['result'] or record['exception']}")
+        print(f"  Replayed: {replay['result'] or replay['exception']}")
+    if len(diffs) > max_diffs:
+        print(f"... {len(diffs) - max_diffs} more differences not shown")
+
+    recorded = latency_summary([record['latency_ms'] for record in records if record.get('latency_ms') is not None])
+    replayed = latency_summary([replay['latency_ms'] for replay in replays])
+    print("-" * 80)
+    print(f"{'Latency (ms)':<14}{'recorded':>12}{'replayed':>12}{'change':>10}")
+    for key, replayed_value in replayed.items():
+        recorded_value = recorded.get(key)
+        if recorded_value:
+            change = f"{(replayed_value - recorded_value) / recorded_value:+.0%}"
+            print(f"{key:<14}{recorded_value:>12.1f}{replayed_value:>12.1f}{change:>10}")
+        else:
+            print(f"{key:<14}{'-':>12}{replayed_value:>12.1f}{'-':>10}")
+    print("-" * 80)
+    return diffs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded model() calls and compare results and latency.")
+    parser.add_argument('log_path', help="Path to a .jsonl.gz request log.")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Number of replay processes.")
+    parser.add_argument('--limit', type=int, default=None, help="Replay only the first N records.")
+    parser.add_argument('--max-diffs', type=int, default=10, help="Number of differences to print.")
+    args = parser.parse_args()
+
+    records = list(read_records(args.log_path))[:args.limit]
+    print(f"Replaying {len(records)} requests from '{args.log_path}' with {args.workers} workers...")
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as executor:
+        replays = list(executor.map(replay_record, records, chunksize=4))
+
+    diffs = print_report(records, replays, args.max_diffs)
+    sys.exit(1 if diffs else 0)
+
+
+if __name__ == "__main__":
+    main()
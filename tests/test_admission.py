@@ -0,0 +1,119 @@
+# tests/test_admission.py
+
+import sys
+import os
+import json
+import time
+import threading
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from admission import AdmissionController, AdmissionMiddleware, Rejected
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def hold_slot(controller, release, deadline=None, outcomes=None):
+    """Hold one slot of `controller` until `release` is set, recording the outcome."""
+    try:
+        with controller.admit(deadline):
+            release.wait()
+        outcome = 'done'
+    except Rejected as rejection:
+        outcome = rejection.reason
+    if outcomes is not None:
+        outcomes.append(outcome)
+
+
+def test_full_queue_is_rejected_right_away():
+    controller = AdmissionController(max_concurrent=1, max_queue=1, deadline=5.0)
+    release = threading.Event()
+    outcomes = []
+    threads = [threading.Thread(target=hold_slot, args=(controller, release, None, outcomes)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    assert wait_for(lambda: controller.snapshot()['queue_depth'] == 1)
+
+    start_time = time.monotonic()
+    try:
+        with controller.admit():
+            assert False, "admitted past a full queue"
+    except Rejected as rejection:
+        assert rejection.reason == 'queue_full' and rejection.retry_after >= 1
+    assert time.monotonic() - start_time < 0.05
+
+    release.set()
+    for thread in threads:
+        thread.join()
+    snapshot = controller.snapshot()
+    assert outcomes == ['done', 'done']
+    assert snapshot['rejected_queue_full'] == 1 and snapshot['completed'] == 2 and snapshot['queue_depth'] == 0
+
+
+def test_requests_that_would_miss_their_deadline_are_shed():
+    controller = AdmissionController(max_concurrent=1, max_queue=10, deadline=5.0)
+    with controller.admit():
+        time.sleep(0.2)  # Service time estimate: about 0.2 s
+
+    release = threading.Event()
+    holder = threading.Thread(target=hold_slot, args=(controller, release))
+    holder.start()
+    assert wait_for(lambda: controller.snapshot()['running'] == 1)
+
+    # Cannot finish in time even if admitted next: shed on arrival
+    try:
+        with controller.admit(deadline=0.1):
+            assert False, "admitted a request that cannot meet its deadline"
+    except Rejected as rejection:
+        assert rejection.reason == 'deadline'
+
+    # Could finish in time on arrival, but the slot stays busy: shed while queued
+    outcomes = []
+    waiter = threading.Thread(target=hold_slot, args=(controller, threading.Event(), 0.5, outcomes))
+    waiter.start()
+    waiter.join(timeout=2.0)
+    assert outcomes == ['deadline']
+    release.set()
+    holder.join()
+    assert controller.snapshot()['shed_deadline'] == 2
+
+
+def test_middleware_answers_503_with_retry_after():
+    controller = AdmissionController(max_concurrent=1, max_queue=0)
+    calls = []
+
+    def app(environ, start_response):
+        calls.append(environ['PATH_INFO'])
+        start_response('200 OK', [('Content-Type', 'application/json')])
+        return [b'{}']
+
+    middleware = AdmissionMiddleware(app, controller)
+    responses = []
+
+    def start_response(status, headers):
+        responses.append((status, dict(headers)))
+
+    assert middleware({'REQUEST_METHOD': 'POST', 'PATH_INFO': '/'}, start_response) == [b'{}']
+    with controller.admit():
+        body = middleware({'REQUEST_METHOD': 'POST', 'PATH_INFO': '/'}, start_response)
+        assert middleware({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/diagnostics/admission'}, start_response) == [b'{}']
+    status, headers = responses[1]
+    assert status.startswith('503') and int(headers['Retry-After']) >= 1
+    assert json.loads(body[0])['reason'] == 'queue_full'
+    assert calls == ['/', '/diagnostics/admission']
+
+
+if __name__ == "__main__":
+    test_full_queue_is_rejected_right_away()
+    test_requests_that_would_miss_their_deadline_are_shed()
+    test_middleware_answers_503_with_retry_after()
+    print("✅ Admission control tests passed.")
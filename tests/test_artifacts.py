@@ -0,0 +1,62 @@
+# tests/test_artifacts.py
+
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from artifacts import ensure_artifacts, _artifact_paths
+
+
+def save_model(model_path, num_words, seed):
+    """Save random vectors as KeyedVectors and load them back with memory mapping."""
+    vectors = np.random.default_rng(seed).normal(size=(num_words, 8)).astype(np.float32)
+    model = KeyedVectors(8)
+    model.add_vectors([f"w{i}" for i in range(num_words)], vectors)
+    model.save(model_path)
+    return KeyedVectors.load(model_path, mmap='r')
+
+
+def test_artifacts_are_rebuilt_when_the_model_changes():
+    model_path = os.path.join(tempfile.mkdtemp(), 'model.kv')
+    paths = _artifact_paths(model_path)
+    model = ensure_artifacts(save_model(model_path, 50, seed=0), model_path)
+    assert isinstance(model.norms, np.memmap) and np.allclose(model.norms, np.linalg.norm(model.vectors, axis=1))
+    with open(paths['manifest'], 'r', encoding='utf-8') as file:
+        first_manifest = json.load(file)
+
+    # Same path, other vocabulary: the checksum no longer matches, so the bundle is rebuilt
+    model = ensure_artifacts(save_model(model_path, 80, seed=1), model_path)
+    with open(paths['manifest'], 'r', encoding='utf-8') as file:
+        manifest = json.load(file)
+    assert manifest['source'] != first_manifest['source'] and manifest['num_vectors'] == 80
+    assert np.allclose(model.norms, np.linalg.norm(model.vectors, axis=1))
+    assert np.array_equal(model.frequency_ranks, np.arange(80))
+    assert not [name for name in os.listdir(os.path.dirname(model_path)) if name.endswith('.tmp')]
+
+
+def test_unwritable_bundle_falls_back_to_memory():
+    model_path = os.path.join(tempfile.mkdtemp(), 'model.kv')
+    model = save_model(model_path, 50, seed=0)
+    # A directory in place of the norms file cannot be replaced, whoever runs the test (root included)
+    os.mkdir(_artifact_paths(model_path)['norms'])
+
+    model = ensure_artifacts(model, model_path)
+    assert not isinstance(model.norms, np.memmap)
+    assert np.allclose(model.norms, np.linalg.norm(model.vectors, axis=1))
+    assert np.array_equal(model.frequency_ranks, np.arange(50))
+    assert not os.path.exists(_artifact_paths(model_path)['manifest'])
+    assert not [name for name in os.listdir(os.path.dirname(model_path)) if name.endswith('.tmp')]
+
+
+if __name__ == "__main__":
+    test_artifacts_are_rebuilt_when_the_model_changes()
+    test_unwritable_bundle_falls_back_to_memory()
+    print("✅ Derived artifacts tests passed.")
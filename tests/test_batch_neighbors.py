@@ -0,0 +1,62 @@
+# tests/test_batch_neighbors.py
+
+import sys
+import os
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from phrase_vectors import get_word_vector
+from similarity_metrics import batch_most_similar, batch_neighbor_indices
+
+TOP_N = 15
+
+
+def make_model():
+    rng = np.random.default_rng(1)
+    words = ['ice', 'cream', 'fire', 'truck', 'dog', 'cat'] + [f"w{i}" for i in range(300)]
+    model = KeyedVectors(24)
+    model.add_vectors(words, rng.standard_normal((len(words), 24)).astype(np.float32))
+    return model
+
+
+def test_batched_neighbors_match_most_similar():
+    model = make_model()
+    words = ['dog', 'cat', 'ice', 'w7', 'dog', 'zzz']
+    # Chunks smaller and larger than top_n, and one chunk for the whole vocabulary
+    for chunk_size in (7, 40, 65536):
+        neighbors = batch_neighbor_indices(words, model, top_n=TOP_N, chunk_size=chunk_size)
+        similar = batch_most_similar(words, model, top_n=TOP_N, chunk_size=chunk_size)
+        assert set(neighbors) == set(similar) == {'dog', 'cat', 'ice', 'w7'}
+        for word in neighbors:
+            expected = model.most_similar(word, topn=TOP_N)
+            # Words are not their own neighbors
+            assert model.key_to_index[word] not in neighbors[word]
+            assert list(neighbors[word]) == [model.key_to_index[key] for key, _ in expected]
+            assert [key for key, _ in similar[word]] == [key for key, _ in expected]
+            assert np.allclose([score for _, score in similar[word]], [score for _, score in expected], atol=1e-5)
+
+
+def test_phrase_neighbors_match_a_vector_search():
+    model = make_model()
+    words = ['ice cream', 'Fire-Truck', 'dog']
+    for chunk_size in (7, 65536):
+        neighbors = batch_neighbor_indices(words, model, top_n=TOP_N, chunk_size=chunk_size)
+        similar = batch_most_similar(words, model, top_n=TOP_N, chunk_size=chunk_size)
+        for phrase in ('ice cream', 'Fire-Truck'):
+            # Composed phrases exclude nothing, so their parts may be neighbors
+            expected = model.similar_by_vector(get_word_vector(phrase, model), topn=TOP_N)
+            assert list(neighbors[phrase]) == [model.key_to_index[key] for key, _ in expected]
+            assert np.allclose([score for _, score in similar[phrase]], [score for _, score in expected], atol=1e-5)
+        assert similar['ice cream'][0][0] in ('ice', 'cream')
+        assert list(neighbors['dog']) == [model.key_to_index[key] for key, _ in model.most_similar('dog', topn=TOP_N)]
+
+
+if __name__ == "__main__":
+    test_batched_neighbors_match_most_similar()
+    test_phrase_neighbors_match_a_vector_search()
+    print("✅ Batched neighbor tests passed.")
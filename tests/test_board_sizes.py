@@ -0,0 +1,141 @@
+# tests/test_board_sizes.py
+
+import sys
+import os
+import io
+import itertools
+import contextlib
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from connections_model import connections_model, _best_first_groups, _refine_by_swaps, _swap_gains, _pair_sum
+from game_rules import check_guess
+from speculative import next_states
+
+BOARD_SIZES = [(2, 4), (3, 3), (2, 5), (3, 4)]
+
+
+def clustered_matrix(num_groups, group_size, rng):
+    """Noisy pairwise scores of a shuffled board, with a zero diagonal."""
+    n = num_groups * group_size
+    truth = rng.permutation(np.arange(n) // group_size)
+    matrix = np.where(truth[:, None] == truth[None, :], 0.6, 0.3) + 0.15 * rng.standard_normal((n, n))
+    matrix = (matrix + matrix.T) / 2
+    np.fill_diagonal(matrix, 0.0)
+    return matrix
+
+
+def grow_every_seed(matrix, threshold, group_size):
+    """Best-first search without beam or pruning: every remaining word is grown as a seed."""
+    remaining, committed = list(range(len(matrix))), []
+    while len(remaining) >= group_size:
+        best_group, best_cohesion = None, None
+        for seed in remaining:
+            group = [seed]
+            while len(group) < group_size:
+                eligible = [word for word in remaining if word not in group
+                            and max(matrix[member, word] for member in group) >= threshold]
+                if not eligible:
+                    break
+                group.append(max(eligible, key=lambda word: (sum(matrix[member, word] for member in group), -word)))
+            if len(group) == group_size and (best_cohesion is None or _pair_sum(group, matrix) > best_cohesion):
+                best_group, best_cohesion = group, _pair_sum(group, matrix)
+        if best_group is None:
+            break
+        committed.append(best_group)
+        remaining = [word for word in remaining if word not in best_group]
+    return committed
+
+
+def all_partitions(items, group_size):
+    """Every partition of `items` into groups of group_size."""
+    if not items:
+        yield []
+        return
+    first, rest = items[0], items[1:]
+    for others in itertools.combinations(rest, group_size - 1):
+        left = [item for item in rest if item not in others]
+        for partition in all_partitions(left, group_size):
+            yield [[first, *others]] + partition
+
+
+def test_beam_search_matches_exhaustive_search():
+    rng = np.random.default_rng(0)
+    for trial in range(40):
+        num_groups, group_size = BOARD_SIZES[trial % len(BOARD_SIZES)]
+        matrix = clustered_matrix(num_groups, group_size, rng)
+        groups = _best_first_groups(matrix, 0.5, group_size)
+        expected = grow_every_seed(matrix, 0.5, group_size)
+        assert [sorted(group) for group in groups] == [sorted(group) for group in expected]
+        if len(groups) < num_groups:
+            continue
+        # Refined by swaps, the groups reach the most cohesive partition of the board
+        with contextlib.redirect_stdout(io.StringIO()):
+            refined = _refine_by_swaps(groups, matrix, [str(i) for i in range(len(matrix))], None)
+        best = max(sum(_pair_sum(group, matrix) for group in partition)
+                   for partition in all_partitions(list(range(len(matrix))), group_size))
+        assert np.isclose(sum(_pair_sum(group, matrix) for group in refined), best)
+
+
+def test_swap_gains_match_recomputed_cohesion():
+    rng = np.random.default_rng(1)
+    for group_size in (3, 4, 5):
+        matrix = rng.random((2 * group_size, 2 * group_size))
+        matrix = (matrix + matrix.T) / 2
+        np.fill_diagonal(matrix, 0.0)
+        a, b = list(range(group_size)), list(range(group_size, 2 * group_size))
+        gains = _swap_gains(a, b, matrix)
+        before = _pair_sum(a, matrix) + _pair_sum(b, matrix)
+        for i, j in itertools.product(range(group_size), repeat=2):
+            swapped_a, swapped_b = list(a), list(b)
+            swapped_a[i], swapped_b[j] = b[j], a[i]
+            assert np.isclose(gains[i, j], _pair_sum(swapped_a, matrix) + _pair_sum(swapped_b, matrix) - before)
+
+
+def test_larger_boards_are_recovered():
+    rng = np.random.default_rng(2)
+    for num_groups, group_size in [(5, 5), (6, 4)]:
+        words = [''.join(rng.choice(list('bcdfghjklmnpqrstvwxz'), 7)) for _ in range(num_groups * group_size)]
+        centers = rng.standard_normal((num_groups, 32))
+        vectors = np.repeat(centers, group_size, axis=0) + 0.3 * rng.standard_normal((len(words), 32))
+        model = KeyedVectors(32)
+        model.add_vectors(words, vectors.astype(np.float32))
+        truth = sorted(sorted(words[g * group_size:(g + 1) * group_size]) for g in range(num_groups))
+
+        board = [words[i] for i in rng.permutation(len(words))]
+        with contextlib.redirect_stdout(io.StringIO()):
+            groups, details = connections_model(board, model, group_size=group_size, return_details=True)
+        assert details['level'] == 2
+        assert sorted(sorted(group) for group in groups.values()) == truth
+
+
+def test_rules_and_next_states_follow_the_group_size():
+    puzzle = [['A1', 'A2', 'A3', 'A4', 'A5'], ['B1', 'B2', 'B3', 'B4', 'B5'], ['C1', 'C2', 'C3', 'C4', 'C5']]
+    assert check_guess(puzzle, ['A1', 'A2', 'A3', 'A4'], []) == ("Please enter 5 words.", None, False)
+    assert check_guess(puzzle, ['A5', 'A4', 'A3', 'A2', 'A1'], []) == ("", puzzle[0], False)
+    assert check_guess(puzzle, ['A1', 'A2', 'A3', 'A4', 'B1'], []) == ("", None, True)
+    assert check_guess(puzzle, ['A1', 'A2', 'A3', 'B1', 'B2'], []) == ("", None, False)
+    assert check_guess(puzzle, ['A1', 'A2', 'A3', 'B1', 'B2'], [['B2', 'B1', 'A3', 'A2', 'A1']])[0] == \
+        "You have already guessed this combination."
+
+    words = [word for group in puzzle for word in group]
+    # Two groups left: a correct guess leaves one to play
+    states = dict(next_states(words, 0, [puzzle[0]], [puzzle[0]], puzzle[1], num_groups=3))
+    assert list(states) == ['correct', 'one_away', 'wrong']
+    assert states['correct']['correctGroups'] == puzzle[:2]
+    # Only the last group left: a correct guess ends the game
+    states = next_states(words, 0, puzzle[:2], puzzle[:2], puzzle[2], num_groups=3)
+    assert [outcome for outcome, _ in states] == ['one_away', 'wrong']
+
+
+if __name__ == "__main__":
+    test_beam_search_matches_exhaustive_search()
+    test_swap_gains_match_recomputed_cohesion()
+    test_larger_boards_are_recovered()
+    test_rules_and_next_states_follow_the_group_size()
+    print("✅ Board size tests passed.")
@@ -0,0 +1,108 @@
+# tests/test_category_index.py
+
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from artifacts import model_fingerprint
+from category_index import CategoryIndex, build_category_index
+from connections_model import _category_seeds
+
+FRUITS = ['apple', 'banana', 'cherry', 'grape']
+COLORS = ['red', 'blue', 'green', 'yellow']
+OTHERS = ['car', 'bus', 'dog', 'cat']
+
+
+class CountingIndex(CategoryIndex):
+    """A CategoryIndex counting its affinity computations."""
+
+    calls = 0
+
+    def affinities(self, words, model):
+        CountingIndex.calls += 1
+        return super().affinities(words, model)
+
+
+def build_index():
+    """Index a fruit and a color category over clustered toy vectors."""
+    rng = np.random.default_rng(0)
+    words = FRUITS + COLORS + OTHERS
+    centers = rng.standard_normal((3, 16))
+    vectors = np.concatenate([centers[0] + 0.2 * rng.standard_normal((4, 16)),
+                              centers[1] + 0.2 * rng.standard_normal((4, 16)),
+                              rng.standard_normal((4, 16))]).astype(np.float32)
+    model = KeyedVectors(16)
+    model.add_vectors(words, vectors)
+
+    tmp_dir = tempfile.mkdtemp()
+    data_path = os.path.join(tmp_dir, 'puzzles.json')
+    with open(data_path, 'w', encoding='utf-8') as file:
+        json.dump([[{'category': 'fruit', 'words': FRUITS}, {'category': 'colors', 'words': COLORS}]], file)
+    build_category_index(model, [data_path], os.path.join(tmp_dir, 'index'))
+    index = CategoryIndex.load(os.path.join(tmp_dir, 'index'))
+    return model, CountingIndex(index.centroids, index.labels, index.source)
+
+
+def test_proposals_and_seed_order():
+    model, index = build_index()
+    board = ['car', 'red', 'apple', 'dog', 'blue', 'banana', 'bus', 'green', 'cherry', 'cat', 'yellow', 'grape']
+
+    proposals = index.propose_groups(board, model, min_affinity=0.5)
+    assert sorted((label, sorted(group)) for _, label, group in proposals) == \
+        [('colors', sorted(COLORS)), ('fruit', sorted(FRUITS))]
+    assert all(mean_affinity >= 0.5 for mean_affinity, _, _ in proposals)
+    # Precomputed affinities give the same proposals without scoring the board again
+    affinities = index.affinities(board, model)
+    calls = CountingIndex.calls
+    assert index.propose_groups(board, model, min_affinity=0.5, affinities=affinities) == proposals
+    assert CountingIndex.calls == calls
+
+    CountingIndex.calls = 0
+    groups, seed_order = _category_seeds(board, model, index)
+    assert CountingIndex.calls == 1
+    assert sorted(sorted(group) for group in groups) == [sorted(FRUITS), sorted(COLORS)]
+    # Words of known categories seed first, by decreasing best affinity
+    assert sorted(seed_order[:8]) == sorted(FRUITS + COLORS) and sorted(seed_order[8:]) == sorted(OTHERS)
+    best_affinity = affinities.max(axis=1)
+    assert [best_affinity[board.index(word)] for word in seed_order] == sorted(best_affinity, reverse=True)
+
+
+def test_indexes_built_from_other_vectors_are_refused():
+    model, index = build_index()
+    board = ['car', 'red', 'apple', 'dog', 'blue', 'banana', 'bus', 'green', 'cherry', 'cat', 'yellow', 'grape']
+    # Same words and dimension, other vectors
+    other = KeyedVectors(16)
+    other.add_vectors(model.index_to_key, np.random.default_rng(1).standard_normal((12, 16)).astype(np.float32))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        data_path = os.path.join(tmp_dir, 'puzzles.json')
+        with open(data_path, 'w', encoding='utf-8') as file:
+            json.dump([[{'category': 'fruit', 'words': FRUITS}]], file)
+        index_dir = os.path.join(tmp_dir, 'index')
+        build_category_index(model, [data_path], index_dir)
+        assert CategoryIndex.load(index_dir, [model_fingerprint(other)]) is None
+        assert CategoryIndex.load(index_dir, [model_fingerprint(other), model_fingerprint(model)]) is not None
+        # Indexes that do not record their vectors are refused too
+        os.remove(os.path.join(index_dir, 'meta.json'))
+        assert CategoryIndex.load(index_dir) is None
+
+    # The ensemble model the index was built from is chosen, whatever its position
+    expected = _category_seeds(board, model, index)
+    assert expected[0]
+    assert _category_seeds(board, {'other': other, 'built': model}, index) == expected
+    assert _category_seeds(board, {'other': other}, index) == ([], [])
+    assert _category_seeds(board, other, index) == ([], [])
+
+
+if __name__ == "__main__":
+    test_proposals_and_seed_order()
+    test_indexes_built_from_other_vectors_are_refused()
+    print("✅ Category index tests passed.")
@@ -0,0 +1,120 @@
+# tests/test_decision_engine.py
+
+import sys
+import os
+import numpy as np
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from decision_engine import choose_guess, sample_partitions, simulate
+from speculative import request_key
+
+WORDS = [f"w{i}" for i in range(16)]
+SOLVER_GROUPS = {f"Group{g + 1}": WORDS[4 * g:4 * g + 4] for g in range(4)}
+
+
+def board_matrix(noise, seed=0):
+    """Pairwise scores of a board whose true groups are w0-w3, w4-w7, ..."""
+    rng = np.random.default_rng(seed)
+    truth = np.arange(16) // 4
+    matrix = np.where(truth[:, None] == truth[None, :], 0.6, 0.2) + noise * rng.standard_normal((16, 16))
+    return (matrix + matrix.T) / 2
+
+
+def test_sampled_partitions_are_valid():
+    labels = sample_partitions(board_matrix(0.3), 4, 200, np.random.default_rng(0))
+    assert labels.shape == (200, 16)
+    for row in labels:
+        roots, counts = np.unique(row, return_counts=True)
+        assert np.all(counts == 4) and np.array_equal(roots, [np.flatnonzero(row == root)[0] for root in roots])
+    # A clear board is recovered in nearly every sample
+    clear = sample_partitions(board_matrix(0.02), 4, 200, np.random.default_rng(0))
+    assert (clear == np.arange(16) // 4 * 4).all(axis=1).mean() > 0.9
+
+
+def test_simulation_scores_like_the_evaluator():
+    # A single certain group left: 1 + 2 + 3 + 3 points times the one-strike multiplier
+    outcomes = np.full((10, 1), 2)
+    assert np.allclose(simulate([np.arange(4)], outcomes, 3, 1, 4, 4), 9 * 0.9)
+    # Two groups left; the first guess is right half of the time, and the last group follows
+    outcomes = np.zeros((10, 2), dtype=int)
+    outcomes[:5, 0] = 2
+    outcomes[5:, 1] = 2
+    values = simulate([np.arange(4), np.arange(2, 6)], outcomes, 2, 0, 8, 4)
+    assert np.allclose(values, 0.5 * 9 + 0.5 * 9 * 0.9)
+
+
+def test_guess_follows_the_feedback():
+    matrix = board_matrix(0.05)
+    guess, endTurn, decision = choose_guess(WORDS, matrix, SOLVER_GROUPS, 0, False, [], [], "")
+    assert not endTurn and guess in SOLVER_GROUPS.values() and decision['probability'] > 0.9
+
+    # Found and wrong groups are never guessed again
+    correct = [WORDS[0:4]]
+    previous = [WORDS[0:4], WORDS[4:8]]
+    guess, endTurn, decision = choose_guess(WORDS, matrix, SOLVER_GROUPS, 1, False, correct, previous, "")
+    assert not endTurn and sorted(guess) not in [sorted(group) for group in previous]
+    assert not set(guess) & set(WORDS[0:4])
+
+    # One away: the last guess shares three words with a true group
+    one_away = ['w0', 'w1', 'w2', 'w4']
+    guess, endTurn, _ = choose_guess(WORDS, board_matrix(0.3, seed=2), {}, 1, True, [], [one_away], "")
+    assert not endTurn and len(set(guess) & set(one_away)) in (0, 3)
+
+
+def test_a_certain_group_beats_a_risky_one_on_a_real_board():
+    # Sample puzzle board: the colors are certain, 'train' is pulled toward the fruits
+    words = ['apple', 'banana', 'cherry', 'date', 'dog', 'cat', 'mouse', 'rabbit',
+             'red', 'blue', 'green', 'yellow', 'car', 'bus', 'train', 'plane']
+    solver_groups = {'Group1': ['apple', 'banana', 'cherry', 'train'], 'Group2': ['car', 'bus', 'plane', 'date'],
+                     'Group3': ['red', 'blue', 'green', 'yellow'], 'Group4': ['dog', 'cat', 'mouse', 'rabbit']}
+    truth = np.arange(16) // 4
+    for seed in range(6):
+        rng = np.random.default_rng(seed)
+        matrix = np.where(truth[:, None] == truth[None, :], 0.45, 0.25) + 0.12 * rng.standard_normal((16, 16))
+        matrix = (matrix + matrix.T) / 2
+        matrix[8:12, 8:12] = 0.9
+        matrix[14, 0:4] = matrix[0:4, 14] = 0.5
+        np.fill_diagonal(matrix, 1)
+        guess, endTurn, decision = choose_guess(words, matrix, solver_groups, 0, False, [], [], "")
+        assert not endTurn and guess == ['red', 'blue', 'green', 'yellow'] and decision['probability'] > 0.9
+
+
+def test_equal_request_keys_get_equal_guesses():
+    rng = np.random.default_rng(4)
+    for trial in range(20):
+        matrix = board_matrix(0.3, seed=trial)
+        previous = [sorted(rng.choice(WORDS, 4, replace=False).tolist()) for _ in range(3)]
+        reordered = [previous[1], previous[0], previous[2]]  # Same last guess, earlier guesses swapped
+        isOneAway = bool(trial % 2)
+        assert request_key(WORDS, 3, isOneAway, [], previous, "") == \
+            request_key(WORDS, 3, isOneAway, [], reordered, "")
+        assert choose_guess(WORDS, matrix, SOLVER_GROUPS, 3, isOneAway, [], previous, "")[:2] == \
+            choose_guess(WORDS, matrix, SOLVER_GROUPS, 3, isOneAway, [], reordered, "")[:2]
+
+
+def test_turn_ends_when_guessing_is_expected_to_lose_points():
+    rng = np.random.default_rng(3)
+    noisy = 0.3 + 0.05 * rng.standard_normal((16, 16))
+    noisy = (noisy + noisy.T) / 2
+    correct = [WORDS[0:4], WORDS[4:8]]
+    previous = correct + [['w8', 'w9', 'w12', 'w13'], ['w8', 'w10', 'w12', 'w14'], ['w8', 'w11', 'w12', 'w15']]
+    guess, endTurn, decision = choose_guess(WORDS, noisy, {}, 3, False, correct, previous, "")
+    assert endTurn and guess == [] and decision['expected_points'] == decision['end_turn_points'] == 1.5
+
+    # With no strikes the same board is worth a guess
+    guess, endTurn, _ = choose_guess(WORDS, noisy, {}, 0, False, correct, correct, "")
+    assert not endTurn and len(guess) == 4
+
+
+if __name__ == "__main__":
+    test_sampled_partitions_are_valid()
+    test_simulation_scores_like_the_evaluator()
+    test_guess_follows_the_feedback()
+    test_a_certain_group_beats_a_risky_one_on_a_real_board()
+    test_equal_request_keys_get_equal_guesses()
+    test_turn_ends_when_guessing_is_expected_to_lose_points()
+    print("✅ Decision engine tests passed.")
@@ -0,0 +1,68 @@
+# tests/test_ensemble.py
+
+import sys
+import os
+import threading
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from similarity_metrics import ensemble_similarity_matrix, semantic_similarity_matrix
+from config import ENSEMBLE_WORKERS
+
+WORDS = ['apple', 'banana', 'cherry', 'dog', 'cat', 'zebra']
+
+
+def make_model(words, seed):
+    model = KeyedVectors(8)
+    model.add_vectors(words, np.random.default_rng(seed).standard_normal((len(words), 8)).astype(np.float32))
+    return model
+
+
+def test_weights_are_renormalized_over_the_models_knowing_both_words():
+    full = make_model(WORDS, 0)
+    partial = make_model(WORDS[:-1], 1)  # Does not know 'zebra'
+    models = {'full': full, 'partial': partial}
+    weights = {'full': 1.0, 'partial': 3.0}
+
+    matrix = ensemble_similarity_matrix(WORDS, models, weights, top_n=3)
+    full_matrix = semantic_similarity_matrix(WORDS, full, top_n=3)
+    partial_matrix = semantic_similarity_matrix(WORDS[:-1], partial, top_n=3)
+
+    known = len(WORDS) - 1
+    assert np.allclose(matrix[:known, :known], (full_matrix[:known, :known] + 3 * partial_matrix) / 4)
+    # Pairs with 'zebra' are scored by the full model alone, at its own scale
+    assert np.allclose(matrix[-1], full_matrix[-1]) and np.allclose(matrix[:, -1], full_matrix[:, -1])
+
+    # A word no model knows scores 0
+    matrix = ensemble_similarity_matrix(WORDS + ['qwxz'], models, weights, top_n=3)
+    assert np.all(matrix[-1] == 0) and np.all(matrix[:, -1] == 0)
+
+
+def test_concurrent_calls_share_a_bounded_pool():
+    models = {f"m{i}": make_model(WORDS, i) for i in range(3)}
+    expected = ensemble_similarity_matrix(WORDS, models, top_n=3)
+    results = []
+
+    def score():
+        for _ in range(5):
+            results.append(ensemble_similarity_matrix(WORDS, models, top_n=3))
+
+    threads = [threading.Thread(target=score) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 40 and all(np.allclose(result, expected) for result in results)
+    ensemble_threads = [thread for thread in threading.enumerate() if thread.name.startswith('ensemble')]
+    assert 0 < len(ensemble_threads) <= ENSEMBLE_WORKERS
+
+
+if __name__ == "__main__":
+    test_weights_are_renormalized_over_the_models_knowing_both_words()
+    test_concurrent_calls_share_a_bounded_pool()
+    print("✅ Ensemble similarity tests passed.")
@@ -0,0 +1,133 @@
+# tests/test_fasttext_converter.py
+
+import sys
+import os
+import gzip
+import struct
+import tempfile
+import numpy as np
+from gensim.models import KeyedVectors
+from gensim.models.fasttext import ft_ngram_hashes
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from fasttext_converter import FASTTEXT_MAGIC, convert_fasttext
+from vocab_index import VocabIndex
+
+WORDS = ['</s>', 'the', 'ice cream', 'café', 'naïve', 'dog', 'w1', 'w2']
+DIM = 6
+MINN, MAXN, BUCKET = 3, 5, 50
+
+
+def make_vectors(num_rows, seed=0):
+    return np.random.default_rng(seed).standard_normal((num_rows, DIM)).astype(np.float32)
+
+
+def write_bin(path, words, matrix, pruneidx=None):
+    """Write a minimal fastText .bin model (version 12, unquantized) around an input matrix."""
+    with open(path, 'wb') as file:
+        file.write(struct.pack('<ii', FASTTEXT_MAGIC, 12))
+        # dim, ws, epoch, minCount, neg, wordNgrams, loss, model, bucket, minn, maxn, lrUpdateRate, t
+        file.write(struct.pack('<12id', DIM, 5, 5, 1, 5, 1, 2, 2, BUCKET, MINN, MAXN, 100, 1e-4))
+        pairs = sorted((pruneidx or {}).items())
+        file.write(struct.pack('<iiiqq', len(words), len(words), 0, 1000, -1 if pruneidx is None else len(pairs)))
+        for count, word in enumerate(words):
+            file.write(word.encode('utf-8') + b'\0' + struct.pack('<qb', 1000 - count, 0))
+        for key, value in pairs:
+            file.write(struct.pack('<ii', key, value))
+        file.write(b'\0' + struct.pack('<qq', *matrix.shape) + matrix.astype('<f4').tobytes())
+
+
+def expected_bin_vector(word, word_id, matrix, pruneidx=None):
+    """fastText's word vector: the mean of the word row and its subword rows (none for </s>)."""
+    rows = [word_id]
+    if word != '</s>':
+        for h in ft_ngram_hashes(word, MINN, MAXN, BUCKET):
+            if pruneidx is None:
+                rows.append(len(WORDS) + h)
+            elif h in pruneidx:
+                rows.append(len(WORDS) + pruneidx[h])
+    return matrix[rows].mean(axis=0)
+
+
+def convert(source_path, directory, max_words=None):
+    vectors_path = os.path.join(directory, 'out.npy')
+    vocab_path = os.path.join(directory, 'out.vocab.txt')
+    shape = convert_fasttext(source_path, vectors_path, vocab_path, max_words=max_words)
+    vectors = np.load(vectors_path)
+    with open(vocab_path, 'r', encoding='utf-8') as file:
+        vocab = file.read().split('\n')[:-1]
+    index = VocabIndex.load(vocab_path, shape[0])
+    assert shape == vectors.shape and len(vocab) == shape[0]
+    assert index is not None and all(index[word] == row for row, word in enumerate(vocab))
+    return vectors, vocab
+
+
+def test_vec_files_round_trip():
+    vectors = make_vectors(len(WORDS))
+    lines = [f"{len(WORDS)} {DIM}\n"] + [word + ' ' + ' '.join(f"{value:.6f}" for value in row) + '\n'
+                                        for word, row in zip(WORDS, vectors)]
+    with tempfile.TemporaryDirectory() as directory:
+        plain_path = os.path.join(directory, 'model.vec')
+        with open(plain_path, 'w', encoding='utf-8') as file:
+            file.writelines(lines)
+        gz_path = os.path.join(directory, 'model.vec.gz')
+        with gzip.open(gz_path, 'wt', encoding='utf-8') as file:
+            file.writelines(lines)
+
+        for path in (plain_path, gz_path):
+            converted, vocab = convert(path, directory)
+            assert vocab == WORDS  # Words with spaces survive
+            assert np.allclose(converted, vectors, atol=1e-6)
+
+        converted, vocab = convert(gz_path, directory, max_words=3)
+        assert vocab == WORDS[:3] and np.allclose(converted, vectors[:3], atol=1e-6)
+
+
+def test_kv_files_round_trip():
+    vectors = make_vectors(len(WORDS), seed=1)
+    model = KeyedVectors(DIM)
+    model.add_vectors(WORDS, vectors)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'model.kv')
+        model.save(path)
+        converted, vocab = convert(path, directory)
+        assert vocab == WORDS and np.array_equal(converted, vectors)
+
+
+def test_bin_files_compose_subword_vectors():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'model.bin')
+        matrix = make_vectors(len(WORDS) + BUCKET, seed=2)
+        write_bin(path, WORDS, matrix)
+        converted, vocab = convert(path, directory)
+        assert vocab == WORDS
+        for word_id, word in enumerate(WORDS):
+            assert np.allclose(converted[word_id], expected_bin_vector(word, word_id, matrix), atol=1e-6), word
+        # The end-of-sentence token keeps its own row
+        assert np.array_equal(converted[0], matrix[0])
+
+        # A pruned model keeps a few buckets, renumbered by the prune index
+        kept = sorted({h for word in WORDS[1:] for h in ft_ngram_hashes(word, MINN, MAXN, BUCKET)})[::3]
+        pruneidx = {h: row for row, h in enumerate(kept)}
+        matrix = make_vectors(len(WORDS) + len(kept), seed=3)
+        write_bin(path, WORDS, matrix, pruneidx)
+        converted, vocab = convert(path, directory, max_words=5)
+        assert vocab == WORDS[:5]
+        for word_id, word in enumerate(vocab):
+            assert np.allclose(converted[word_id], expected_bin_vector(word, word_id, matrix, pruneidx), atol=1e-6), word
+
+        # An empty prune index drops every subword
+        write_bin(path, WORDS, matrix[:len(WORDS)], {})
+        converted, _ = convert(path, directory)
+        assert np.array_equal(converted, matrix[:len(WORDS)])
+
+
+if __name__ == "__main__":
+    test_vec_files_round_trip()
+    test_kv_files_round_trip()
+    test_bin_files_compose_subword_vectors()
+    print("✅ fastText converter tests passed.")
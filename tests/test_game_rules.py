@@ -0,0 +1,153 @@
+# tests/test_game_rules.py
+
+import sys
+import os
+import io
+import copy
+import json
+import random
+import hashlib
+import contextlib
+import numpy as np
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+sys.path.append(current_dir)
+
+import evaluator
+from game_rules import check_guess, play_game, score_game
+from decision_engine import _points_table
+
+PUZZLES = [
+    [[f"P{p}G{g}W{w}" for w in range(4)] for g in range(4)]
+    for p in range(3)
+]
+
+
+def scripted_player(puzzles, seed):
+    """
+    A player mixing right, one-away, random, repeated, short and end-turn guesses.
+
+    Each guess only depends on the seed and the game state (not on the word order),
+    so the evaluator and play_game see the same guesses for the same states.
+    """
+    def guess_fn(words, strikes, isOneAway, correctGroups, previousGuesses, error):
+        state = json.dumps([seed, sorted(words), strikes, isOneAway, correctGroups, previousGuesses, str(error)])
+        rng = random.Random(hashlib.sha256(state.encode('utf-8')).hexdigest())
+        puzzle = next(puzzle for puzzle in puzzles if sorted(sum(puzzle, [])) == sorted(words))
+        left = [group for group in puzzle if group not in correctGroups]
+        pool = sorted(words)
+        kind = rng.random()
+        if kind < 0.3:
+            return list(rng.choice(left)), False
+        if kind < 0.45:
+            group = rng.choice(left)
+            return group[:3] + [rng.choice([word for word in pool if word not in group])], False
+        if kind < 0.6:
+            return rng.sample(pool, 4), False
+        if kind < 0.7 and previousGuesses:
+            return list(reversed(rng.choice(previousGuesses))), False
+        if kind < 0.8:
+            return rng.sample(pool, 3), False
+        if kind < 0.9:
+            return [], True
+        return rng.sample(pool, 4), True
+    return guess_fn
+
+
+class FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def json(self):
+        return self.body
+
+
+class FakeRequests:
+    """Stands in for the `requests` module of the evaluator, answering with guess_fn."""
+
+    def __init__(self, guess_fn):
+        self.guess_fn = guess_fn
+        self.sent = []
+
+    def post(self, url, json=None, headers=None):
+        self.sent.append(copy.deepcopy(json))
+        guess, endTurn = self.guess_fn(**json)
+        return FakeResponse({'guess': guess, 'endTurn': endTurn})
+
+
+def run_evaluator(guess_fn, seed):
+    fake = FakeRequests(guess_fn)
+    saved = evaluator.requests, evaluator.load_puzzles
+    evaluator.requests, evaluator.load_puzzles = fake, lambda: copy.deepcopy(PUZZLES)
+    output = io.StringIO()
+    try:
+        np.random.seed(seed)
+        with contextlib.redirect_stdout(output):
+            evaluator.evalFunction()
+    finally:
+        evaluator.requests, evaluator.load_puzzles = saved
+    total = float(output.getvalue().split("Total points scored by model: ")[-1])
+    return fake.sent, total
+
+
+def run_game_rules(guess_fn, seed):
+    sent = []
+
+    def recording_guess_fn(words, strikes, isOneAway, correctGroups, previousGuesses, error):
+        state = {"words": words, "strikes": strikes, "isOneAway": isOneAway,
+                 "correctGroups": correctGroups, "previousGuesses": previousGuesses, "error": error}
+        sent.append(copy.deepcopy(state))
+        return guess_fn(**state)
+
+    np.random.seed(seed)
+    total, invalidGuesses = 0, 0
+    for puzzle in copy.deepcopy(PUZZLES):
+        words = evaluator.shufflePuzzles(puzzle)
+        result = play_game(puzzle, words, recording_guess_fn, invalidGuesses)
+        invalidGuesses = result['invalidGuesses']
+        total += result['points']
+    return sent, total
+
+
+def test_play_game_matches_the_evaluator():
+    for seed in range(40):
+        guess_fn = scripted_player(PUZZLES, seed)
+        evaluator_sent, evaluator_total = run_evaluator(guess_fn, seed)
+        rules_sent, rules_total = run_game_rules(guess_fn, seed)
+        assert rules_sent == evaluator_sent, f"seed {seed}"
+        assert np.isclose(rules_total, evaluator_total), f"seed {seed}"
+
+
+def test_check_guess_follows_the_evaluator_order():
+    puzzle = PUZZLES[0]
+    group = puzzle[1]
+    # Words are compared case-sensitively
+    assert check_guess(puzzle, list(group), []) == ("", group, False)
+    assert check_guess(puzzle, [word.lower() for word in group], [])[1] is None
+    # A correct guess keeps the flag when it matches the first group scanned
+    assert check_guess(puzzle, list(puzzle[0]), [], isOneAway=True) == ("", puzzle[0], True)
+    assert check_guess(puzzle, list(group), [], isOneAway=True) == ("", group, False)
+    # Repeats are rejected before the length check, and errors keep the flag
+    assert check_guess(puzzle, group[:3], [group[2::-1]], isOneAway=True) == \
+        ("You have already guessed this combination.", None, True)
+    assert check_guess(puzzle, group[:3], []) == ("Please enter 4 words.", None, False)
+
+
+def test_later_groups_of_larger_boards_score_like_the_fourth():
+    groups = [[f"G{g}W{w}" for w in range(5)] for g in range(6)]
+    assert score_game(groups[:5], 0) == 1 + 2 + 3 + 3 + 3
+    assert np.isclose(score_game(groups, 1), (1 + 2 + 3 + 3 + 3 + 3) * 0.9)
+    # The decision engine scores simulated games with the same table
+    table = _points_table(6)
+    assert all(np.isclose(table[found, strikes], score_game(groups[:found], strikes))
+               for found in range(7) for strikes in range(5))
+
+
+if __name__ == "__main__":
+    test_play_game_matches_the_evaluator()
+    test_check_guess_follows_the_evaluator_order()
+    test_later_groups_of_larger_boards_score_like_the_fourth()
+    print("✅ Game rules tests passed.")
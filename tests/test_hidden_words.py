@@ -0,0 +1,43 @@
+# tests/test_hidden_words.py
+
+import sys
+import os
+import random
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from hidden_words import HiddenWordDetector, hidden_class_matrix, hidden_class_groups
+
+
+def test_scan_matches_brute_force():
+    word_lists = {'a': ['she', 'he', 'hers', 'his'], 'b': ['ushe', 'ers']}
+    detector = HiddenWordDetector(word_lists, min_length=2)
+    rng = random.Random(0)
+    for _ in range(500):
+        text = ''.join(rng.choice('ushre') for _ in range(12))
+        found = sorted((hidden, start) for _, hidden, start in detector.scan(text))
+        expected = sorted((hidden, start) for words in word_lists.values() for hidden in words
+                          for start in range(len(text)) if text.startswith(hidden, start))
+        assert found == expected, text
+
+
+def test_words_hiding_a_common_class_are_grouped():
+    detector = HiddenWordDetector({'animal': ['cat', 'dog', 'pig', 'bear'], 'number': ['ten', 'one']})
+    words = ['SCATTER', 'dogma', 'apple', 'pigment', 'bearing', 'cat', 'often']
+
+    assert detector.hidden_classes('cat') == set()  # The word itself is not hidden
+    assert detector.hidden_classes('often') == {'number'}
+
+    matrix, classes = hidden_class_matrix(words, detector)
+    assert matrix[0, 1] == 1.0 and matrix[0, 2] == 0.0 and matrix[0, 0] == 0.0
+    groups = hidden_class_groups(words, dict(zip(words, classes)))
+    assert groups == [('animal', ['SCATTER', 'dogma', 'pigment', 'bearing'])]
+
+
+if __name__ == "__main__":
+    test_scan_matches_brute_force()
+    test_words_hiding_a_common_class_are_grouped()
+    print("✅ Hidden word tests passed.")
@@ -0,0 +1,55 @@
+# tests/test_knn_graph.py
+
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from knn_graph import KnnGraph, build_knn_graph
+
+
+def brute_force_neighbors(vectors, top_n):
+    """Exact neighbors by a full cosine similarity matrix (self excluded)."""
+    normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    sims = normed @ normed.T
+    np.fill_diagonal(sims, -np.inf)
+    return np.argsort(-sims, axis=1, kind='stable')[:, :top_n]
+
+
+def test_knn_graph_matches_brute_force():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 16)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = os.path.join(tmp_dir, 'vectors.kv')
+        np.save(model_path + '.vectors.npy', vectors)
+        graph_dir = os.path.join(tmp_dir, 'knn_graph')
+
+        # Small blocks and chunks so that the merging logic is exercised
+        build_knn_graph(model_path, graph_dir, top_k=120, top_n=10, block_size=32, chunk_size=64, workers=2)
+        graph = KnnGraph.load(graph_dir)
+
+        expected = brute_force_neighbors(vectors, 10)
+        assert graph.num_rows == 120
+        for index in range(graph.num_rows):
+            assert list(graph.neighbors(index)) == list(expected[index])
+
+        # Words outside the graph, or requests for more neighbors than stored, are not covered
+        assert graph.neighbors(200) is None
+        assert graph.neighbors(0, top_n=20) is None
+        assert len(graph.neighbors(0, top_n=5)) == 5
+
+        # Graphs built from other vectors are refused
+        assert KnnGraph.load(graph_dir, vectors_path=model_path + '.vectors.npy', num_vectors=500) is not None
+        assert KnnGraph.load(graph_dir, vectors_path=os.path.join(tmp_dir, 'other.npy'), num_vectors=500) is None
+        assert KnnGraph.load(graph_dir, vectors_path=model_path + '.vectors.npy', num_vectors=499) is None
+
+
+if __name__ == "__main__":
+    test_knn_graph_matches_brute_force()
+    print("✅ kNN graph tests passed.")
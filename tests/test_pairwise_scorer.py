@@ -0,0 +1,101 @@
+# tests/test_pairwise_scorer.py
+
+import sys
+import os
+import json
+import tempfile
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from pairwise_scorer import PairScorer, FEATURE_NAMES, pair_features, roc_auc, extract_training_set
+from knn_graph import KnnGraph
+
+
+def make_model():
+    """Four tight clusters of four words plus filler words."""
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((4, 16)) * 3
+    words = [f"c{cluster}w{member}" for cluster in range(4) for member in range(4)]
+    vectors = np.repeat(centers, 4, axis=0) + 0.3 * rng.standard_normal((16, 16))
+    filler = [f"f{i}" for i in range(100)]
+    model = KeyedVectors(16)
+    model.add_vectors(words + filler, np.vstack([vectors, rng.standard_normal((100, 16))]).astype(np.float32))
+    return model, words
+
+
+def test_fit_recovers_a_separating_rule():
+    rng = np.random.default_rng(1)
+    features = rng.standard_normal((2000, len(FEATURE_NAMES)))
+    labels = (features[:, 0] - 0.5 * features[:, 3] + 0.2 * rng.standard_normal(2000) > 0.8).astype(int)
+
+    scorer = PairScorer.fit(features, labels, l2=0.1)
+    assert scorer.weights[0] > 0 > scorer.weights[3]
+    assert roc_auc(scorer.predict_proba(features), labels) > 0.97
+
+
+def test_board_is_scored_in_one_call():
+    model, words = make_model()
+    rows, columns, features = pair_features(words, model, top_n=10)
+    assert features.shape == (120, len(FEATURE_NAMES))
+    labels = (rows // 4 == columns // 4).astype(int)
+
+    scorer = PairScorer.fit(features, labels)
+    matrix = scorer.score_matrix(words, model, top_n=10)
+    assert np.allclose(matrix, matrix.T) and np.all(np.diag(matrix) == 0)
+    assert np.allclose(matrix[rows, columns], scorer.predict_proba(features))
+    same_group = rows // 4 == columns // 4
+    assert matrix[rows, columns][same_group].min() > matrix[rows, columns][~same_group].max()
+
+
+def test_save_and_load_round_trip():
+    model, words = make_model()
+    rows, columns, features = pair_features(words, model, top_n=10)
+    scorer = PairScorer.fit(features, (rows // 4 == columns // 4).astype(int))
+    path = os.path.join(tempfile.mkdtemp(), 'scorer.npz')
+    scorer.save(path)
+    assert np.allclose(PairScorer.load(path).predict_proba(features), scorer.predict_proba(features))
+
+
+def test_cached_features_follow_the_model_and_graph():
+    model, words = make_model()
+    tmp_dir = tempfile.mkdtemp()
+    data_path = os.path.join(tmp_dir, 'puzzles.json')
+    with open(data_path, 'w', encoding='utf-8') as file:
+        json.dump([[{'category': f"c{g}", 'words': words[4 * g:4 * g + 4]} for g in range(4)]], file)
+    cache_path = os.path.join(tmp_dir, 'features.npz')
+    features, _, _ = extract_training_set([data_path], model, top_n=10, cache_path=cache_path)
+    assert np.array_equal(extract_training_set([data_path], model, top_n=10, cache_path=cache_path)[0], features)
+
+    # Same vocabulary size and dimension, other vectors: the cache is not reused
+    other = KeyedVectors(16)
+    other.add_vectors(list(model.index_to_key), np.asarray(model.vectors)[::-1].copy())
+    expected = extract_training_set([data_path], other, top_n=10)[0]
+    assert not np.allclose(expected, features)
+    assert np.array_equal(extract_training_set([data_path], other, top_n=10, cache_path=cache_path)[0], expected)
+
+    # A model identified by its source checksum, with and without a kNN graph
+    other.source_fingerprint = {'sha256': 'abc', 'vectors_size': 1}
+    extract_training_set([data_path], other, top_n=10, cache_path=cache_path)
+    order = np.argsort(-np.asarray(other.vectors) @ np.asarray(other.vectors).T, axis=1)[:, 1:11]
+    graph = KnnGraph(np.arange(len(order) + 1) * 10, order.reshape(-1).astype(np.int32),
+                     np.zeros(order.size, dtype=np.float32), 10)
+    with_graph = extract_training_set([data_path], other, knn_graph=graph, top_n=10, cache_path=cache_path)[0]
+    assert np.array_equal(with_graph, extract_training_set([data_path], other, knn_graph=graph, top_n=10)[0])
+    graph.indices = np.roll(graph.indices, 1)
+    rolled = extract_training_set([data_path], other, knn_graph=graph, top_n=10)[0]
+    assert not np.array_equal(rolled, with_graph)
+    assert np.array_equal(extract_training_set([data_path], other, knn_graph=graph, top_n=10,
+                                               cache_path=cache_path)[0], rolled)
+
+
+if __name__ == "__main__":
+    test_fit_recovers_a_separating_rule()
+    test_board_is_scored_in_one_call()
+    test_save_and_load_round_trip()
+    test_cached_features_follow_the_model_and_graph()
+    print("✅ Pairwise scorer tests passed.")
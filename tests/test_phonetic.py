@@ -0,0 +1,37 @@
+# tests/test_phonetic.py
+
+import sys
+import os
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from phonetic import metaphone, phonetic_code, phonetic_groups
+
+
+def test_homophones_share_a_code():
+    assert metaphone('knight') == metaphone('night') == 'NT'
+    assert metaphone('right') == metaphone('write') == metaphone('rite') == metaphone('wright')
+    assert metaphone('phone') == metaphone('fone')
+    assert metaphone('Thomas') == '0MS'
+    assert metaphone('42') == ''
+
+
+def test_codes_are_case_insensitive_and_cached():
+    assert phonetic_code('Pear') == phonetic_code('pair') == phonetic_code('PARE')
+
+
+def test_phonetic_groups_use_code_buckets():
+    words = ['right', 'apple', 'write', 'rite', 'dog', 'wright', 'pear', 'pair', 'pare']
+    groups = phonetic_groups(words)
+    assert groups == [['right', 'write', 'rite', 'wright']]
+    assert phonetic_groups(words, group_size=3) == [['right', 'write', 'rite'], ['pear', 'pair', 'pare']]
+
+
+if __name__ == "__main__":
+    test_homophones_share_a_code()
+    test_codes_are_case_insensitive_and_cached()
+    test_phonetic_groups_use_code_buckets()
+    print("✅ Phonetic tests passed.")
@@ -0,0 +1,68 @@
+# tests/test_phrase_vectors.py
+
+import sys
+import os
+import gc
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from phrase_vectors import compose_vector, get_word_vector
+from similarity_metrics import semantic_similarity_matrix, batch_neighbor_indices
+
+
+def make_model(seed=0):
+    rng = np.random.default_rng(seed)
+    words = ['the', 'ice', 'cream', 'fire', 'truck', 'office', 'dog'] + [f"w{i}" for i in range(200)]
+    model = KeyedVectors(16)
+    model.add_vectors(words, rng.standard_normal((len(words), 16)).astype(np.float32))
+    return model
+
+
+def test_phrases_are_composed_from_known_parts():
+    model = make_model()
+    expected = (np.log(3) * model['ice'] + np.log(4) * model['cream']) / (np.log(3) + np.log(4))
+    assert np.allclose(compose_vector('ice cream', model), expected, atol=1e-6)
+    assert np.allclose(compose_vector('Ice-Cream', model), expected, atol=1e-6)
+    assert np.allclose(compose_vector('icecream', model), expected, atol=1e-6)  # Sub-token split
+    assert compose_vector('zzz qqq', model) is None
+
+    # Frequent words weigh less than rarer ones
+    vector = compose_vector('the office', model)
+    assert np.linalg.norm(vector - model['office']) < np.linalg.norm(vector - model['the'])
+
+    # Cached vectors are reused
+    assert get_word_vector('fire truck', model) is get_word_vector('fire truck', model)
+
+
+def test_phrases_work_in_batched_paths():
+    model = make_model()
+    words = ['ice cream', 'dog', 'firetruck', 'zzz qqq']
+    matrix = semantic_similarity_matrix(words, model, top_n=10)
+    assert matrix[0, 1] > 0 and matrix[2, 1] > 0
+    assert not matrix[3].any() and not matrix[:, 3].any()
+
+    neighbors = batch_neighbor_indices(words, model, top_n=10)
+    assert set(neighbors) == {'ice cream', 'dog', 'firetruck'}
+    expected = [model.key_to_index[key] for key, _ in model.similar_by_vector(get_word_vector('ice cream', model), topn=10)]
+    assert list(neighbors['ice cream']) == expected
+
+
+def test_cached_phrases_never_outlive_their_model():
+    # Freed models often leave their id() to the next one; its phrases must not come from the cache
+    for seed in range(20):
+        model = make_model(seed)
+        assert np.array_equal(get_word_vector('ice cream', model), compose_vector('ice cream', model))
+        del model
+        gc.collect()
+
+
+if __name__ == "__main__":
+    test_phrases_are_composed_from_known_parts()
+    test_phrases_work_in_batched_paths()
+    test_cached_phrases_never_outlive_their_model()
+    print("✅ Phrase vector tests passed.")
@@ -0,0 +1,61 @@
+# tests/test_puzzle_generator.py
+
+import sys
+import os
+import numpy as np
+from types import SimpleNamespace
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from puzzle_generator import PuzzleGenerator
+
+CLUSTERS = [['apple', 'banana', 'cherry', 'grape', 'lemon'], ['dog', 'horse', 'mouse', 'rabbit', 'tiger'],
+            ['red', 'blue', 'green', 'yellow', 'purple'], ['car', 'bus', 'train', 'plane', 'ship']]
+
+
+def toy_model(clusters, seed=0):
+    """A keyed-vectors stand-in whose clusters are tight neighborhoods."""
+    rng = np.random.default_rng(seed)
+    index_to_key = [word for cluster in clusters for word in cluster]
+    centers = rng.standard_normal((len(clusters), 16))
+    vectors = np.concatenate([center + 0.1 * rng.standard_normal((len(cluster), 16))
+                              for center, cluster in zip(centers, clusters)]).astype(np.float32)
+    return SimpleNamespace(index_to_key=index_to_key, vectors=vectors)
+
+
+def test_boards_have_distinct_words():
+    generator = PuzzleGenerator(toy_model(CLUSTERS), neighbors=4, mix={'semantic': 1.0}, red_herring=0.0)
+    for _ in range(20):
+        board = generator.generate()
+        words = [word for entry in board for word in entry['words']]
+        assert len(board) == 4 and all(len(entry['words']) == 4 for entry in board)
+        assert len(set(words)) == 16
+
+
+def test_infeasible_sizes_raise_instead_of_hanging():
+    model = toy_model(CLUSTERS)
+    for num_groups, group_size in [(5, 5), (6, 4), (4, 6)]:
+        try:
+            PuzzleGenerator(model, neighbors=4, num_groups=num_groups, group_size=group_size)
+            assert False, f"accepted {num_groups}x{group_size} boards"
+        except ValueError as e:
+            assert str(e) == f"vocabulary too small for {num_groups}x{group_size} boards"
+
+    # Enough words, but every word overlaps another one, so no board can be completed
+    overlapping = [['car', 'cart', 'carton', 'cartoon'], ['pin', 'pine', 'spine', 'spinet'],
+                   ['ten', 'tent', 'tenth', 'tenths'], ['ant', 'pant', 'pants', 'panther']]
+    generator = PuzzleGenerator(toy_model(overlapping), neighbors=4, mix={'semantic': 1.0})
+    try:
+        generator.generate(max_attempts=10, max_restarts=5)
+        assert False, "completed an impossible board"
+    except ValueError as e:
+        assert str(e) == "vocabulary too small for 4x4 boards"
+
+
+if __name__ == "__main__":
+    test_boards_have_distinct_words()
+    test_infeasible_sizes_raise_instead_of_hanging()
+    print("✅ Puzzle generator tests passed.")
@@ -0,0 +1,84 @@
+# tests/test_replay_requests.py
+
+import sys
+import os
+import io
+import hashlib
+import tempfile
+import contextlib
+import subprocess
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+sys.path.append(current_dir)
+
+from request_log import RequestRecorder, read_records
+from replay_requests import print_report
+
+WORDS = ["apple", "banana", "cherry", "date", "dog", "cat", "mouse", "rabbit",
+         "red", "blue", "green", "yellow", "car", "bus", "train", "plane"]
+
+# Records three real model() calls through the request log configured in the environment
+RECORD_SCRIPT = """
+import io, sys, contextlib
+sys.path.append('src')
+with contextlib.redirect_stdout(io.StringIO()):
+    import Model
+    for strikes in range(3):
+        Model.model(words=%r, strikes=strikes, isOneAway=False, correctGroups=[], previousGuesses=[], error="")
+""" % (WORDS,)
+
+
+def file_digest(path):
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def make_record(guess, endTurn=False, exception=None):
+    return {'request': {'words': WORDS}, 'result': None if exception else {'guess': guess, 'endTurn': endTurn},
+            'exception': exception, 'latency_ms': 1.0}
+
+
+def test_report_ignores_the_order_of_guessed_words():
+    records = [make_record(WORDS[:4]), make_record(WORDS[:4]), make_record(WORDS[:4]), make_record([], True)]
+    replays = [make_record(WORDS[3::-1]), make_record(WORDS[4:8]), make_record(WORDS[:4], True),
+               make_record(None, exception="ValueError()")]
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        diffs = print_report(records, replays)
+    assert [index for index, _, _ in diffs] == [1, 2, 3]
+    assert "1 identical, 3 different" in output.getvalue()
+
+
+def test_replay_never_writes_to_the_log_it_reads():
+    project_dir = os.path.dirname(current_dir)
+    with tempfile.TemporaryDirectory() as directory:
+        # Record real results, then store them with every guess reversed
+        recorded_path = os.path.join(directory, 'recorded.jsonl.gz')
+        subprocess.run([sys.executable, '-c', RECORD_SCRIPT], env=dict(os.environ, CONNECTIONS_REQUEST_LOG=recorded_path),
+                       cwd=project_dir, check=True, capture_output=True, timeout=600)
+        log_path = os.path.join(directory, 'requests.jsonl.gz')
+        recorder = RequestRecorder(log_path)
+        for record in read_records(recorded_path):
+            result = record['result']
+            recorder.record(record['request'], result=(result['guess'][::-1], result['endTurn']),
+                            latency_ms=record['latency_ms'])
+        recorder.close()
+        digest = file_digest(log_path)
+
+        # The replayed log is also the configured request log, as on a recording server
+        environment = dict(os.environ, CONNECTIONS_REQUEST_LOG=log_path)
+        replay = subprocess.run([sys.executable, os.path.join(current_dir, 'replay_requests.py'), log_path,
+                                 '--workers', '2'], env=environment, cwd=project_dir,
+                                capture_output=True, text=True, timeout=600)
+        assert replay.returncode == 0, replay.stdout + replay.stderr
+        assert "Replayed 3 requests: 3 identical, 0 different" in replay.stdout
+        assert file_digest(log_path) == digest
+        assert len(list(read_records(log_path))) == 3
+
+
+if __name__ == "__main__":
+    test_report_ignores_the_order_of_guessed_words()
+    test_replay_never_writes_to_the_log_it_reads()
+    print("✅ Request replay tests passed.")
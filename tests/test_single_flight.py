@@ -0,0 +1,68 @@
+# tests/test_single_flight.py
+
+import sys
+import os
+import time
+import threading
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_duplicates_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def slow_square(x):
+        calls.append(x)
+        time.sleep(0.2)
+        return x * x
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do('key', slow_square, 3))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [3]
+    assert results == [9] * 8
+    assert flight.in_flight() == 0
+
+    # Once the computation is over, a new call runs again (nothing is cached)
+    assert flight.do('key', slow_square, 4) == 16
+    assert calls == [3, 4]
+
+
+def test_exceptions_are_shared_with_waiters():
+    flight = SingleFlight()
+    errors = []
+
+    def failing():
+        time.sleep(0.1)
+        raise ValueError("boom")
+
+    def call():
+        try:
+            flight.do('key', failing)
+        except ValueError as e:
+            errors.append(str(e))
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["boom"] * 4
+    assert flight.in_flight() == 0
+
+
+if __name__ == "__main__":
+    test_concurrent_duplicates_share_one_computation()
+    test_exceptions_are_shared_with_waiters()
+    print("✅ Single-flight tests passed.")
@@ -0,0 +1,106 @@
+# tests/test_solver_budget.py
+
+import sys
+import os
+import io
+import time
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+import connections_model as connections_module
+from connections_model import connections_model
+from similarity_metrics import semantic_components, semantic_similarity_matrix
+
+
+def make_board(seed=0):
+    """A 4x4 board of clustered random vectors, shuffled, with its true groups."""
+    rng = np.random.default_rng(seed)
+    words = [''.join(rng.choice(list('bcdfghjklmnpqrstvwxz'), 7)) for _ in range(16)]
+    centers = rng.standard_normal((4, 32))
+    vectors = np.repeat(centers, 4, axis=0) + 0.3 * rng.standard_normal((16, 32))
+    model = KeyedVectors(32)
+    model.add_vectors(words, vectors.astype(np.float32))
+    truth = sorted(sorted(words[g * 4:(g + 1) * 4]) for g in range(4))
+    return [words[i] for i in rng.permutation(16)], model, truth
+
+
+def solve(board, model, budget):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return connections_model(board, model, budget=budget, return_details=True)
+
+
+def test_zero_budget_returns_a_full_level_0_grouping():
+    board, model, truth = make_board()
+    groups, details = solve(board, model, 0)
+    assert details['level'] == 0 and details['level_name'] == 'cosine'
+    assert sorted(sorted(group) for group in groups.values()) == truth
+
+    # Level 0 drops the neighbor weight and renormalizes, so it shares the scale of the full score
+    components = semantic_components(board, model, include_neighbors=False)
+    assert np.allclose(details['pair_matrix'], (0.4 * components['cosine'] + 0.3 * components['euclidean']) / 0.7)
+    assert np.allclose(semantic_similarity_matrix(board, model, weights={'cosine': 0.4, 'euclidean': 0.3, 'neighbor': 0},
+                                                  include_neighbors=True), details['pair_matrix'])
+
+
+def test_no_budget_reaches_level_2():
+    board, model, truth = make_board(seed=1)
+    groups, details = solve(board, model, None)
+    assert details['level'] == 2 and details['level_name'] == 'search'
+    assert sorted(sorted(group) for group in groups.values()) == truth
+
+
+def test_abandoned_searches_do_not_delay_level_0():
+    board, model, _ = make_board(seed=2)
+    searches = []
+
+    def slow_semantic_matrix(*args, include_neighbors=True, **kwargs):
+        if include_neighbors:
+            searches.append(threading.current_thread().name)
+            time.sleep(0.5)  # A neighbor search far slower than the budget
+        return semantic_similarity_matrix(*args, include_neighbors=include_neighbors, **kwargs)
+
+    def request(budget, results):
+        start_time = time.perf_counter()
+        _, details = connections_model(board, model, budget=budget, return_details=True, quiet=True)
+        results.append((time.perf_counter() - start_time, details['level']))
+
+    saved = (connections_module.semantic_similarity_matrix, connections_module._signal_executor,
+             connections_module._refinement_executor)
+    connections_module.semantic_similarity_matrix = slow_semantic_matrix
+    connections_module._signal_executor = ThreadPoolExecutor(max_workers=2)
+    connections_module._refinement_executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        # Saturate the pools with more requests than workers, all abandoning their search
+        results = []
+        threads = [threading.Thread(target=request, args=(0.05, results)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # The started searches still run; a request with no budget left waits for none of them
+        request(0, results)
+    finally:
+        for executor in (connections_module._signal_executor, connections_module._refinement_executor):
+            executor.shutdown(wait=True)
+        (connections_module.semantic_similarity_matrix, connections_module._signal_executor,
+         connections_module._refinement_executor) = saved
+
+    assert len(results) == 9 and all(level == 0 for _, level in results)
+    assert max(latency for latency, _ in results) < 0.4
+    # Searches still queued at their deadline are dropped, and budget=0 submits none
+    assert len(searches) <= 2
+
+
+if __name__ == "__main__":
+    test_zero_budget_returns_a_full_level_0_grouping()
+    test_no_budget_reaches_level_2()
+    test_abandoned_searches_do_not_delay_level_0()
+    print("✅ Solver budget tests passed.")
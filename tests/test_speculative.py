@@ -0,0 +1,140 @@
+# tests/test_speculative.py
+
+import sys
+import os
+import io
+import time
+import threading
+import contextlib
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from speculative import Speculator, next_states, request_key
+from connections_model import connections_model
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_next_states_follow_the_game_rules():
+    words = [f"w{i}" for i in range(16)]
+    guess = ["w0", "w1", "w2", "w3"]
+    states = dict(next_states(words, 1, [], [["w4", "w5", "w6", "w7"]], guess))
+
+    assert list(states) == ['correct', 'one_away', 'wrong']
+    assert states['correct']['correctGroups'] == [guess]
+    assert states['correct']['strikes'] == 1
+    assert states['one_away']['strikes'] == 2 and states['one_away']['isOneAway']
+    assert not states['wrong']['isOneAway']
+    assert all(state['previousGuesses'][-1] == guess for state in states.values())
+
+    # No state is speculated once the game would be over
+    assert [outcome for outcome, _ in next_states(words, 3, [], [], guess)] == ['correct']
+    assert next_states(words, 3, [guess, guess, guess], [], guess) == []
+
+
+def test_request_key_keeps_the_feedback_the_guess_depends_on():
+    words = [f"w{i}" for i in range(16)]
+    first, second = ["w0", "w1", "w2", "w4"], ["w8", "w9", "w10", "w12"]
+    key = request_key(words, 2, True, [], [first, second], "")
+
+    # Words within groups and the error message itself do not matter
+    assert key == request_key(words, 2, True, [], [first, list(reversed(second))], "")
+    assert request_key(words, 2, True, [], [first, second], "Please enter 4 words.") == \
+        request_key(words, 2, True, [], [first, second], "You have already guessed this combination.")
+    # The last guess (which isOneAway refers to) and whether there was an error do
+    assert key != request_key(words, 2, True, [], [second, first], "")
+    assert key != request_key(words, 2, True, [], [first, second], "Please enter 4 words.")
+    # Every next state gets its own key
+    states = next_states(words, 0, [], [], words[:4])
+    assert len({request_key(**state) for _, state in states}) == 3
+
+
+def test_results_are_precomputed_and_expire():
+    calls = []
+
+    def compute(key, state):
+        calls.append(key)
+        return state['value'] * 2
+
+    speculator = Speculator(compute, ttl=0.3)
+    speculator.schedule('board', [('a', {'value': 1}), ('b', {'value': 2})])
+    assert wait_for(lambda: len(calls) == 2)
+    assert wait_for(lambda: speculator.cache_size()['entries'] == 2)
+
+    assert speculator.lookup('a') == 2
+    assert speculator.lookup('a') is None  # Results are taken, not shared
+    time.sleep(0.4)
+    assert speculator.lookup('b') is None  # Expired
+    assert speculator.stats['hits'] == 1
+
+
+def test_foreground_requests_pause_speculation_and_cancel_stale_states():
+    calls = []
+    speculator = Speculator(lambda key, state: calls.append(key))
+
+    with speculator.foreground():
+        speculator.schedule('board', [('a', {}), ('b', {})])
+        time.sleep(0.2)
+        assert calls == []  # Nothing starts while a foreground request runs
+        speculator.cancel('board')
+    time.sleep(0.2)
+    assert calls == []
+
+    # A newer turn of the board replaces its queued states
+    with speculator.foreground():
+        speculator.schedule('board', [('c', {})])
+        speculator.schedule('board', [('d', {})])
+    assert wait_for(lambda: calls == ['d'])
+
+
+def test_pending_boards_are_capped():
+    release = threading.Event()
+    calls = []
+
+    def compute(key, state):
+        release.wait()
+        calls.append(key)
+
+    speculator = Speculator(compute, max_pending=2)
+    speculator.schedule('busy', [('busy', {})])
+    assert wait_for(lambda: speculator._jobs.get('busy') is not None and not speculator._pending)
+    for board in ('x', 'y', 'z'):
+        speculator.schedule(board, [(board, {})])
+    release.set()
+    assert wait_for(lambda: calls == ['busy', 'y', 'z'])
+
+
+def test_speculative_runs_are_quiet_without_touching_stdout():
+    words = [f"w{i}" for i in range(16)]
+    model = KeyedVectors(8)
+    model.add_vectors(words, np.random.default_rng(0).standard_normal((16, 8)).astype(np.float32))
+    speculator = Speculator(lambda key, state: connections_model(quiet=True, **state))
+
+    stdout, captured = sys.stdout, io.StringIO()
+    with contextlib.redirect_stdout(captured):
+        speculator.schedule('board', [('a', {'words': words, 'model': model})])
+        assert wait_for(lambda: speculator.cache_size()['entries'] == 1)
+        assert sys.stdout is captured  # The foreground thread's redirection is left alone
+    assert sys.stdout is stdout
+    assert captured.getvalue() == ""
+    assert sorted(word for group in speculator.lookup('a').values() for word in group) == sorted(words)
+
+
+if __name__ == "__main__":
+    test_next_states_follow_the_game_rules()
+    test_request_key_keeps_the_feedback_the_guess_depends_on()
+    test_results_are_precomputed_and_expire()
+    test_foreground_requests_pause_speculation_and_cancel_stale_states()
+    test_pending_boards_are_capped()
+    test_speculative_runs_are_quiet_without_touching_stdout()
+    print("✅ Speculative precomputation tests passed.")
@@ -0,0 +1,57 @@
+# tests/test_vector_store.py
+
+import sys
+import os
+import tempfile
+import numpy as np
+from gensim.models import KeyedVectors
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from vector_store import MmapKeyedVectors
+
+
+def build_models():
+    """The same random vectors as gensim KeyedVectors and as a raw export opened by MmapKeyedVectors."""
+    words = [f"w{i}" for i in range(500)]
+    vectors = np.random.default_rng(0).normal(size=(len(words), 16)).astype(np.float32)
+    reference = KeyedVectors(16)
+    reference.add_vectors(words, vectors)
+
+    export_dir = tempfile.mkdtemp()
+    np.save(os.path.join(export_dir, 'vectors.npy'), vectors)
+    with open(os.path.join(export_dir, 'vocab.txt'), 'w', encoding='utf-8') as file:
+        file.write('\n'.join(words) + '\n')
+    model = MmapKeyedVectors.load(os.path.join(export_dir, 'vectors.npy'), os.path.join(export_dir, 'vocab.txt'))
+    return reference, model
+
+
+def test_lookups_match_gensim():
+    reference, model = build_models()
+    assert isinstance(model.vectors, np.memmap)
+    assert model.key_to_index == reference.key_to_index
+    assert np.array_equal(model['w7'], reference['w7'])
+    assert 'w7' in model and 'missing' not in model
+    model.fill_norms()
+    reference.fill_norms()
+    assert np.allclose(model.norms, reference.norms)
+
+
+def test_neighbor_searches_match_gensim():
+    reference, model = build_models()
+    for expected, found in [
+        (reference.most_similar('w3', topn=10), model.most_similar('w3', topn=10)),
+        (reference.most_similar(['w3', 'w9'], topn=10), model.most_similar(['w3', 'w9'], topn=10)),
+        (reference.similar_by_vector(reference['w5'], topn=10), model.similar_by_vector(model['w5'], topn=10)),
+    ]:
+        assert [key for key, _ in found] == [key for key, _ in expected]
+        assert np.allclose([score for _, score in found], [score for _, score in expected], atol=1e-5)
+
+
+if __name__ == "__main__":
+    test_lookups_match_gensim()
+    test_neighbor_searches_match_gensim()
+    print("✅ Vector store tests passed.")
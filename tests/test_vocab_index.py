@@ -0,0 +1,53 @@
+# tests/test_vocab_index.py
+
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Adjust the path to ensure the test script can access src modules
+current_dir = os.path.dirname(os.path.abspath(__file__))
+src_dir = os.path.abspath(os.path.join(current_dir, os.pardir, 'src'))
+sys.path.append(src_dir)
+
+from vocab_index import VocabIndex, ensure_vocab_index
+
+
+def write_vocab(words):
+    vocab_path = os.path.join(tempfile.mkdtemp(), 'vocab.txt')
+    with open(vocab_path, 'w', encoding='utf-8') as file:
+        file.write('\n'.join(words) + '\n')
+    return vocab_path
+
+
+def test_lookups_match_a_dict():
+    words = ['the', 'Apple', 'apple', 'café', 'New_York', 'a', 'the', 'zebra', '日本', 'ab']
+    expected = {}
+    for index, word in enumerate(words):
+        expected.setdefault(word, index)
+
+    index = ensure_vocab_index(write_vocab(words))
+    assert isinstance(index.order, np.memmap)
+    for word in expected:
+        assert word in index and index[word] == expected[word] and index.get(word) == expected[word]
+    for missing in ['', 'b', 'zzz', 'cafe', 'th', 'thee', 3]:
+        assert missing not in index and index.get(missing, -1) == -1
+    assert list(index) == list(expected) and index == expected
+    assert list(index.keys_view) == words and index.keys_view[-1] == 'ab' and index.keys_view[3:5] == words[3:5]
+
+
+def test_index_is_rebuilt_when_the_vocabulary_changes():
+    vocab_path = write_vocab(['one', 'two', 'three'])
+    assert ensure_vocab_index(vocab_path)['three'] == 2
+
+    with open(vocab_path, 'w', encoding='utf-8') as file:
+        file.write('three\ntwo\none\nfour\n')
+    assert VocabIndex.load(vocab_path) is None
+    assert ensure_vocab_index(vocab_path, num_rows=3)['three'] == 0
+    assert 'four' not in VocabIndex.load(vocab_path, num_rows=3)
+
+
+if __name__ == "__main__":
+    test_lookups_match_a_dict()
+    test_index_is_rebuilt_when_the_vocabulary_changes()
+    print("✅ Vocabulary index tests passed.")